@@ -0,0 +1 @@
+# Makes the runtime package importable when pytest is run from the repo root
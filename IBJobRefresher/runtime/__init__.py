@@ -0,0 +1,19 @@
+"""
+PD-SMIS v5.1 runtime support
+Python helpers that sit around the markdown framework modules
+"""
+
+from .cache import DiskBackend, MemoryBackend, ResponseCache
+from .errors import CriticalDataMissing, ModelError, PipelineAbort, TransientModelError
+from .inputs import parse_input
+
+__all__ = [
+    'CriticalDataMissing',
+    'DiskBackend',
+    'MemoryBackend',
+    'ModelError',
+    'PipelineAbort',
+    'ResponseCache',
+    'TransientModelError',
+    'parse_input',
+]
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Batch ad-variant screening for PD-SMIS v5.1
+Applies the ad safeguards (ENFORCE_CHARACTER_LIMITS, VALIDATE_AUDIENCE_SIZE,
+ENSURE_AD_POSTING_ALIGNMENT) and the Phase 3C scoring heuristics to every
+(intro, audience) pair at once, so only viable variants reach the model
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .rules import RuleBundle, load_bundle
+from .scanner import STOPWORDS, WORD, default_scanner
+
+# phase_3_optimization.md 3C: below this the copy should EXPAND_VALUE_PROPS
+MIN_EFFECTIVE_CHARS = 400
+MAX_AD_EMOJIS = 3
+CTA_VARIATIONS = ('apply now', 'learn more', 'join our team', 'view opportunity')
+
+# Audience sizes outside this range are scored down on a log scale
+DEFAULT_OPTIMAL_AUDIENCE = (50_000, 500_000)
+
+SCORE_WEIGHTS = {
+    'length': 0.20,
+    'mobile_hook': 0.20,
+    'cta': 0.15,
+    'emoji': 0.05,
+    'alignment': 0.25,
+    'audience': 0.15,
+}
+
+# Scanner tags that make a word a precision claim of its own: "lead" is not
+# supported by "leadership", nor "experienced" by "experience"
+CLAIM_TAGS = frozenset({'ownership', 'expertise', 'weasel'})
+
+# Seniority and title words: an ad may not promote the role past the posting
+SENIORITY = frozenset({
+    'junior', 'senior', 'sr', 'staff', 'principal', 'distinguished', 'head', 'chief',
+    'director', 'vp', 'manager', 'architect', 'intern', 'entry-level', 'mid-level',
+})
+
+# Technologies that ad copy often names in lowercase. Capitalized names, and
+# any term with a digit or one of . + #, count as named without this list.
+TECHNOLOGIES = frozenset({
+    'react', 'angular', 'vue', 'svelte', 'javascript', 'typescript', 'node', 'python',
+    'django', 'flask', 'java', 'kotlin', 'scala', 'golang', 'go', 'rust', 'ruby', 'rails',
+    'php', 'swift', 'haskell', 'elixir', 'sql', 'postgres', 'postgresql', 'mysql',
+    'mongodb', 'redis', 'kafka', 'spark', 'hadoop', 'graphql', 'rest', 'grpc', 'aws',
+    'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible', 'linux', 'ios',
+    'android', 'tensorflow', 'pytorch', 'llm', 'llms', 'blockchain', 'salesforce',
+})
+
+# Irregular past forms of the LEXICON ownership verbs and common tier verbs
+_IRREGULAR = {'led': 'lead', 'drove': 'drive', 'oversaw': 'oversee', 'built': 'build',
+              'wrote': 'write', 'ran': 'run', 'made': 'make', 'grew': 'grow'}
+
+_SENTENCE_END = re.compile(r'[.!?](?:\s|$)|\n')
+_EMOJI = re.compile('[\U0001F300-\U0001FAFF☀-➿]')
+_NUMBER = re.compile(r'[$€£]?\d[\d,.]*\s*[%kKmM+]?')
+_TECH_SHAPE = re.compile(r'\d|[a-z][.+#]')
+# A capitalized word that does not open a sentence, line or list item
+_PROPER_NOUN = re.compile(r"(?<![.!?:\n(•*-]\s)(?<![.!?:\n(•*-])(?<!^)\b([A-Z][A-Za-z0-9+#.'-]*)")
+_SIZE = re.compile(r'Target Audience Size:\s*([\d,.]+)\s*([kKmM]?)')
+
+
+def ad_limits(bundle: Optional[RuleBundle] = None) -> Dict[str, int]:
+    """Ad safeguard limits from the compiled ENFORCE_CHARACTER_LIMITS and VALIDATE_AUDIENCE_SIZE"""
+    bundle = bundle or load_bundle()
+    characters = bundle.safeguard('ENFORCE_CHARACTER_LIMITS')['rules']
+    preview = next(re.search(r'first_(\d+)_chars', rule['condition']) for rule in characters
+                   if 'first_' in rule['condition'])
+    return {
+        'max_intro_chars': bundle.thresholds['ENFORCE_CHARACTER_LIMITS'][0]['value'],
+        'mobile_preview_chars': int(preview.group(1)),
+        'min_audience_size': bundle.thresholds['VALIDATE_AUDIENCE_SIZE'][0]['value'],
+    }
+
+
+def stem(word: str) -> str:
+    """Crude inflection stem, e.g. architected -> architect and led -> lead"""
+    word = _IRREGULAR.get(word, word)
+    if not word.isalpha():
+        return word
+    for suffix in ('ing', 'ed', 'es', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'ls':
+                word = word[:-1]
+            break
+    return word[:-1] if len(word) > 3 and word.endswith('e') else word
+
+
+def claim_tags(term: str) -> FrozenSet[str]:
+    """Ownership, expertise, weasel and tier tags the scanner lexicon gives a term"""
+    return frozenset(tag for tag in default_scanner().tags.get(term, ())
+                     if tag in CLAIM_TAGS or tag.startswith('tier'))
+
+
+@lru_cache(maxsize=None)
+def _phrase_pattern() -> 're.Pattern[str]':
+    """Multi-word lexicon claims ("responsible for", "key role"), longest first"""
+    phrases = sorted((p for p in default_scanner().tags if ' ' in p and claim_tags(p)),
+                     key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(re.escape(p) for p in phrases) + r')\b')
+
+
+def claim_terms(text: str) -> List[str]:
+    """Terms in ad copy that assert something checkable against the posting
+
+    Numbers (years, salary, percentages), multi-word ownership and tier
+    phrases, and every lowercase content word. Only claim_bearing() terms and
+    proper nouns block when the posting lacks them.
+    """
+    text = text.lower()
+    for cta in CTA_VARIATIONS:
+        text = text.replace(cta, ' ')
+    terms = [re.sub(r'\s+', '', match).rstrip('.,') for match in _NUMBER.findall(text)]
+    text = _NUMBER.sub(' ', text)
+    terms.extend(_phrase_pattern().findall(text))
+    text = _phrase_pattern().sub(' ', text)
+    terms.extend(word for word in WORD.findall(text) if word not in STOPWORDS)
+    return [term for term in dict.fromkeys(terms) if term]
+
+
+def claim_bearing(term: str) -> bool:
+    """Whether an unsupported term is a claim that must BLOCK rather than score down
+
+    Numbers, ownership/expertise/weasel/tier terms, seniority words and
+    technologies. Other words ("hiring", "grow", "skills") only lower the
+    alignment score; proper nouns are added per intro by proper_nouns().
+    """
+    if _NUMBER.fullmatch(term) or ' ' in term or claim_tags(term):
+        return True
+    return (term in SENIORITY or stem(term) in SENIORITY
+            or term in TECHNOLOGIES or bool(_TECH_SHAPE.search(term)))
+
+
+def proper_nouns(text: str) -> Set[str]:
+    """Lowercased names capitalized mid-sentence (companies, products, places)"""
+    return {word.lower().rstrip('.') for word in _PROPER_NOUN.findall(text)}
+
+
+def parse_audience(text: str) -> Dict[str, Any]:
+    """Audience config from an [AD AUDIENCE DETAILS] body; size is None if absent"""
+    config: Dict[str, Any] = {'size': None}
+    match = _SIZE.search(text)
+    if match:
+        size = float(match.group(1).replace(',', ''))
+        size *= {'k': 1e3, 'm': 1e6}.get(match.group(2).lower(), 1)
+        config['size'] = int(size)
+    return config
+
+
+class FactIndex:
+    """Claim vocabulary of a posting (plus any extracted facts) for subset checks"""
+
+    def __init__(self, posting: str, facts: Iterable[str] = ()):
+        text = '\n'.join([posting, *facts]).lower()
+        self.terms = set(claim_terms(text))
+        self.stems = {(stem(word), claim_tags(word)) for word in WORD.findall(text)}
+        self._text = text
+
+    def supports(self, term: str) -> bool:
+        """Numbers and phrases must appear as-is; words by stem, with the same claim tags"""
+        if _NUMBER.fullmatch(term) or ' ' in term:
+            return term in self.terms
+        return (stem(term), claim_tags(term)) in self.stems
+
+
+class AdEngine:
+    """Vectorized safeguard checks and ranking over candidate ad variants"""
+
+    def __init__(self, posting: str, facts: Iterable[str] = (),
+                 posting_uses_emojis: Optional[bool] = None,
+                 optimal_audience: Tuple[int, int] = DEFAULT_OPTIMAL_AUDIENCE,
+                 weights: Optional[Dict[str, float]] = None,
+                 bundle: Optional[RuleBundle] = None):
+        self.index = FactIndex(posting, facts)
+        self.limits = ad_limits(bundle)
+        if posting_uses_emojis is None:
+            posting_uses_emojis = bool(_EMOJI.search(posting))
+        self.posting_uses_emojis = posting_uses_emojis
+        self.optimal_audience = optimal_audience
+        self.weights = weights or SCORE_WEIGHTS
+
+    def intro_features(self, intros: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Per-intro feature arrays, shape (n_intros,)"""
+        lengths = np.fromiter((len(intro) for intro in intros), dtype=np.int64, count=len(intros))
+        first_end = np.fromiter(
+            (self._first_sentence_end(intro) for intro in intros),
+            dtype=np.int64, count=len(intros))
+        emojis = np.fromiter((len(_EMOJI.findall(intro)) for intro in intros),
+                             dtype=np.int64, count=len(intros))
+        has_cta = np.fromiter((any(cta in intro.lower() for cta in CTA_VARIATIONS)
+                               for intro in intros), dtype=bool, count=len(intros))
+
+        # Claim/support matrix over the shared claim vocabulary
+        per_intro = [claim_terms(intro) for intro in intros]
+        vocabulary = sorted({term for terms in per_intro for term in terms})
+        column = {term: i for i, term in enumerate(vocabulary)}
+        claims = np.zeros((len(intros), len(vocabulary)), dtype=bool)
+        for row, terms in enumerate(per_intro):
+            claims[row, [column[term] for term in terms]] = True
+        supported = np.fromiter((self.index.supports(term) for term in vocabulary),
+                                dtype=bool, count=len(vocabulary))
+        bearing = np.fromiter((claim_bearing(term) for term in vocabulary),
+                              dtype=bool, count=len(vocabulary))
+        named = np.zeros_like(claims)
+        for row, intro in enumerate(intros):
+            names = [column[name] for name in proper_nouns(intro) if name in column]
+            named[row, names] = True
+        claim_counts = claims.sum(axis=1)
+        unsupported = claims & ~supported
+        unsupported_counts = unsupported.sum(axis=1)
+        blocking = unsupported & (bearing[None, :] | named)
+
+        return {
+            'length': lengths,
+            'first_sentence_end': first_end,
+            'emojis': emojis,
+            'has_cta': has_cta,
+            'claims': claim_counts,
+            'unsupported_claims': unsupported_counts,
+            'unsupported_terms': [
+                [vocabulary[i] for i in np.flatnonzero(row)] for row in unsupported
+            ],
+            'blocking_claims': blocking.sum(axis=1),
+            'blocking_terms': [
+                [vocabulary[i] for i in np.flatnonzero(row)] for row in blocking
+            ],
+        }
+
+    @staticmethod
+    def _first_sentence_end(intro: str) -> int:
+        match = _SENTENCE_END.search(intro.strip())
+        return match.start() + 1 if match else len(intro.strip())
+
+    def audience_features(self, audiences: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Per-audience arrays, shape (n_audiences,); unknown sizes are NaN"""
+        sizes = np.array([a.get('size') if a.get('size') is not None else np.nan
+                          for a in audiences], dtype=float)
+        low, high = self.optimal_audience
+        with np.errstate(invalid='ignore', divide='ignore'):
+            below = np.log10(low / sizes)
+            above = np.log10(sizes / high)
+        distance = np.clip(np.fmax(below, above), 0, None)
+        score = np.where(np.isnan(sizes), 0.5, 1 / (1 + distance))
+        return {'size': sizes, 'score': score}
+
+    def evaluate(self, intros: Sequence[str],
+                 audiences: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Blocked mask, warnings and scores for every (intro, audience) pair"""
+        f = self.intro_features(intros)
+        a = self.audience_features(audiences)
+
+        limits = self.limits
+        # ENFORCE_CHARACTER_LIMITS: > 600 blocks; incoherent first 150 chars -> REWRITE
+        over_limit = f['length'] > limits['max_intro_chars']
+        mobile_ok = (f['first_sentence_end'] <= limits['mobile_preview_chars'])
+        # ENSURE_AD_POSTING_ALIGNMENT: every claim must be a subset of the posting;
+        # other unmatched wording only lowers the alignment score
+        misaligned = f['blocking_claims'] > 0
+        # VALIDATE_AUDIENCE_SIZE: known sizes under 300 block
+        too_small = a['size'] < limits['min_audience_size']
+
+        intro_blocked = over_limit | misaligned
+        blocked = intro_blocked[:, None] | too_small[None, :]
+
+        preview = limits['mobile_preview_chars']
+        length_score = np.clip((f['length'] - preview)
+                               / (MIN_EFFECTIVE_CHARS - preview), 0, 1)
+        if self.posting_uses_emojis:
+            emoji_score = ((f['emojis'] >= 1) & (f['emojis'] <= MAX_AD_EMOJIS)).astype(float)
+        else:
+            emoji_score = (f['emojis'] == 0).astype(float)
+        alignment = np.where(f['claims'] > 0,
+                             1 - f['unsupported_claims'] / np.maximum(f['claims'], 1), 1.0)
+        w = self.weights
+        intro_score = (w['length'] * length_score
+                       + w['mobile_hook'] * mobile_ok
+                       + w['cta'] * f['has_cta']
+                       + w['emoji'] * emoji_score
+                       + w['alignment'] * alignment)
+        score = intro_score[:, None] + w['audience'] * a['score'][None, :]
+        score = np.where(blocked, -np.inf, score)
+
+        return {
+            'score': score,
+            'blocked': blocked,
+            'over_limit': over_limit,
+            'misaligned': misaligned,
+            'needs_mobile_rewrite': ~mobile_ok,
+            'audience_too_small': too_small,
+            'audience_size_unknown': np.isnan(a['size']),
+            'features': f,
+        }
+
+    def shortlist(self, intros: Sequence[str], audiences: Sequence[Dict[str, Any]],
+                  top_k: int = 5) -> List[Dict[str, Any]]:
+        """Ranked viable (intro, audience) pairs with the warnings each carries"""
+        result = self.evaluate(intros, audiences)
+        score = result['score']
+        viable = np.flatnonzero(np.isfinite(score.ravel()))
+        order = viable[np.argsort(-score.ravel()[viable], kind='stable')][:top_k]
+        shortlist = []
+        for flat in order:
+            i, j = np.unravel_index(flat, score.shape)
+            warnings = []
+            if result['needs_mobile_rewrite'][i]:
+                warnings.append("REWRITE: Ensure mobile preview coherence")
+            if result['features']['length'][i] < MIN_EFFECTIVE_CHARS:
+                warnings.append("EXPAND_VALUE_PROPS: under 400 characters")
+            if result['audience_size_unknown'][j]:
+                warnings.append("Audience size not provided; VALIDATE_AUDIENCE_SIZE skipped")
+            shortlist.append({
+                'intro_index': int(i),
+                'audience_index': int(j),
+                'score': float(score[i, j]),
+                'warnings': warnings,
+            })
+        return shortlist
+
+    def rejections(self, intros: Sequence[str],
+                   audiences: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """BLOCK reasons for each intro and audience that can never be viable"""
+        result = self.evaluate(intros, audiences)
+        rejected = []
+        for i in np.flatnonzero(result['over_limit'] | result['misaligned']):
+            reasons = []
+            if result['over_limit'][i]:
+                reasons.append("Exceeds LinkedIn ad intro limit")
+            if result['misaligned'][i]:
+                terms = ', '.join(result['features']['blocking_terms'][i])
+                reasons.append(f"Ad promises exceed posting content ({terms})")
+            rejected.append({'intro_index': int(i), 'reasons': reasons})
+        for j in np.flatnonzero(result['audience_too_small']):
+            rejected.append({'audience_index': int(j),
+                             'reasons': ["Below minimum campaign requirement"]})
+        return rejected
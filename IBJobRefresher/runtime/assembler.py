@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Prompt assembly for PD-SMIS v5.1
+Loads only the modules and sections a run needs, using dev/dependency_map.yaml
+"""
+
+import hashlib
+import itertools
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import yaml
+
+from .cache import FRAMEWORK_ROOT, module_hash
+from .inputs import AD_AUDIENCE, AD_KPIS, has_ad_data
+
+DEPENDENCY_MAP_PATH = FRAMEWORK_ROOT.parent / 'dev' / 'dependency_map.yaml'
+
+# Sections that only matter when a dependency-map component is active, or
+# when a gated input is present.
+# (module, heading prefix) -> component name in dependency_map.yaml or input
+CONDITIONAL_SECTIONS = {
+    ('phases/phase_0_5_iteration.md', '### 0.5B'): 'performance_evolution',
+    # Ad copy and ad KPI analysis need only some ad data; audience alignment
+    # needs the audience details
+    ('phases/phase_1_extraction.md', '### 1D:'): 'ad_data',
+    ('phases/phase_1_extraction.md', '### 1D.2'): 'audience_analysis',
+    # Any ad section means an ad intro may be generated, so its guards must load
+    ('phases/phase_2_hypothesis.md', '### 2A.3'): 'ad_data',
+    ('phases/phase_3_optimization.md', '### 3C'): 'ad_data',
+    ('phases/phase_3_optimization.md', '### 3D'): 'performance_evolution',
+    ('safeguards/critical_safeguards.md', '### Ad-Specific Safeguards'): 'ad_data',
+    ('phases/phase_7_iteration.md', '### Ad-Specific Safeguards'): 'ad_data',
+    ('components/output_format.md', '### LinkedIn Ad Campaign Output'): 'ad_data',
+}
+
+# Dependency-map leaves (plus ad_data, any ad section) whose availability
+# depends on the run's input
+GATED_INPUTS = ('ad_data', 'ad_kpis', 'ad_audience_details', 'previous_iterations')
+
+_HEADING_PATTERN = re.compile(r'^#{2,3} ')
+_FENCE_PATTERN = re.compile(r'^\s*```')
+
+
+def load_dependency_map(path: Path = DEPENDENCY_MAP_PATH) -> Dict[str, Dict]:
+    """Return {group: {component: spec}} for every component with depends_on"""
+    with open(path, 'r') as f:
+        raw = yaml.safe_load(f)
+    groups = {}
+    for group, entries in raw.items():
+        if not isinstance(entries, dict):
+            continue
+        components = {name: spec for name, spec in entries.items()
+                      if isinstance(spec, dict) and 'depends_on' in spec}
+        if components:
+            groups[group] = components
+    return groups
+
+
+def load_module_sequence(root: Path = FRAMEWORK_ROOT) -> List[str]:
+    """Read the module loading sequence declared in orchestrator.md"""
+    content = (root / 'orchestrator.md').read_text()
+    block = content.split('modules = [', 1)[1].split(']', 1)[0]
+    return re.findall(r"'([^']+\.md)'", block)
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split a module into (heading, body) chunks on ##/### headings outside code fences
+
+    The module header (everything before the first '---') is dropped.
+    """
+    if '\n---\n' in text:
+        text = text.split('\n---\n', 1)[1]
+    sections = []
+    heading, lines = '', []
+    in_fence = False
+    for line in text.splitlines():
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence and _HEADING_PATTERN.match(line):
+            if heading or ''.join(lines).strip():
+                sections.append((heading, '\n'.join(lines).strip()))
+            heading, lines = line.strip(), []
+            continue
+        lines.append(line)
+    if heading or ''.join(lines).strip():
+        sections.append((heading, '\n'.join(lines).strip()))
+    return sections
+
+
+def run_inputs(sections: Dict[str, str], iteration: int) -> Dict[str, bool]:
+    """Availability of each gated dependency-map input for this run"""
+    return {
+        'ad_data': has_ad_data(sections),
+        'ad_kpis': bool(sections.get(AD_KPIS)),
+        'ad_audience_details': bool(sections.get(AD_AUDIENCE)),
+        'previous_iterations': iteration > 1,
+    }
+
+
+class PromptAssembler:
+    """Builds and caches per-run prompts from the modular framework"""
+
+    def __init__(self, root: Path = FRAMEWORK_ROOT,
+                 dependency_map: Path = DEPENDENCY_MAP_PATH):
+        self.root = Path(root)
+        self.groups = load_dependency_map(dependency_map)
+        self.modules = load_module_sequence(self.root)
+        self._compiled: Dict[str, Dict] = {}
+        self._chunks: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {}
+
+    def chunks(self, module: str) -> List[Tuple[str, str]]:
+        """Sections of a module, re-split only when its content hash changes"""
+        digest = module_hash(module, self.root)
+        cached = self._chunks.get(module)
+        if cached is None or cached[0] != digest:
+            cached = (digest, split_sections((self.root / module).read_text()))
+            self._chunks[module] = cached
+        return cached[1]
+
+    def inactive_components(self, available: Dict[str, bool]) -> Set[str]:
+        """Components switched off by missing inputs
+
+        A component is inactive when a direct dependency is an unavailable
+        input or an inactive component from the same dependency-map group.
+        Cross-group dependencies are treated as optional context.
+        """
+        inactive = {name for name, present in available.items() if not present}
+        changed = True
+        while changed:
+            changed = False
+            for components in self.groups.values():
+                for name, spec in components.items():
+                    if name in inactive:
+                        continue
+                    for dependency in spec.get('depends_on') or []:
+                        gated = dependency in GATED_INPUTS or dependency in components
+                        if gated and dependency in inactive:
+                            inactive.add(name)
+                            changed = True
+                            break
+        return inactive - set(available)
+
+    def plan(self, available: Dict[str, bool]) -> List[Tuple[str, List[int]]]:
+        """[(module, indices of sections to keep)] for the given input availability"""
+        inactive = self.inactive_components(available)
+        inactive |= {name for name, present in available.items() if not present}
+        plan = []
+        for module in self.modules:
+            if not (self.root / module).exists():
+                continue
+            keep = []
+            for index, (heading, _) in enumerate(self.chunks(module)):
+                component = self._component_for(module, heading)
+                if component is None or component not in inactive:
+                    keep.append(index)
+            if keep:
+                plan.append((module, keep))
+        return plan
+
+    def _component_for(self, module: str, heading: str) -> Optional[str]:
+        for (section_module, prefix), component in CONDITIONAL_SECTIONS.items():
+            if section_module == module and heading.startswith(prefix):
+                return component
+        return None
+
+    def plan_hash(self, plan: List[Tuple[str, List[int]]]) -> str:
+        """Hash of the selected module set, section choice and module contents"""
+        digest = hashlib.sha256(module_hash('orchestrator.md', self.root).encode())
+        for module, keep in plan:
+            digest.update(module.encode())
+            digest.update(module_hash(module, self.root).encode())
+            digest.update(','.join(map(str, keep)).encode())
+        return digest.hexdigest()
+
+    def assemble(self, sections: Dict[str, str], iteration: int = 1) -> Dict:
+        """Return the compiled prompt for a parsed input, building it at most once"""
+        return self.assemble_for(run_inputs(sections, iteration))
+
+    def assemble_for(self, available: Dict[str, bool]) -> Dict:
+        plan = self.plan(available)
+        key = self.plan_hash(plan)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._compile(plan, key)
+            self._compiled[key] = compiled
+        return compiled
+
+    def precompile(self) -> List[str]:
+        """Compile every input-availability combination up front"""
+        keys = []
+        for flags in itertools.product((True, False), repeat=len(GATED_INPUTS)):
+            compiled = self.assemble_for(dict(zip(GATED_INPUTS, flags)))
+            if compiled['module_set_hash'] not in keys:
+                keys.append(compiled['module_set_hash'])
+        return keys
+
+    def _compile(self, plan: List[Tuple[str, List[int]]], key: str) -> Dict:
+        parts = [self._constraints()]
+        skipped = []
+        selected = {module: keep for module, keep in plan}
+        for module in self.modules:
+            if not (self.root / module).exists():
+                skipped.append({'module': module, 'reason': 'missing'})
+                continue
+            keep = selected.get(module, [])
+            for index, (heading, body) in enumerate(self.chunks(module)):
+                if index in keep:
+                    parts.append(f'{heading}\n{body}'.strip())
+                else:
+                    skipped.append({'module': module, 'section': heading or '(preamble)',
+                                    'reason': 'inactive'})
+        text = '\n\n'.join(part for part in parts if part) + '\n'
+        return {
+            'module_set_hash': key,
+            'modules': [module for module, _ in plan],
+            'skipped': skipped,
+            'text': text,
+            'chars': len(text),
+            'approx_tokens': len(text) // 4,
+        }
+
+    def _constraints(self) -> str:
+        """Critical Constraints block from orchestrator.md, always included"""
+        for heading, body in self.chunks('orchestrator.md'):
+            if heading.startswith('## Critical Constraints'):
+                return f'{heading}\n{body}'
+        return ''
+
+
+if __name__ == "__main__":
+    assembler = PromptAssembler()
+    full = assembler.assemble_for(dict.fromkeys(GATED_INPUTS, True))
+    for key in assembler.precompile():
+        compiled = assembler._compiled[key]
+        saved = 100 * (1 - compiled['chars'] / full['chars'])
+        print(f"{key[:12]}  {compiled['approx_tokens']:>6} tokens  "
+              f"({saved:.1f}% smaller, {len(compiled['skipped'])} sections skipped)")
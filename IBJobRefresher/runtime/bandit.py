@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Concurrent variant testing for PD-SMIS Phase 7 iterations
+Thompson sampling over funnel KPIs allocates traffic across live postings and
+ad intros, and maps the posteriors onto the Phase 7 stop/reset decision points
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Funnel stages in order; each is a rate of successes over trials
+DEFAULT_FUNNEL = ('ctr', 'visit_to_application', 'application_to_interview')
+
+# Posterior probability needed for a stop/reset/reference decision
+CONFIDENCE = 0.95
+# Stricter bar for recording a challenger as a success or failure: posteriors are
+# checked after every batch, and a recorded failure counts toward a reset
+RESOLVE_CONFIDENCE = 0.99
+# Stop once the leader is, with CONFIDENCE, within this fraction of the best arm.
+# Trade-off: at 1% the default benchmark took ~134 days to decide against 70
+# for sequential testing. At 10% it decides in ~57-65 days and still picks the
+# best arm at least as often, but may settle for one within 10% of the best.
+VALUE_REMAINING = 0.1
+MONTE_CARLO_DRAWS = 4000
+# Predictive z-score every arm must exceed, in the same direction, to flag a common shift
+SHIFT_Z = 2.58
+
+# phase_7_iteration.md decision_points
+STOP_TARGETS = "Achieved target KPIs"
+STOP_EXHAUSTED = "Exhausted viable strategies"
+STOP_DECLINING_RETURNS = "Consistent declining returns"
+STOP_EXTERNAL = "External factors dominate"
+RESET_FAILURES = "Three consecutive failures"
+RESET_BELOW_HALF = "KPIs below 50% of baseline"
+RESET_MARKET_SHIFT = "Fundamental market shift detected"
+REFERENCE_DECLINE = "Any KPI decline from baseline"
+REFERENCE_EXHAUSTED = "Strategy exhaustion reached"
+
+CONSECUTIVE_FAILURES = 3
+
+# phase_6_learning.md iteration_strategy branches
+ITERATION_STRATEGY = {
+    'metrics_improve': 'keep: promote winner as next baseline',
+    'metrics_improve_partially': 'adjust: fine_tune_not_overhaul',
+    'metrics_don_t_improve': 'gather: more_evidence_needed',
+    'metrics_get_worse': 'rollback: preserve_original',
+}
+
+Batch = Dict[str, Dict[str, Tuple[int, int]]]
+
+
+class VariantAllocator:
+    """Beta-Binomial posteriors per (variant, funnel stage)
+
+    Arm 0 (or `baseline`) is the posting currently live; the others are
+    challengers generated for this iteration. The objective is the end-to-end
+    funnel rate, the product of the stage rates. baseline_rates, when given,
+    are the original_kpis from the iteration tracker. max_batches caps the
+    test: once spent, recommend() stops on the current leader.
+    """
+
+    def __init__(self, arms: Sequence[str], stages: Sequence[str] = DEFAULT_FUNNEL,
+                 baseline: Optional[str] = None, prior: Tuple[float, float] = (1.0, 1.0),
+                 baseline_rates: Optional[Dict[str, float]] = None,
+                 targets: Optional[Dict[str, float]] = None,
+                 min_share: float = 0.05, draws: int = MONTE_CARLO_DRAWS,
+                 max_batches: Optional[int] = None, seed: Optional[int] = None):
+        if len(arms) < 2:
+            raise ValueError("VariantAllocator needs a baseline and at least one challenger")
+        self.arms = list(arms)
+        self.stages = list(stages)
+        self.baseline = self.arms.index(baseline) if baseline is not None else 0
+        shape = (len(self.arms), len(self.stages))
+        self.alpha = np.full(shape, prior[0], dtype=float)
+        self.beta = np.full(shape, prior[1], dtype=float)
+        self.baseline_rates = self._stage_vector(baseline_rates)
+        self.targets = self._stage_vector(targets)
+        self.min_share = min_share
+        self.draws = draws
+        self.max_batches = max_batches
+        self.rng = np.random.default_rng(seed)
+        self.batches = 0
+        # Challengers resolved against baseline, in the order they resolved
+        self.resolved: Dict[int, str] = {}
+        self.outcomes: List[str] = []
+        self.common_shift = False
+
+    def _stage_vector(self, rates: Optional[Dict[str, float]]) -> Optional[np.ndarray]:
+        if not rates:
+            return None
+        return np.array([rates.get(stage, np.nan) for stage in self.stages], dtype=float)
+
+    def update(self, batch: Batch) -> None:
+        """Fold in one KPI batch: {arm: {stage: (successes, trials)}}"""
+        successes = np.zeros_like(self.alpha)
+        trials = np.zeros_like(self.alpha)
+        for arm, stages in batch.items():
+            row = self.arms.index(arm)
+            for stage, (s, n) in stages.items():
+                if s > n:
+                    raise ValueError(f"{arm}/{stage}: {s} successes from {n} trials")
+                col = self.stages.index(stage)
+                successes[row, col] += s
+                trials[row, col] += n
+
+        self.common_shift = self._detect_common_shift(successes, trials)
+        self.alpha += successes
+        self.beta += trials - successes
+        self.batches += 1
+        self._resolve_challengers()
+
+    def sample(self) -> np.ndarray:
+        """Posterior draws of each stage rate, shape (draws, arms, stages)"""
+        return self.rng.beta(self.alpha, self.beta, size=(self.draws, *self.alpha.shape))
+
+    def funnel_samples(self) -> np.ndarray:
+        """Posterior draws of each arm's end-to-end rate, shape (draws, arms)"""
+        return self.sample().prod(axis=2)
+
+    def allocation(self) -> Dict[str, float]:
+        """Traffic share per arm for the next batch: P(arm is best), floored for baseline"""
+        funnel = self.funnel_samples()
+        wins = np.bincount(funnel.argmax(axis=1), minlength=len(self.arms)) / self.draws
+        # The baseline keeps a floor of traffic so drift in the market stays visible;
+        # the challengers split what is left in proportion to their wins
+        shares = wins / wins.sum()
+        if shares[self.baseline] < self.min_share:
+            challengers = np.arange(len(self.arms)) != self.baseline
+            shares[challengers] *= (1 - self.min_share) / shares[challengers].sum()
+            shares[self.baseline] = self.min_share
+        return dict(zip(self.arms, shares.tolist()))
+
+    def split(self, traffic: int) -> Dict[str, int]:
+        """Whole-impression split of the next batch's traffic"""
+        shares = np.array(list(self.allocation().values()))
+        counts = self.rng.multinomial(traffic, shares)
+        return dict(zip(self.arms, counts.tolist()))
+
+    def _prob_beats_baseline(self, funnel: np.ndarray) -> np.ndarray:
+        return (funnel > funnel[:, [self.baseline]]).mean(axis=0)
+
+    def _resolve_challengers(self) -> None:
+        funnel = self.funnel_samples()
+        beats = self._prob_beats_baseline(funnel)
+        for arm in range(len(self.arms)):
+            if arm == self.baseline or arm in self.resolved:
+                continue
+            if beats[arm] >= RESOLVE_CONFIDENCE:
+                self.resolved[arm] = 'success'
+            elif beats[arm] <= 1 - RESOLVE_CONFIDENCE:
+                self.resolved[arm] = 'failure'
+            else:
+                continue
+            self.outcomes.append(self.resolved[arm])
+
+    def _detect_common_shift(self, successes: np.ndarray, trials: np.ndarray) -> bool:
+        """Every observed arm's batch deviates from its posterior predictive, same side"""
+        observed = trials.sum(axis=1) > 0
+        if self.batches == 0 or observed.sum() < 2:
+            return False
+        total = self.alpha + self.beta
+        mean = self.alpha / total
+        # Beta-binomial predictive variance of each stage's batch successes
+        variance = trials * mean * (1 - mean) * (total + trials) / (total + 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = np.where(trials > 0, (successes - trials * mean) / np.sqrt(variance), 0.0)
+        stages_seen = np.maximum((trials > 0).sum(axis=1), 1)
+        arm_z = z.sum(axis=1)[observed] / np.sqrt(stages_seen[observed])
+        return bool((arm_z < -SHIFT_Z).all() or (arm_z > SHIFT_Z).all())
+
+    def _consecutive_failures(self) -> int:
+        count = 0
+        for outcome in reversed(self.outcomes):
+            if outcome != 'failure':
+                break
+            count += 1
+        return count
+
+    def iteration_strategy(self) -> Dict[str, Any]:
+        """phase_6_learning.md iteration_strategy branch for the current leader"""
+        samples = self.sample()
+        funnel = samples.prod(axis=2)
+        leader = int(np.argmax(funnel.mean(axis=0)))
+        if leader == self.baseline:
+            beats = self._prob_beats_baseline(funnel)
+            beats[self.baseline] = np.nan
+            if np.nanmax(beats, initial=0) <= 1 - CONFIDENCE:
+                outcome = 'metrics_get_worse'
+            else:
+                outcome = 'metrics_don_t_improve'
+            stage_lift: List[float] = [0.0] * len(self.stages)
+        else:
+            stage_better = (samples[:, leader] > samples[:, self.baseline]).mean(axis=0)
+            improved = stage_better >= CONFIDENCE
+            if improved.all():
+                outcome = 'metrics_improve'
+            elif improved.any() or self.resolved.get(leader) == 'success':
+                outcome = 'metrics_improve_partially'
+            else:
+                outcome = 'metrics_don_t_improve'
+            means = self.alpha / (self.alpha + self.beta)
+            stage_lift = (means[leader] / means[self.baseline] - 1).tolist()
+        return {
+            'leader': self.arms[leader],
+            'outcome': outcome,
+            'action': ITERATION_STRATEGY[outcome],
+            'stage_lift': dict(zip(self.stages, stage_lift)),
+        }
+
+    def recommend(self) -> Dict[str, Any]:
+        """Continue, stop or reset, with the Phase 7 decision points that fired"""
+        samples = self.sample()
+        funnel = samples.prod(axis=2)
+        leader = int(np.argmax(funnel.mean(axis=0)))
+        beats = self._prob_beats_baseline(funnel)
+
+        reset_reasons = []
+        if self._consecutive_failures() >= CONSECUTIVE_FAILURES:
+            reset_reasons.append(RESET_FAILURES)
+        if self.baseline_rates is not None:
+            historical = np.nanprod(self.baseline_rates)
+            # Variants that cannot reach half the original's rate
+            if (funnel < 0.5 * historical).mean(axis=0).min() >= CONFIDENCE:
+                reset_reasons.append(RESET_BELOW_HALF)
+            # The unchanged baseline moving this far means the market, not the copy, moved
+            base = funnel[:, self.baseline]
+            if max((base < 0.5 * historical).mean(), (base > 2 * historical).mean()) >= CONFIDENCE:
+                reset_reasons.append(RESET_MARKET_SHIFT)
+
+        stop_reasons = []
+        if self.targets is not None:
+            hit = np.ones(self.draws, dtype=bool)
+            for col in np.flatnonzero(~np.isnan(self.targets)):
+                hit &= samples[:, leader, col] >= self.targets[col]
+            if hit.mean() >= CONFIDENCE:
+                stop_reasons.append(STOP_TARGETS)
+        challengers = [arm for arm in range(len(self.arms)) if arm != self.baseline]
+        if all(self.resolved.get(arm) == 'failure' for arm in challengers):
+            stop_reasons.append(STOP_EXHAUSTED)
+        # Potential value remaining: what committing to the leader could still cost
+        best = funnel.max(axis=1)
+        shortfall = np.quantile((best - funnel[:, leader]) / funnel[:, leader], CONFIDENCE)
+        # A spent test budget is a declining return as well: commit to the leader
+        spent = self.max_batches is not None and self.batches >= self.max_batches
+        if self.batches and (shortfall < VALUE_REMAINING or spent):
+            stop_reasons.append(STOP_DECLINING_RETURNS)
+        if self.common_shift:
+            stop_reasons.append(STOP_EXTERNAL)
+
+        reference = []
+        if (beats <= 1 - CONFIDENCE).any():
+            reference.append(REFERENCE_DECLINE)
+        if STOP_EXHAUSTED in stop_reasons:
+            reference.append(REFERENCE_EXHAUSTED)
+
+        if reset_reasons:
+            action, reasons = 'reset', reset_reasons
+        elif stop_reasons:
+            action, reasons = 'stop', stop_reasons
+        else:
+            action, reasons = 'continue', []
+        return {
+            'action': action,
+            'reasons': reasons,
+            'leader': self.arms[leader],
+            'prob_beats_baseline': dict(zip(self.arms, beats.tolist())),
+            'reference_original': reference,
+            'batches': self.batches,
+        }
+
+
+def simulate_funnel(rng: np.random.Generator, rates: np.ndarray,
+                    impressions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Binomial draws down the funnel: (successes, trials), each (arms, stages)"""
+    successes = np.zeros(rates.shape, dtype=np.int64)
+    trials = np.zeros(rates.shape, dtype=np.int64)
+    entering = impressions.astype(np.int64)
+    for col in range(rates.shape[1]):
+        trials[:, col] = entering
+        successes[:, col] = rng.binomial(entering, rates[:, col])
+        entering = successes[:, col]
+    return successes, trials
+
+
+def _as_batch(arms: List[str], stages: List[str], successes: np.ndarray,
+              trials: np.ndarray) -> Batch:
+    return {arm: {stage: (int(successes[i, j]), int(trials[i, j]))
+                  for j, stage in enumerate(stages)}
+            for i, arm in enumerate(arms) if trials[i, 0]}
+
+
+def simulate_thompson(true_rates: np.ndarray, daily_traffic: int = 20_000,
+                      batch_days: int = 1, max_days: int = 180,
+                      seed: Optional[int] = None, **allocator_kwargs) -> Dict[str, Any]:
+    """Run concurrent variants on simulated traffic until the allocator says stop or reset"""
+    rng = np.random.default_rng(seed)
+    true_rates = np.asarray(true_rates, dtype=float)
+    arms = [f'variant_{i}' for i in range(true_rates.shape[0])]
+    stages = [f'stage_{j}' for j in range(true_rates.shape[1])]
+    allocator_kwargs.setdefault('draws', 1000)
+    allocator_kwargs.setdefault('max_batches', max_days // batch_days)
+    allocator = VariantAllocator(arms, stages, seed=seed, **allocator_kwargs)
+    funnel = true_rates.prod(axis=1)
+    best = int(funnel.argmax())
+    conversions = 0
+    day = 0
+    converged: Optional[int] = None
+    decision = allocator.recommend()
+    while day < max_days:
+        shares = np.array(list(allocator.allocation().values()))
+        impressions = rng.multinomial(daily_traffic * batch_days, shares)
+        successes, trials = simulate_funnel(rng, true_rates, impressions)
+        conversions += int(successes[:, -1].sum())
+        allocator.update(_as_batch(arms, stages, successes, trials))
+        day += batch_days
+        decision = allocator.recommend()
+        # Day from which the leader is the true best and stays so
+        if arms.index(decision['leader']) == best:
+            converged = day if converged is None else converged
+        else:
+            converged = None
+        if decision['action'] != 'continue':
+            break
+    chosen = arms.index(decision['leader'])
+    return {
+        'days': day,
+        'converged_day': converged,
+        'action': decision['action'],
+        'reasons': decision['reasons'],
+        'chosen': chosen,
+        'correct': chosen == best,
+        'regret': float(funnel.max() * daily_traffic * day - conversions),
+    }
+
+
+def simulate_sequential(true_rates: np.ndarray, daily_traffic: int = 20_000,
+                        iteration_days: int = 14, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Current Phase 7 behavior: one challenger per iteration, all traffic, kept if it wins"""
+    rng = np.random.default_rng(seed)
+    true_rates = np.asarray(true_rates, dtype=float)
+    funnel = true_rates.prod(axis=1)
+    best = int(funnel.argmax())
+    traffic = np.full(1, daily_traffic * iteration_days)
+
+    def observe(arm: int) -> Tuple[float, int]:
+        successes, _ = simulate_funnel(rng, true_rates[[arm]], traffic)
+        return successes[0, -1] / traffic[0], int(successes[0, -1])
+
+    current, current_rate = 0, 0.0
+    conversions = 0
+    converged: Optional[int] = None
+    for iteration in range(len(funnel)):
+        rate, gained = observe(iteration)
+        conversions += gained
+        if iteration == 0 or rate > current_rate:
+            current, current_rate = iteration, rate
+        if current == best:
+            converged = converged or (iteration + 1) * iteration_days
+        else:
+            converged = None
+    days = iteration_days * len(funnel)
+    return {
+        'days': days,
+        'converged_day': converged,
+        'chosen': current,
+        'correct': current == best,
+        'regret': float(funnel.max() * daily_traffic * days - conversions),
+    }
+
+
+def benchmark(true_rates: np.ndarray, runs: int = 20, daily_traffic: int = 20_000,
+              iteration_days: int = 14, **allocator_kwargs) -> Dict[str, Dict[str, float]]:
+    """Days to a decision, days to settle on the true best, accuracy and regret, over seeds
+
+    Thompson sampling gets the same time budget sequential testing spends,
+    one iteration per variant.
+    """
+    allocator_kwargs.setdefault('max_days', iteration_days * len(true_rates))
+    strategies = {
+        'thompson': lambda seed: simulate_thompson(true_rates, daily_traffic, seed=seed,
+                                                   **allocator_kwargs),
+        'sequential': lambda seed: simulate_sequential(true_rates, daily_traffic,
+                                                       iteration_days, seed=seed),
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for name, run in strategies.items():
+        outcomes = [run(seed) for seed in range(runs)]
+        converged = [o['converged_day'] for o in outcomes if o['converged_day'] is not None]
+        results[name] = {
+            'mean_days': float(np.mean([o['days'] for o in outcomes])),
+            'mean_converged_day': float(np.mean(converged)) if converged else float('nan'),
+            'accuracy': float(np.mean([o['correct'] for o in outcomes])),
+            'mean_regret': float(np.mean([o['regret'] for o in outcomes])),
+        }
+    return results
+
+
+def default_scenario(variants: int = 5, seed: int = 0) -> np.ndarray:
+    """Baseline funnel plus challengers up to ~40% better or worse end to end"""
+    rng = np.random.default_rng(seed)
+    base = np.array([0.02, 0.10, 0.15])
+    lifts = rng.uniform(0.75, 1.25, size=(variants - 1, base.size))
+    return np.vstack([base, base * lifts])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark variant allocation offline')
+    parser.add_argument('--variants', type=int, default=5)
+    parser.add_argument('--daily-traffic', type=int, default=20_000)
+    parser.add_argument('--iteration-days', type=int, default=14)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rates = default_scenario(args.variants, args.seed)
+    print("End-to-end rates:", np.round(rates.prod(axis=1) * 1e4, 2), "per 10k impressions")
+
+    results = benchmark(rates, runs=args.runs, daily_traffic=args.daily_traffic,
+                        iteration_days=args.iteration_days)
+    for name, stats in results.items():
+        print(f"{name:>10}: decided in {stats['mean_days']:.1f} days, "
+              f"settled on best by day {stats['mean_converged_day']:.1f}, "
+              f"{stats['accuracy']:.0%} picked best, regret {stats['mean_regret']:.1f}")
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Content-addressed response cache for PD-SMIS model calls
+Keys on (phase module hash, normalized phase inputs, model settings)
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .inputs import (
+    AD_AUDIENCE, AD_INTRO, AD_KPIS, JOB_KPIS, JOB_POSTING,
+    JOB_TITLE, PROJECT_DESCRIPTION, USER_FEEDBACK, normalize_text
+)
+
+FRAMEWORK_ROOT = Path(__file__).resolve().parent.parent
+
+# Input sections each phase module actually reads. Anything not listed is
+# left out of that phase's key, so e.g. a KPI-only iteration reuses Phase 1.
+PHASE_INPUTS = {
+    'phases/phase_1_extraction.md': [
+        PROJECT_DESCRIPTION, JOB_TITLE, JOB_POSTING,
+        AD_INTRO, AD_AUDIENCE
+    ],
+    'phases/phase_2_hypothesis.md': [JOB_KPIS, AD_KPIS, USER_FEEDBACK],
+    'phases/phase_3_optimization.md': [JOB_KPIS, AD_KPIS, USER_FEEDBACK],
+    'phases/phase_4_generation.md': [JOB_TITLE, JOB_POSTING, AD_INTRO],
+    'validation/adversarial_validation.md': [
+        PROJECT_DESCRIPTION, JOB_TITLE, JOB_POSTING
+    ],
+}
+
+# Modules whose responses are final validation verdicts. These are never
+# cached while validation_orchestrator.md keeps cache_validation_results: false.
+VERDICT_MODULES = {
+    'validation/validation_orchestrator.md',
+    'validation/verification_suite.md',
+}
+
+_module_hashes: Dict[Path, tuple] = {}
+
+
+def module_hash(module: str, root: Path = FRAMEWORK_ROOT) -> str:
+    """sha256 of a phase module's text, memoized on file mtime"""
+    path = root / module
+    stat = path.stat()
+    cached = _module_hashes.get(path)
+    if cached and cached[0] == stat.st_mtime_ns:
+        return cached[1]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    _module_hashes[path] = (stat.st_mtime_ns, digest)
+    return digest
+
+
+def validation_results_cacheable(root: Path = FRAMEWORK_ROOT) -> bool:
+    """Read optimization_strategies.caching.cache_validation_results from the spec"""
+    path = root / 'validation' / 'validation_orchestrator.md'
+    if not path.exists():
+        return False
+    match = re.search(r'cache_validation_results:\s*(true|false)', path.read_text())
+    return bool(match) and match.group(1) == 'true'
+
+
+def normalize_value(value: Any) -> Any:
+    """Recursively normalize strings inside phase inputs"""
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, dict):
+        return {str(k): normalize_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(v) for v in value]
+    return value
+
+
+def phase_inputs(module: str, sections: Dict[str, str],
+                 upstream: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Select the input sections a phase reads plus any upstream phase outputs"""
+    wanted = PHASE_INPUTS.get(module)
+    if wanted is None:
+        selected = dict(sections)
+    else:
+        selected = {name: sections[name] for name in wanted if name in sections}
+    if upstream:
+        selected['__upstream__'] = upstream
+    return selected
+
+
+def changed_phases(previous: Dict[str, str], current: Dict[str, str]) -> List[str]:
+    """Phase modules whose selected inputs differ between two iterations"""
+    changed = []
+    for module in PHASE_INPUTS:
+        before = normalize_value(phase_inputs(module, previous))
+        after = normalize_value(phase_inputs(module, current))
+        if before != after:
+            changed.append(module)
+    return changed
+
+
+class CacheBackend:
+    """Storage interface for ResponseCache; values are JSON-serializable"""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU bounded by total serialized size"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: Any) -> None:
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+class DiskBackend(CacheBackend):
+    """One JSON file per key under a directory, LRU-evicted by access time"""
+
+    def __init__(self, directory: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+        self._size = 0
+        entries = sorted(self.directory.glob('*.json'), key=lambda p: p.stat().st_mtime)
+        for path in entries:
+            size = path.stat().st_size
+            self._index[path.stem] = size
+            self._size += size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Evicted by another process between the read and the touch
+                self._size -= self._index.pop(key, 0)
+                return None
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        payload = json.dumps(value)
+        size = len(payload.encode())
+        if size > self.max_bytes:
+            return
+        path = self._path(key)
+        # A private temp file per writer, so concurrent writers of one key
+        # never share or rename each other's partial files
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, prefix=f'.{key}.',
+                                         suffix='.tmp', delete=False) as tmp:
+            tmp.write(payload)
+        try:
+            os.replace(tmp.name, path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest, oldest_size = self._index.popitem(last=False)
+                self._size -= oldest_size
+                self._path(oldest).unlink(missing_ok=True)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._index:
+                self._path(key).unlink(missing_ok=True)
+            self._index.clear()
+            self._size = 0
+
+
+class ResponseCache:
+    """Content-addressed cache in front of per-phase model calls"""
+
+    def __init__(self, backend: Optional[CacheBackend] = None,
+                 root: Path = FRAMEWORK_ROOT):
+        self.backend = backend or MemoryBackend()
+        self.root = Path(root)
+        self.cache_verdicts = validation_results_cacheable(self.root)
+        self.stats = {'hits': 0, 'misses': 0, 'uncacheable': 0}
+
+    def key_for(self, module: str, inputs: Dict[str, Any],
+                settings: Optional[Dict[str, Any]] = None) -> str:
+        """Stable key over module text, normalized inputs and model settings"""
+        material = {
+            'module': module,
+            'module_hash': module_hash(module, self.root),
+            'inputs': normalize_value(inputs),
+            'settings': settings or {},
+        }
+        encoded = json.dumps(material, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def cacheable(self, module: str, verdict: bool = False) -> bool:
+        """Final validation verdicts are only cached if the spec allows it"""
+        if verdict or module in VERDICT_MODULES:
+            return self.cache_verdicts
+        return True
+
+    def get_or_call(self, module: str, inputs: Dict[str, Any],
+                    call: Callable[[], Any],
+                    settings: Optional[Dict[str, Any]] = None,
+                    verdict: bool = False) -> Any:
+        """Return the cached response for this phase call, or run call() and store it"""
+        if not self.cacheable(module, verdict):
+            self.stats['uncacheable'] += 1
+            return call()
+
+        key = self.key_for(module, inputs, settings)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.stats['hits'] += 1
+            return cached['response']
+
+        self.stats['misses'] += 1
+        response = call()
+        self.backend.set(key, {'module': module, 'stored_at': time.time(),
+                               'response': response})
+        return response
+
+    async def aget_or_call(self, module: str, inputs: Dict[str, Any],
+                           call: Callable[[], Awaitable[Any]],
+                           settings: Optional[Dict[str, Any]] = None,
+                           verdict: bool = False) -> Any:
+        """Async get_or_call for callers running on an event loop"""
+        if not self.cacheable(module, verdict):
+            self.stats['uncacheable'] += 1
+            return await call()
+
+        key = self.key_for(module, inputs, settings)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.stats['hits'] += 1
+            return cached['response']
+
+        self.stats['misses'] += 1
+        response = await call()
+        self.backend.set(key, {'module': module, 'stored_at': time.time(),
+                               'response': response})
+        return response
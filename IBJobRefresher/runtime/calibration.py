@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Confidence calibration for the VALIDATION_ORCHESTRATOR confidence_aggregation
+Logs each check's confidence with the eventual outcome, measures calibration
+over the whole history and refits the weights and PASS_WITH_WARNING cutoff
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+# validation_orchestrator.md confidence_aggregation.calculate_confidence
+CHECKS = ('tier_check', 'adversarial', 'semantic', 'performance', 'domain')
+DEFAULT_WEIGHTS = {
+    'tier_check': 0.25,
+    'adversarial': 0.25,
+    'semantic': 0.20,
+    'performance': 0.15,
+    'domain': 0.15,
+}
+# action_decision: passes below this confidence are PASS_WITH_WARNING
+WARNING_THRESHOLD = 0.7
+
+REGENERATE = 'REGENERATE'
+PASS_WITH_WARNING = 'PASS_WITH_WARNING'
+PASS_CLEAN = 'PASS_CLEAN'
+
+# PERFORMANCE_TARGETS.confidence_accuracy
+TARGET_ACCURACY = 0.85
+RELIABILITY_BINS = 10
+# A refit needs this many resolved validations (and PASS_CLEAN candidates)
+MIN_RECORDS = 50
+
+_FIT_STEPS = 2000
+
+
+def weighted_confidence(confidences: Dict[str, float],
+                        weights: Optional[Dict[str, float]] = None) -> float:
+    """weighted_average over the checks that reported a confidence"""
+    weights = weights or DEFAULT_WEIGHTS
+    present = [check for check in CHECKS if confidences.get(check) is not None]
+    total = sum(weights[check] for check in present)
+    if not total:
+        return 0.0
+    return sum(weights[check] * confidences[check] for check in present) / total
+
+
+def determine_action(passed: bool, confidence: float,
+                     threshold: float = WARNING_THRESHOLD) -> str:
+    """action_decision; confidence never turns a failure into a pass"""
+    if not passed:
+        return REGENERATE
+    if confidence < threshold:
+        return PASS_WITH_WARNING
+    return PASS_CLEAN
+
+
+def calculate_confidence(results: Dict[str, Dict[str, Any]],
+                         weights: Optional[Dict[str, float]] = None,
+                         threshold: float = WARNING_THRESHOLD) -> Dict[str, Any]:
+    """confidence_aggregation over {check: {'passed', 'confidence'}}"""
+    passed = all(result.get('passed', False) for result in results.values())
+    confidence = weighted_confidence(
+        {check: result.get('confidence') for check, result in results.items()}, weights)
+    return {
+        'passed': passed,
+        'confidence': confidence,
+        'action': determine_action(passed, confidence, threshold),
+    }
+
+
+def brier_score(confidence: np.ndarray, outcome: np.ndarray) -> float:
+    """Mean squared gap between confidence and the 0/1 outcome"""
+    if confidence.size == 0:
+        return float('nan')
+    return float(np.mean((confidence - outcome) ** 2))
+
+
+def reliability_curve(confidence: np.ndarray, outcome: np.ndarray,
+                      bins: int = RELIABILITY_BINS) -> Dict[str, np.ndarray]:
+    """Mean confidence vs observed accuracy per equal-width confidence bin"""
+    index = np.clip((confidence * bins).astype(int), 0, bins - 1)
+    counts = np.bincount(index, minlength=bins)
+    with np.errstate(invalid='ignore'):
+        mean_confidence = np.bincount(index, weights=confidence, minlength=bins) / counts
+        accuracy = np.bincount(index, weights=outcome.astype(float), minlength=bins) / counts
+    return {
+        'edges': np.linspace(0, 1, bins + 1),
+        'count': counts,
+        'confidence': mean_confidence,
+        'accuracy': accuracy,
+    }
+
+
+def expected_calibration_error(confidence: np.ndarray, outcome: np.ndarray,
+                               bins: int = RELIABILITY_BINS) -> float:
+    """Count-weighted mean |confidence - accuracy| over the reliability bins"""
+    curve = reliability_curve(confidence, outcome, bins)
+    filled = curve['count'] > 0
+    if not filled.any():
+        return float('nan')
+    gaps = np.abs(curve['confidence'][filled] - curve['accuracy'][filled])
+    return float(np.average(gaps, weights=curve['count'][filled]))
+
+
+def confidence_accuracy(confidence: np.ndarray, outcome: np.ndarray,
+                        threshold: float = WARNING_THRESHOLD) -> float:
+    """Share of validations where confidence >= threshold matched the outcome"""
+    if confidence.size == 0:
+        return float('nan')
+    return float(np.mean((confidence >= threshold) == outcome.astype(bool)))
+
+
+def _project_simplex(v: np.ndarray) -> np.ndarray:
+    """Closest non-negative vector summing to 1"""
+    u = np.sort(v)[::-1]
+    cumulative = np.cumsum(u) - 1
+    rho = np.flatnonzero(u - cumulative / np.arange(1, v.size + 1) > 0)[-1]
+    return np.maximum(v - cumulative[rho] / (rho + 1), 0)
+
+
+def fit_weights(confidences: np.ndarray, outcome: np.ndarray) -> np.ndarray:
+    """Simplex weights minimizing the Brier score of the weighted average
+
+    confidences has shape (n_validations, n_checks) with no missing values.
+    """
+    x = confidences
+    y = outcome.astype(float)
+    # Lipschitz constant of the gradient gives a safe fixed step
+    step = x.shape[0] / (2 * np.linalg.norm(x, 2) ** 2 + 1e-12)
+    w = np.full(x.shape[1], 1 / x.shape[1])
+    for _ in range(_FIT_STEPS):
+        gradient = 2 * x.T @ (x @ w - y) / x.shape[0]
+        w = _project_simplex(w - step * gradient)
+    return w
+
+
+def fit_threshold(confidence: np.ndarray, outcome: np.ndarray,
+                  target: float = TARGET_ACCURACY,
+                  min_support: int = MIN_RECORDS) -> Optional[float]:
+    """Cutoff that best separates held-up passes from the rest
+
+    Maximizes confidence_accuracy among cutoffs whose PASS_CLEAN passes
+    (at least min_support of them) are correct at least target of the time;
+    ties go to the lower cutoff. Returns None when no cutoff qualifies.
+    """
+    order = np.argsort(-confidence, kind='stable')
+    ranked = confidence[order]
+    hits = np.cumsum(outcome[order])
+    cleaned = np.arange(1, ranked.size + 1)
+    # Above the cut: correct if the outcome held; below: correct if it did not
+    accuracy = (hits + (ranked.size - outcome.sum()) - (cleaned - hits)) / max(ranked.size, 1)
+    # Only cut between distinct confidences
+    last_of_value = np.append(ranked[1:] != ranked[:-1], True)
+    eligible = last_of_value & (hits / cleaned >= target) & (cleaned >= min_support)
+    if not eligible.any():
+        return None
+    candidates = np.flatnonzero(eligible)
+    best = candidates[accuracy[candidates] == accuracy[candidates].max()][-1]
+    return float(ranked[best])
+
+
+class CalibrationLog:
+    """Append-only log of check confidences, resolved later with outcomes
+
+    Each validation is recorded when it runs and resolved once its outcome
+    is known (e.g. a later adversarial round or review found a violation in
+    content that passed). With a path, events are appended as JSON lines.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self.records: Dict[str, Dict[str, Any]] = {}
+        if self.path is not None and self.path.exists():
+            for line in self.path.read_text().splitlines():
+                if line.strip():
+                    self._apply(json.loads(line))
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        record = self.records.setdefault(event['key'], {'outcome': None})
+        record.update({k: v for k, v in event.items() if k != 'key'})
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        self._apply(event)
+        if self.path is not None:
+            with self.path.open('a') as f:
+                f.write(json.dumps(event, sort_keys=True) + '\n')
+
+    def record(self, key: str, confidences: Dict[str, float], passed: bool,
+               outcome: Optional[Union[bool, Dict[str, bool]]] = None) -> None:
+        """Log one validation's per-check confidences and its pass/fail decision"""
+        event = {'key': key, 'passed': bool(passed),
+                 'confidences': {c: float(v) for c, v in confidences.items() if v is not None}}
+        if outcome is not None:
+            event['outcome'] = outcome
+        self._append(event)
+
+    def resolve(self, key: str, outcome: Union[bool, Dict[str, bool]]) -> None:
+        """Attach the eventual outcome: True if the verdict held up
+
+        A dict gives per-check outcomes; the overall outcome is then all of them.
+        """
+        if key not in self.records:
+            raise KeyError(f"No validation recorded under {key!r}")
+        self._append({'key': key, 'outcome': outcome})
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Resolved history as arrays; missing confidences are NaN"""
+        resolved = [r for r in self.records.values() if r.get('outcome') is not None]
+        confidences = np.full((len(resolved), len(CHECKS)), np.nan)
+        check_outcomes = np.full((len(resolved), len(CHECKS)), np.nan)
+        outcome = np.zeros(len(resolved), dtype=bool)
+        passed = np.zeros(len(resolved), dtype=bool)
+        for row, record in enumerate(resolved):
+            for column, check in enumerate(CHECKS):
+                if check in record['confidences']:
+                    confidences[row, column] = record['confidences'][check]
+            if isinstance(record['outcome'], dict):
+                for column, check in enumerate(CHECKS):
+                    if check in record['outcome']:
+                        check_outcomes[row, column] = record['outcome'][check]
+                outcome[row] = all(record['outcome'].values())
+            else:
+                check_outcomes[row] = record['outcome']
+                outcome[row] = record['outcome']
+            passed[row] = record['passed']
+        return {'confidences': confidences, 'check_outcomes': check_outcomes,
+                'outcome': outcome, 'passed': passed}
+
+    @staticmethod
+    def _aggregate(confidences: np.ndarray, weights: Dict[str, float]) -> np.ndarray:
+        """weighted_confidence for every row at once"""
+        w = np.array([weights[check] for check in CHECKS])
+        present = ~np.isnan(confidences)
+        total = present @ w
+        weighted = np.where(present, confidences, 0) @ w
+        return np.divide(weighted, total, out=np.zeros_like(weighted), where=total > 0)
+
+    def report(self, weights: Optional[Dict[str, float]] = None,
+               threshold: float = WARNING_THRESHOLD) -> Dict[str, Any]:
+        """Calibration of the aggregate and of each check over the resolved history"""
+        weights = weights or DEFAULT_WEIGHTS
+        data = self.arrays()
+        confidence = self._aggregate(data['confidences'], weights)
+        outcome = data['outcome']
+        clean = data['passed'] & (confidence >= threshold)
+
+        per_check = {}
+        for column, check in enumerate(CHECKS):
+            known = ~np.isnan(data['confidences'][:, column]) \
+                & ~np.isnan(data['check_outcomes'][:, column])
+            values = data['confidences'][known, column]
+            results = data['check_outcomes'][known, column]
+            per_check[check] = {
+                'records': int(known.sum()),
+                'brier': brier_score(values, results),
+                'ece': expected_calibration_error(values, results),
+            }
+
+        accuracy = confidence_accuracy(confidence, outcome, threshold)
+        return {
+            'records': int(outcome.size),
+            'weights': dict(weights),
+            'threshold': threshold,
+            'brier': brier_score(confidence, outcome),
+            'ece': expected_calibration_error(confidence, outcome),
+            'confidence_accuracy': accuracy,
+            'meets_target': bool(accuracy >= TARGET_ACCURACY),
+            # PASS_CLEAN skips ADDITIONAL_SCRUTINY_ROUND; these are the ones that were wrong
+            'clean_rate': float(clean.mean()) if clean.size else float('nan'),
+            'clean_precision': float(outcome[clean].mean()) if clean.any() else float('nan'),
+            'reliability': reliability_curve(confidence, outcome),
+            'per_check': per_check,
+        }
+
+    def refit(self, target: float = TARGET_ACCURACY,
+              min_records: int = MIN_RECORDS) -> Dict[str, Any]:
+        """Offline refit of weights and cutoff; defaults are kept if history is too thin"""
+        data = self.arrays()
+        complete = ~np.isnan(data['confidences']).any(axis=1)
+        weights = dict(DEFAULT_WEIGHTS)
+        if complete.sum() >= min_records:
+            fitted = fit_weights(data['confidences'][complete], data['outcome'][complete])
+            weights = {check: float(w) for check, w in zip(CHECKS, fitted)}
+
+        passed = data['passed']
+        confidence = self._aggregate(data['confidences'], weights)
+        threshold = fit_threshold(confidence[passed], data['outcome'][passed], target,
+                                  min_records)
+        return {
+            'weights': weights,
+            'threshold': WARNING_THRESHOLD if threshold is None else threshold,
+            'threshold_fitted': threshold is not None,
+            'before': self.report(),
+            'after': self.report(weights, WARNING_THRESHOLD if threshold is None else threshold),
+        }
+
+
+def load_calibration(path: Path) -> Dict[str, Any]:
+    """Weights and threshold written by a refit, for calculate_confidence"""
+    fit = json.loads(Path(path).read_text())
+    return {'weights': fit['weights'], 'threshold': fit['threshold']}
+
+
+def simulate_history(n: int = 2000, seed: int = 0) -> CalibrationLog:
+    """Synthetic log where checks differ in how well they predict the outcome"""
+    rng = np.random.default_rng(seed)
+    log = CalibrationLog()
+    # Sharpness per check: how far its confidence moves with the true outcome
+    signal = {'tier_check': 0.35, 'adversarial': 0.30, 'semantic': 0.05,
+              'performance': 0.0, 'domain': 0.15}
+    correct = rng.random(n) < 0.8
+    for i in range(n):
+        confidences = {}
+        for check, strength in signal.items():
+            centre = 0.6 + (strength if correct[i] else -strength)
+            confidences[check] = float(np.clip(rng.normal(centre, 0.12), 0, 1))
+        log.record(f'validation-{i}', confidences, passed=True, outcome=bool(correct[i]))
+    return log
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Refit confidence_aggregation offline')
+    parser.add_argument('--log', type=Path, help='JSONL calibration log (default: simulated)')
+    parser.add_argument('--out', type=Path, help='write the fitted weights and threshold here')
+    args = parser.parse_args()
+
+    log = CalibrationLog(args.log) if args.log else simulate_history()
+    fit = log.refit()
+    for name in ('before', 'after'):
+        report = fit[name]
+        print(f"{name:>6}: Brier {report['brier']:.3f}, ECE {report['ece']:.3f}, "
+              f"confidence accuracy {report['confidence_accuracy']:.1%} "
+              f"({'meets' if report['meets_target'] else 'misses'} {TARGET_ACCURACY:.0%}), "
+              f"PASS_CLEAN {report['clean_rate']:.1%} at {report['clean_precision']:.1%} precision")
+    print("Weights:", {check: round(w, 3) for check, w in fit['weights'].items()})
+    print(f"Threshold: {fit['threshold']:.3f}"
+          + ("" if fit['threshold_fitted'] else " (not enough history; default kept)"))
+    if args.out:
+        args.out.write_text(json.dumps({'weights': fit['weights'],
+                                        'threshold': fit['threshold']}, indent=2))
+        print(f"Created: {args.out}")
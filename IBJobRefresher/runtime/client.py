@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Async request layer for PD-SMIS model calls
+Global concurrency and rate limits, pooled backends, single-flight coalescing
+and jittered retries that never retry an ABORT
+"""
+
+import asyncio
+import copy
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .errors import ModelError, PipelineAbort
+from .models import ModelBackend, request_key
+
+# RECOVERY_STRATEGIES.validation_failure: max_retries 3, exponential backoff
+MAX_RETRIES = 3
+
+
+class RateLimiter:
+    """Token bucket: at most `rate` requests per second, bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _LeaderCancelled(Exception):
+    """Set on a coalesced future when its leading call was cancelled"""
+
+
+class AsyncModelClient:
+    """Shared entry point for every model call in a multi-posting run
+
+    - max_concurrency caps in-flight calls across all postings
+    - rate_per_second (optional) throttles call starts
+    - a single backend is shared by all calls (it must be safe for
+      concurrent use); a list of backends is a pool, checked out one per
+      call, so a backend holding a connection is never used twice at once
+    - identical in-flight requests are coalesced into one backend call;
+      followers get their own copy of the result, and if the leading call
+      is cancelled one follower takes over instead of being cancelled too
+    - TransientModelError is retried with full-jitter exponential backoff;
+      PipelineAbort and non-retryable ModelError propagate immediately
+    """
+
+    def __init__(self, backends: Union[ModelBackend, List[ModelBackend]],
+                 max_concurrency: int = 5,
+                 rate_per_second: Optional[float] = None, max_retries: int = MAX_RETRIES,
+                 base_delay: float = 0.5, max_delay: float = 8.0, seed: Optional[int] = None):
+        if isinstance(backends, ModelBackend):
+            self.shared: Optional[ModelBackend] = backends
+            self.backends = [backends]
+        else:
+            if not backends:
+                raise ValueError("AsyncModelClient needs at least one backend")
+            self.shared = None
+            self.backends = list(backends)
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._random = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {'requests': 0, 'coalesced': 0, 'backend_calls': 0, 'retries': 0}
+
+    @classmethod
+    def from_factory(cls, factory: Callable[[], ModelBackend], pool_size: int = 5,
+                     **kwargs) -> 'AsyncModelClient':
+        """Pool of pool_size backends, concurrency defaulting to the pool size"""
+        kwargs.setdefault('max_concurrency', pool_size)
+        return cls([factory() for _ in range(pool_size)], **kwargs)
+
+    def _bind(self) -> None:
+        """asyncio primitives belong to one loop; rebuild them when the loop changes"""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._limiter = RateLimiter(self.rate_per_second) if self.rate_per_second else None
+        self._pool: asyncio.Queue = asyncio.Queue()
+        for backend in self.backends:
+            self._pool.put_nowait(backend)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def complete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request, sharing the result with identical in-flight requests"""
+        self._bind()
+        self.stats['requests'] += 1
+        key = request_key(request)
+        while key in self._in_flight:
+            self.stats['coalesced'] += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(self._in_flight[key]))
+            except _LeaderCancelled:
+                # Only the leader was cancelled; the first follower back re-runs it
+                continue
+
+        future = self._loop.create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._with_retries(request)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a leader-only failure does not log as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _with_retries(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            try:
+                return await self._call_backend(request)
+            except PipelineAbort:
+                raise
+            except ModelError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+            attempt += 1
+            self.stats['retries'] += 1
+            ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+            await asyncio.sleep(self._random.uniform(0, ceiling))
+
+    async def _call_backend(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._semaphore:
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            self.stats['backend_calls'] += 1
+            if self.shared is not None:
+                return await self.shared.acomplete(request)
+            backend = await self._pool.get()
+            try:
+                return await backend.acomplete(request)
+            finally:
+                self._pool.put_nowait(backend)
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Batch engagement and readability scoring for PD-SMIS v5.1
+Scores candidate postings against the original as arrays and rejects the ones
+that fail the Phase 5B PERFORMANCE_IMPACT_VERIFICATION checks before any model call
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .inputs import heading_section
+from .versions import split_elements
+
+# Canonical posting sections; checked in order, so "Preferred qualifications"
+# is nice_to_have rather than requirements. Phrasings addressed to the
+# candidate ("What you'll bring", "About you") are common synonyms.
+SECTIONS = {
+    'about': r'about(?! you)|company|who we are|our team|overview|mission',
+    'role': r'role|responsibilit|what you.ll do|what you.ll work on|day to day|position|'
+            r'the job|the opportunity|your impact',
+    'nice_to_have': r'nice to have|nice-to-have|preferred|bonus|plus',
+    'requirements': r'requirement|qualification|must have|what you.ll need|looking for|skills|'
+                    r'what you.ll bring|you bring|you have|about you|who you are|'
+                    r'your background|your profile|experience',
+    'benefits': r'benefit|perks|what we offer|why join|we offer|in it for you|you.ll get|'
+                r'why you.ll love',
+    'compensation': r'salary|compensation|pay\b',
+    'apply': r'apply|how to|next steps',
+}
+
+# Buzzwords that read as filler rather than information
+JARGON = (
+    'rockstar', 'rock star', 'ninja', 'guru', 'wizard', 'unicorn', 'synergy', 'synergies',
+    'leverage', 'paradigm', 'disruptive', 'best-in-class', 'world-class', 'cutting-edge',
+    'bleeding-edge', 'fast-paced', 'self-starter', 'go-getter', 'wear many hats',
+    'hit the ground running', 'move the needle', 'think outside the box', 'results-driven',
+    'value-add', 'game-changer', 'dynamic environment',
+)
+
+# Words per sentence above which a sentence counts as long
+LONG_SENTENCE_WORDS = 25
+
+# phase_3_optimization.md emoji_strategy: "8-10 total (diminishing returns above)"
+MAX_EMOJIS = 10
+
+# Allowed drift from the original before a candidate counts as a regression
+TOLERANCES = {
+    'readability': 5.0,            # Flesch reading-ease points
+    'long_sentence_share': 0.10,
+    'jargon_ratio': 0.005,
+}
+
+# OPTIMIZE_ENGAGEMENT_ELEMENTS: visual_hierarchy, chunking_strategy,
+# emphasis_techniques and emoji_strategy
+ENGAGEMENT_WEIGHTS = {
+    'sections': 0.30,
+    'chunking': 0.30,
+    'emphasis': 0.15,
+    'emoji': 0.15,
+    'length': 0.10,
+}
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z'-]*")
+_VOWEL_GROUP = re.compile(r'[aeiouy]+')
+_BULLET = re.compile(r'^\s*(?:[-*•▪◦]|\d+[.)])\s+')
+_EMPHASIS = re.compile(r'\*\*[^*\n]+\*\*|__[^_\n]+__')
+_EMOJI = re.compile('[\U0001F300-\U0001FAFF☀-➿]')
+_YEARS = re.compile(r'(\d+)\s*\+?\s*(?:years|yrs)', re.IGNORECASE)
+_MUST = re.compile(r'\b(?:must|required|mandatory|essential)\b', re.IGNORECASE)
+_SALARY = re.compile(r'[$€£]\s?\d|\bsalary\b|\bcompensation\b', re.IGNORECASE)
+_JARGON = re.compile(r'\b(?:' + '|'.join(re.escape(j) for j in JARGON) + r')\b', re.IGNORECASE)
+_SECTION_PATTERNS = [(name, re.compile(pattern, re.IGNORECASE))
+                     for name, pattern in SECTIONS.items()]
+
+
+def syllables(word: str) -> int:
+    """Vowel-group syllable estimate with a silent trailing e"""
+    word = word.lower()
+    count = len(_VOWEL_GROUP.findall(word))
+    if count > 1 and word.endswith('e') and not word.endswith(('le', 'ee')):
+        count -= 1
+    return max(count, 1)
+
+
+def canonical_section(heading: str) -> Optional[str]:
+    """SECTIONS name a heading belongs to, if any"""
+    for name, pattern in _SECTION_PATTERNS:
+        if pattern.search(heading):
+            return name
+    return None
+
+
+def _parse(text: str) -> Dict[str, Any]:
+    """Scalar counts and sentence lengths for one posting"""
+    parsed = {'sections': set(), 'lengths': [], 'words': 0, 'syllables': 0, 'bullets': 0,
+              'must_haves': 0, 'nice_to_haves': 0}
+    for content, _, section in split_elements(text):
+        stripped = content.strip()
+        if not stripped:
+            continue
+        canonical = canonical_section(section) if section else None
+        # Headings name sections; they are not sentences a reader has to parse
+        if heading_section(stripped) is not None:
+            if canonical:
+                parsed['sections'].add(canonical)
+            continue
+        words = _WORD.findall(stripped)
+        if not words:
+            continue
+        parsed['lengths'].append(len(words))
+        parsed['words'] += len(words)
+        parsed['syllables'] += sum(syllables(word) for word in words)
+        bullet = bool(_BULLET.match(stripped))
+        parsed['bullets'] += bullet
+        if canonical == 'nice_to_have':
+            parsed['nice_to_haves'] += 1
+        elif (canonical == 'requirements' and bullet) or _MUST.search(stripped):
+            parsed['must_haves'] += 1
+    if _SALARY.search(text):
+        parsed['sections'].add('compensation')
+    return parsed
+
+
+def posting_features(postings: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Per-posting feature arrays, shape (n_postings,) or (n_postings, n_sections)"""
+    n = len(postings)
+    parsed = [_parse(posting) for posting in postings]
+
+    def column(key: str) -> np.ndarray:
+        return np.array([p[key] for p in parsed], dtype=float)
+
+    words = column('words')
+    safe_words = np.maximum(words, 1)
+
+    # Sentence-length distribution from one flat array tagged with its posting
+    lengths = np.concatenate([np.asarray(p['lengths'], dtype=float) for p in parsed]
+                             or [np.zeros(0)])
+    owner = np.repeat(np.arange(n), [len(p['lengths']) for p in parsed])
+    sentences = np.bincount(owner, minlength=n).astype(float)
+    safe_sentences = np.maximum(sentences, 1)
+    mean_length = np.bincount(owner, weights=lengths, minlength=n) / safe_sentences
+    spread = np.bincount(owner, weights=(lengths - mean_length[owner]) ** 2, minlength=n)
+    long_share = np.bincount(owner, weights=lengths > LONG_SENTENCE_WORDS,
+                             minlength=n) / safe_sentences
+    p90 = np.zeros(n)
+    if lengths.size:
+        ranked = lengths[np.lexsort((lengths, owner))]
+        first = np.concatenate([[0], np.cumsum(sentences)[:-1]]).astype(int)
+        p90_index = first + np.floor(0.9 * np.maximum(sentences - 1, 0)).astype(int)
+        p90 = np.where(sentences > 0, ranked[np.minimum(p90_index, lengths.size - 1)], 0.0)
+
+    # Flesch reading ease
+    readability = (206.835 - 1.015 * words / safe_sentences
+                   - 84.6 * column('syllables') / safe_words)
+    readability = np.where(words > 0, readability, 0.0)
+
+    jargon = np.array([len(_JARGON.findall(posting)) for posting in postings], dtype=float)
+    years = np.array([max((int(y) for y in _YEARS.findall(posting)), default=0)
+                      for posting in postings], dtype=float)
+    emojis = np.array([len(_EMOJI.findall(posting)) for posting in postings], dtype=float)
+    emphasis = np.array([len(_EMPHASIS.findall(posting)) for posting in postings], dtype=float)
+    sections = np.array([[name in p['sections'] for name in SECTIONS] for p in parsed],
+                        dtype=bool).reshape(n, len(SECTIONS))
+
+    return {
+        'words': words,
+        'sentences': sentences,
+        'readability': readability,
+        'mean_sentence_length': mean_length,
+        'sentence_length_std': np.sqrt(spread / safe_sentences),
+        'p90_sentence_length': p90,
+        'long_sentence_share': long_share,
+        'jargon_ratio': jargon / safe_words,
+        'must_haves': column('must_haves'),
+        'must_have_density': column('must_haves') / safe_words * 100,
+        'nice_to_haves': column('nice_to_haves'),
+        'years_required': years,
+        'bullet_share': column('bullets') / safe_sentences,
+        'emojis': emojis,
+        'emphasis': emphasis,
+        'sections': sections,
+    }
+
+
+class EngagementScorer:
+    """PERFORMANCE_IMPACT_VERIFICATION pre-checks for candidates against the original"""
+
+    def __init__(self, original: str, protected: Iterable[str] = (),
+                 protected_sections: Optional[Iterable[str]] = None,
+                 tolerances: Optional[Dict[str, float]] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.original = original
+        self.baseline = {k: v[0] for k, v in posting_features([original]).items()}
+        self.protected = [phrase for phrase in protected if phrase.strip()]
+        if protected_sections is None:
+            # Every section the original has is a working element until proven otherwise
+            protected_sections = [name for name, present
+                                  in zip(SECTIONS, self.baseline['sections']) if present]
+        self.protected_sections = np.array([name in set(protected_sections)
+                                            for name in SECTIONS], dtype=bool)
+        self.tolerances = dict(TOLERANCES, **(tolerances or {}))
+        self.weights = weights or ENGAGEMENT_WEIGHTS
+
+    def engagement(self, f: Dict[str, np.ndarray]) -> np.ndarray:
+        """OPTIMIZE_ENGAGEMENT_ELEMENTS score in [0, 1]"""
+        w = self.weights
+        emoji_score = np.where(f['emojis'] > MAX_EMOJIS, 0.0,
+                               np.where(f['emojis'] > 0, 1.0, 0.5))
+        # Postings under ~150 words rarely say enough; over ~700 get skimmed
+        length_score = np.clip(np.minimum(f['words'] / 150, 700 / np.maximum(f['words'], 1)),
+                               0, 1)
+        return (w['sections'] * f['sections'].mean(axis=1)
+                + w['chunking'] * np.clip(f['bullet_share'] / 0.5, 0, 1)
+                + w['emphasis'] * np.clip(f['emphasis'] / 3, 0, 1)
+                + w['emoji'] * emoji_score
+                + w['length'] * length_score)
+
+    def evaluate(self, candidates: Sequence[str]) -> Dict[str, Any]:
+        """Rejection masks, engagement and deltas for every candidate"""
+        f = posting_features(candidates)
+        b = self.baseline
+        t = self.tolerances
+
+        # clarity_not_sacrificed_for_engagement
+        readability_drop = f['readability'] < b['readability'] - t['readability']
+        longer = f['long_sentence_share'] > b['long_sentence_share'] + t['long_sentence_share']
+        jargon = f['jargon_ratio'] > b['jargon_ratio'] + t['jargon_ratio']
+        clarity_regressed = readability_drop | longer | jargon
+
+        # preserves_successful_elements: working_elements_not_removed
+        missing_sections = self.protected_sections[None, :] & ~f['sections']
+        phrases = np.array([[phrase.lower() in candidate.lower() for phrase in self.protected]
+                            for candidate in candidates], dtype=bool).reshape(
+                                len(candidates), len(self.protected))
+        elements_removed = missing_sections.any(axis=1) | ~phrases.all(axis=1)
+
+        # avoids_new_problems: no_new_barriers_introduced
+        more_must_haves = f['must_haves'] > b['must_haves']
+        more_years = f['years_required'] > b['years_required']
+        new_barriers = more_must_haves | more_years
+
+        rejected = clarity_regressed | elements_removed | new_barriers
+        engagement = self.engagement(f)
+        baseline_engagement = self.engagement({k: np.asarray([v]) for k, v in b.items()})[0]
+        return {
+            'rejected': rejected,
+            'clarity_regressed': clarity_regressed,
+            'readability_drop': readability_drop,
+            'longer_sentences': longer,
+            'more_jargon': jargon,
+            'elements_removed': elements_removed,
+            'missing_sections': missing_sections,
+            'missing_phrases': ~phrases,
+            'new_barriers': new_barriers,
+            'more_must_haves': more_must_haves,
+            'more_years': more_years,
+            'engagement': engagement,
+            'engagement_delta': engagement - baseline_engagement,
+            'over_emoji_limit': f['emojis'] > MAX_EMOJIS,
+            'features': f,
+        }
+
+    def rejections(self, candidates: Sequence[str]) -> List[Dict[str, Any]]:
+        """Failed 5B checks for each candidate that should not reach verification"""
+        result = self.evaluate(candidates)
+        f = result['features']
+        b = self.baseline
+        rejected = []
+        for i in np.flatnonzero(result['rejected']):
+            reasons = []
+            if result['readability_drop'][i]:
+                reasons.append(f"clarity_not_sacrificed_for_engagement: readability "
+                               f"{b['readability']:.1f} -> {f['readability'][i]:.1f}")
+            if result['longer_sentences'][i]:
+                reasons.append(f"clarity_not_sacrificed_for_engagement: long sentences "
+                               f"{b['long_sentence_share']:.0%} -> "
+                               f"{f['long_sentence_share'][i]:.0%}")
+            if result['more_jargon'][i]:
+                reasons.append("clarity_not_sacrificed_for_engagement: jargon added")
+            sections = [name for name, missing
+                        in zip(SECTIONS, result['missing_sections'][i]) if missing]
+            phrases = [phrase for phrase, missing
+                       in zip(self.protected, result['missing_phrases'][i]) if missing]
+            if sections or phrases:
+                reasons.append("working_elements_not_removed: "
+                               + ', '.join(sections + [repr(p) for p in phrases]))
+            if result['more_must_haves'][i]:
+                reasons.append(f"no_new_barriers_introduced: must-haves "
+                               f"{b['must_haves']:.0f} -> {f['must_haves'][i]:.0f}")
+            if result['more_years'][i]:
+                reasons.append(f"no_new_barriers_introduced: years required "
+                               f"{b['years_required']:.0f} -> {f['years_required'][i]:.0f}")
+            rejected.append({'candidate_index': int(i), 'reasons': reasons})
+        return rejected
+
+    def shortlist(self, candidates: Sequence[str], top_k: int = 5) -> List[Dict[str, Any]]:
+        """Candidates that may go on to model verification, most engaging first"""
+        result = self.evaluate(candidates)
+        viable = np.flatnonzero(~result['rejected'])
+        order = viable[np.argsort(-result['engagement'][viable], kind='stable')][:top_k]
+        shortlist = []
+        for i in order:
+            warnings = []
+            if result['over_emoji_limit'][i]:
+                warnings.append(f"More than {MAX_EMOJIS} emojis (diminishing returns)")
+            if result['engagement_delta'][i] <= 0:
+                warnings.append("No engagement gain over the original")
+            shortlist.append({
+                'candidate_index': int(i),
+                'engagement': float(result['engagement'][i]),
+                'engagement_delta': float(result['engagement_delta'][i]),
+                'readability': float(result['features']['readability'][i]),
+                'warnings': warnings,
+            })
+        return shortlist
+
+
+if __name__ == "__main__":
+    import time
+
+    original = """We're looking for a Frontend Developer to join our platform team.
+
+About us:
+We build inventory software for independent retailers.
+
+Requirements:
+- 3+ years React experience
+- Familiarity with REST APIs
+
+Benefits:
+- Remote-first
+- Salary: $120k-$150k"""
+    candidates = [
+        original.replace('- Remote-first', '- **Remote-first** 🚀'),
+        original.replace('- Remote-first\n', ''),
+        original.replace('Benefits:', 'Benefits:\n- Work in a fast-paced, world-class, '
+                         'best-in-class environment where rockstar ninjas leverage synergies'),
+        original.replace('- Familiarity with REST APIs', '- 5+ years of REST API design'),
+    ] * 250
+
+    start = time.perf_counter()
+    scorer = EngagementScorer(original, protected=['Remote-first'])
+    shortlist = scorer.shortlist(candidates, top_k=1)
+    rejections = scorer.rejections(candidates[:4])
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"Scored {len(candidates)} candidates in {elapsed:.0f} ms")
+    print("Best:", shortlist[0])
+    for rejection in rejections:
+        print(f"Rejected #{rejection['candidate_index']}: {'; '.join(rejection['reasons'])}")
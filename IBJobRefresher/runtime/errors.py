@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Exception types for the PD-SMIS runtime
+Mirrors ERROR_SEVERITY in phases/phase_0_6_error_handling.md
+"""
+
+
+class PipelineAbort(Exception):
+    """CRITICAL severity: ABORT_PIPELINE, never retried"""
+
+
+class CriticalDataMissing(PipelineAbort):
+    """Raised when Phase 0 input lacks a field ERROR_HANDLERS marks ABORT_WITH_ERROR"""
+
+
+class ModelError(Exception):
+    """A model call failed"""
+
+    retryable = False
+
+
+class TransientModelError(ModelError):
+    """A model call failed in a way that may succeed on retry (timeouts, rate limits)"""
+
+    retryable = True
+
+
+class RuleBundleError(Exception):
+    """The compiled rule bundle is missing, malformed or built from a different schema"""
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Phase 0 input parsing and normalization for PD-SMIS v5.1
+Splits the bracketed source-collection format into named sections
+"""
+
+import re
+import unicodedata
+from typing import Dict, Optional
+
+from .errors import CriticalDataMissing
+
+# Section names as they appear in phases/phase_0_collection.md
+PROJECT_DESCRIPTION = 'PROJECT DESCRIPTION'
+JOB_TITLE = 'ORIGINAL JOB TITLE'
+JOB_POSTING = 'ORIGINAL JOB POSTING'
+JOB_KPIS = 'ORIGINAL JOB KPIs'
+AD_INTRO = 'AD INTRO TEXT'
+AD_AUDIENCE = 'AD AUDIENCE DETAILS'
+AD_KPIS = 'AD KPIs'
+USER_FEEDBACK = 'OPTIONAL USER FEEDBACK'
+
+AD_SECTIONS = (AD_INTRO, AD_AUDIENCE, AD_KPIS)
+CRITICAL_SECTIONS = (JOB_TITLE, JOB_POSTING)
+
+_SECTION_PATTERN = re.compile(
+    r'\[(?P<name>[^\[\]/][^\[\]]*?)\](?:[ \t]*\([^)\n]*\))?[ \t]*\n?(?P<body>.*?)\[/(?P=name)\]',
+    re.DOTALL
+)
+
+# Markdown, [bracketed] and 'Label:' headings inside posting text
+_HEADING = re.compile(r'^\s*(?:#+\s+.+|\[[^\]]+\]|[^-*•\s][^.!?]{0,60}:)\s*$')
+# Emphasis markers and emoji that decorate headings ("**Benefits:** 🎁")
+_DECORATION = re.compile('\\*\\*|__|[\U0001F300-\U0001FAFF☀-➿\uFE0F]')
+
+_PUNCTUATION_MAP = str.maketrans({
+    '‘': "'", '’': "'", '“': '"', '”': '"',
+    '–': '-', '—': '-', '•': '-', '·': '-',
+})
+
+
+def parse_input(text: str) -> Dict[str, str]:
+    """Split raw Phase 0 input into {section name: body}, empty sections dropped"""
+    sections = {}
+    for match in _SECTION_PATTERN.finditer(text):
+        body = match.group('body').strip()
+        if body:
+            sections[match.group('name').strip()] = body
+    return sections
+
+
+def require_critical_sections(sections: Dict[str, str]) -> None:
+    """Apply ERROR_HANDLERS.missing_data.critical_missing"""
+    missing = [name for name in CRITICAL_SECTIONS if not sections.get(name)]
+    if missing:
+        raise CriticalDataMissing(
+            f"Cannot proceed without job posting and role title (missing: {', '.join(missing)})"
+        )
+
+
+def has_ad_data(sections: Dict[str, str]) -> bool:
+    """True when any paid-campaign section was supplied"""
+    return any(sections.get(name) for name in AD_SECTIONS)
+
+
+def heading_section(line: str) -> Optional[str]:
+    """Section name if the line is a heading, ignoring emphasis and emoji; else None"""
+    plain = _DECORATION.sub('', line).strip()
+    if not _HEADING.match(plain):
+        return None
+    return plain.lstrip('#').strip().strip('[]').rstrip(':').strip()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse formatting-only differences so equivalent sources compare equal
+
+    Unicode compatibility forms, typographic quotes/dashes, bullet glyphs,
+    runs of whitespace and blank lines are normalized. Case and wording are
+    preserved: those carry meaning for extraction and tier classification.
+    """
+    text = unicodedata.normalize('NFKC', text).translate(_PUNCTUATION_MAP)
+    lines = []
+    for line in text.splitlines():
+        line = re.sub(r'\s+', ' ', line).strip()
+        line = re.sub(r'^[-*+]\s+', '- ', line)
+        if line:
+            lines.append(line)
+    return '\n'.join(lines)
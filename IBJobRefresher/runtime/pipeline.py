@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Phase pipeline driver for PD-SMIS v5.1
+Runs one parsed input through Phases 1-5 against any ModelBackend
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from .cache import ResponseCache, phase_inputs
+from .client import AsyncModelClient
+from .errors import PipelineAbort
+from .inputs import JOB_POSTING, JOB_TITLE, PROJECT_DESCRIPTION, require_critical_sections
+from .models import (
+    ADVERSARIAL, EXTRACTION, GENERATION, HYPOTHESIS, OPTIMIZATION, VERIFICATION,
+    ModelBackend
+)
+from .scanner import scan
+from .shared_extraction import (
+    ROLE_SCOPE, SHARED_DOMAINS, SharedExtractionStore, domain_inputs, posting_inputs
+)
+
+# ADVERSARIAL_GENERATION_LOOP aborts if round 3 still finds violations
+MAX_ADVERSARIAL_ROUNDS = 3
+
+# Sections the generated posting may not exceed in precision. Its sentences
+# align with the posting they rewrite; the project description only backs
+# sentences the posting has no match for.
+SOURCE_SECTIONS = (JOB_TITLE, JOB_POSTING)
+CONTEXT_SECTIONS = (PROJECT_DESCRIPTION,)
+
+
+class Pipeline:
+    """Sequences phase calls, routing each through the response cache and async client"""
+
+    def __init__(self, backend: ModelBackend, cache: Optional[ResponseCache] = None,
+                 settings: Optional[Dict[str, Any]] = None,
+                 client: Optional[AsyncModelClient] = None,
+                 shared: Optional[SharedExtractionStore] = None):
+        self.backend = backend
+        self.cache = cache
+        self.settings = settings or {}
+        self.client = client or AsyncModelClient(backend)
+        self.shared = shared or SharedExtractionStore()
+
+    async def call(self, module: str, sections: Dict[str, str],
+                   upstream: Optional[Dict[str, Any]] = None,
+                   verdict: bool = False) -> Dict[str, Any]:
+        """One phase call over the input sections that phase reads"""
+        return await self.request(module, phase_inputs(module, sections, upstream), verdict)
+
+    async def request(self, module: str, inputs: Dict[str, Any],
+                      verdict: bool = False) -> Dict[str, Any]:
+        """Consult the cache, hit the client on a miss"""
+        request = {'phase': module, 'inputs': inputs, 'settings': self.settings}
+        if self.cache is None:
+            return await self.client.complete(request)
+        return await self.cache.aget_or_call(module, inputs,
+                                             lambda: self.client.complete(request),
+                                             self.settings, verdict=verdict)
+
+    async def extract(self, sections: Dict[str, str]) -> Dict[str, Any]:
+        """Phase 1 as one call per SOURCE_SEGREGATED_FACTS domain
+
+        The per-posting call returns ROLE_SCOPE facts and the 1B-1D.2 analyses;
+        project and company facts come from the shared store, so requisitions
+        of one project share them.
+        """
+        async def extract_domain(domain: str) -> List[Dict[str, Any]]:
+            response = await self.request(EXTRACTION, domain_inputs(domain, sections))
+            return response.get('facts', [])
+
+        posting, *shared_facts = await asyncio.gather(
+            self.request(EXTRACTION, posting_inputs(sections)),
+            *(self.shared.get_or_extract(domain, sections,
+                                         lambda domain=domain: extract_domain(domain))
+              for domain in SHARED_DOMAINS)
+        )
+        extracted = {k: v for k, v in posting.items() if k not in ('domain', 'facts')}
+        facts = {ROLE_SCOPE: posting.get('facts', [])}
+        facts.update(zip(SHARED_DOMAINS, shared_facts))
+        extracted['SOURCE_SEGREGATED_FACTS'] = facts
+        return extracted
+
+    async def arun(self, sections: Dict[str, str]) -> Dict[str, Any]:
+        """Execute Phases 1-5 for one posting; raises PipelineAbort on CRITICAL failures"""
+        start = time.perf_counter()
+        require_critical_sections(sections)
+
+        extracted = await self.extract(sections)
+        hypotheses = await self.call(HYPOTHESIS, sections, {'extracted': extracted})
+        strategy = await self.call(OPTIMIZATION, sections,
+                                   {'hypotheses': hypotheses.get('hypotheses', []),
+                                    'extracted': extracted})
+
+        source = '\n'.join(sections[name] for name in SOURCE_SECTIONS if name in sections)
+        context = '\n'.join(sections[name] for name in CONTEXT_SECTIONS if name in sections)
+        violations: List[Dict[str, Any]] = []
+        rounds = []
+        for round_number in range(1, MAX_ADVERSARIAL_ROUNDS + 1):
+            generated = await self.call(GENERATION, sections,
+                                        {'strategy': strategy, 'extracted': extracted,
+                                         'violations_to_fix': violations})
+            # The hostile round starts from the scanner's suspect list
+            suspects = scan(source, generated.get('posting', ''), context)
+            # Any round can turn out to be the deciding one, so audits are verdicts
+            audit = await self.call(ADVERSARIAL, sections,
+                                    {'generated': generated, 'round': round_number,
+                                     'suspects': suspects},
+                                    verdict=True)
+            violations = audit.get('violations_found', [])
+            rounds.append({'round': round_number, 'suspects': len(suspects),
+                           'violations_found': len(violations)})
+            if not violations:
+                break
+        else:
+            raise PipelineAbort("Cannot generate truthful content. Human intervention required.")
+
+        verification = await self.call(VERIFICATION, sections,
+                                       {'generated': generated, 'adversarial': audit},
+                                       verdict=True)
+        if not verification.get('passed'):
+            raise PipelineAbort(f"Verification failed: {verification.get('failures')}")
+
+        return {
+            'generated': generated,
+            'adversarial_rounds': rounds,
+            'verification': verification,
+            'time_ms': (time.perf_counter() - start) * 1000,
+        }
+
+    async def arun_batch(self, batch: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Run many postings concurrently; failed postings report their error
+
+        Concurrency is bounded by the client, not by the batch size.
+        Cancellation is not an error: it propagates and stops the batch.
+        """
+        async def run_one(sections: Dict[str, str]) -> Dict[str, Any]:
+            try:
+                return await self.arun(sections)
+            except Exception as e:
+                return {'error': f'{type(e).__name__}: {e}'}
+
+        return list(await asyncio.gather(*(run_one(sections) for sections in batch)))
+
+    def run(self, sections: Dict[str, str]) -> Dict[str, Any]:
+        return asyncio.run(self.arun(sections))
+
+    def run_batch(self, batch: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        return asyncio.run(self.arun_batch(batch))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .cache import MemoryBackend
+    from .inputs import JOB_KPIS, JOB_POSTING, JOB_TITLE, PROJECT_DESCRIPTION
+    from .models import MockBackend
+
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline against the mock backend')
+    parser.add_argument('--postings', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--rate', type=float, default=None, help='max model calls per second')
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    batch = [{
+        PROJECT_DESCRIPTION: 'Real-time inventory platform built with React and Node.js.',
+        JOB_TITLE: f'Frontend Developer {i % 10}',
+        JOB_POSTING: 'We are looking for a Frontend Developer.\n- 3+ years React experience',
+        JOB_KPIS: f'- Visit/Application Conversion: {1 + i % 5}%\n- Application/Interview: 15%',
+    } for i in range(args.postings)]
+
+    backend = MockBackend(latency_ms=args.latency_ms, failure_rate=args.failure_rate)
+    cache = None if args.no_cache else ResponseCache(MemoryBackend())
+    client = AsyncModelClient(backend, max_concurrency=args.concurrency,
+                              rate_per_second=args.rate, base_delay=0.05)
+    pipeline = Pipeline(backend, cache, client=client)
+
+    start = time.perf_counter()
+    results = pipeline.run_batch(batch)
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for r in results if 'error' in r)
+    print(f"Postings: {len(results)} ({errors} failed)")
+    print(f"Model calls: {len(backend.calls)}")
+    print(f"Client: {client.stats}")
+    print(f"Shared extraction: {pipeline.shared.stats}")
+    if cache is not None:
+        print(f"Cache: {cache.stats}")
+    print(f"Wall time: {elapsed:.2f}s")
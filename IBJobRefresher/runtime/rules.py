@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Compiled rule bundle for PD-SMIS v5.1
+Extracts the safeguards, REJECTION_TEMPLATES, PRECISION_TIERS and ERROR_HANDLERS
+blocks from the markdown modules into one schema-checked, versioned bundle
+"""
+
+import hashlib
+import json
+import mmap
+import re
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .cache import FRAMEWORK_ROOT
+from .errors import RuleBundleError
+
+try:
+    import msgpack
+except ImportError:  # JSON bundles work without it
+    msgpack = None
+
+SCHEMA_VERSION = 1
+
+BUNDLE_DIR = FRAMEWORK_ROOT / 'rules'
+JSON_BUNDLE = 'bundle.json'
+MSGPACK_BUNDLE = 'bundle.msgpack'
+
+SAFEGUARDS_MODULE = 'safeguards/critical_safeguards.md'
+ADVERSARIAL_MODULE = 'validation/adversarial_validation.md'
+TIERS_MODULE = 'validation/precision_tiers.md'
+ERRORS_MODULE = 'phases/phase_0_6_error_handling.md'
+SOURCE_MODULES = (SAFEGUARDS_MODULE, ADVERSARIAL_MODULE, TIERS_MODULE, ERRORS_MODULE)
+
+SAFEGUARD_COUNT = 14
+TIER_COUNT = 5
+# Tier when a claim carries no tier verb (CLASSIFY_ALL_FACTS: "Default to associative")
+DEFAULT_TIER = 4
+
+# Structural schema: a type, a tuple of types, [item schema], {key: schema}
+# for required keys, or {str: schema} for a mapping with any keys
+BUNDLE_SCHEMA: Dict[str, Any] = {
+    'schema_version': int,
+    'framework_version': str,
+    'bundle_version': str,
+    'sources': {str: str},
+    'safeguards': [{
+        'number': int,
+        'name': str,
+        'group': str,
+        'function': (str, type(None)),
+        'params': [str],
+        'rules': [{
+            'condition': str,
+            'threshold': (dict, type(None)),
+            'actions': [{'action': str, 'message': str}],
+        }],
+        'requires': [str],
+    }],
+    'rejection_templates': {str: {'detection': str, 'rejection': str}},
+    'precision_tiers': [{'tier': int, 'name': str, 'verbs': [str], 'can_claim': str}],
+    'error_handlers': {str: dict},
+    'error_severity': {str: {'examples': [str], 'action': str, 'notification': str}},
+}
+
+
+# Pseudo-JS object literals. Strings, numbers, booleans, arrays and objects
+# become Python values; anything else (calls, arrow functions) is kept as
+# its source text.
+
+def _strip_comments(text: str) -> str:
+    out = []
+    quote = None
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if quote:
+            out.append(c)
+            if c == '\\' and i + 1 < len(text):
+                out.append(text[i + 1])
+                i += 1
+            elif c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+            out.append(c)
+        elif text.startswith('//', i):
+            while i < len(text) and text[i] != '\n':
+                i += 1
+            continue
+        else:
+            out.append(c)
+        i += 1
+    return ''.join(out)
+
+
+class _ObjectReader:
+    _KEY = re.compile(r'\s*([\w$]+|"[^"]*"|\'[^\']*\')\s*:')
+    _NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?=\s*[,}\]\s])')
+    _LITERAL = re.compile(r'(true|false|null)(?=\s*[,}\]])')
+    _CLOSE = {'(': ')', '[': ']', '{': '}'}
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def _skip(self) -> None:
+        while self.pos < len(self.text) and self.text[self.pos] in ' \t\r\n':
+            self.pos += 1
+
+    def value(self) -> Any:
+        self._skip()
+        c = self.text[self.pos]
+        if c == '{':
+            return self._object()
+        if c == '[':
+            return self._array()
+        if c in '"\'':
+            return self._string()
+        match = self._NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            number = match.group()
+            return float(number) if '.' in number else int(number)
+        match = self._LITERAL.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return {'true': True, 'false': False, 'null': None}[match.group(1)]
+        return self._expression()
+
+    def _string(self) -> str:
+        quote = self.text[self.pos]
+        end = self.pos + 1
+        while self.text[end] != quote:
+            end += 2 if self.text[end] == '\\' else 1
+        raw = self.text[self.pos + 1:end]
+        self.pos = end + 1
+        return re.sub(r'\\(.)', r'\1', raw)
+
+    def _expression(self) -> str:
+        """Source text up to the next top-level ',', '}' or ']'"""
+        start = self.pos
+        stack: List[str] = []
+        while self.pos < len(self.text):
+            c = self.text[self.pos]
+            if c in '"\'':
+                self._string()
+                continue
+            if c in self._CLOSE:
+                stack.append(self._CLOSE[c])
+            elif stack and c == stack[-1]:
+                stack.pop()
+            elif not stack and c in ',}]':
+                break
+            self.pos += 1
+        return ' '.join(self.text[start:self.pos].split())
+
+    def _array(self) -> List[Any]:
+        self.pos += 1
+        items = []
+        while True:
+            self._skip()
+            if self.text[self.pos] == ']':
+                self.pos += 1
+                return items
+            items.append(self.value())
+            self._skip()
+            if self.text[self.pos] == ',':
+                self.pos += 1
+
+    def _object(self) -> Dict[str, Any]:
+        self.pos += 1
+        members: Dict[str, Any] = {}
+        while True:
+            self._skip()
+            if self.text[self.pos] == '}':
+                self.pos += 1
+                return members
+            match = self._KEY.match(self.text, self.pos)
+            if match:
+                self.pos = match.end()
+                members[match.group(1).strip('"\'')] = self.value()
+            else:
+                # Statements inside an object (if blocks, spreads) are not data
+                self._expression()
+            self._skip()
+            if self.text[self.pos] == ',':
+                self.pos += 1
+
+
+def parse_block(text: str, name: str) -> Any:
+    """Value of a `NAME = { ... }` assignment in a module"""
+    match = re.search(r'^\s*' + re.escape(name) + r'\s*=\s*\{', text, re.MULTILINE)
+    if not match:
+        raise RuleBundleError(f"{name} block not found")
+    reader = _ObjectReader(_strip_comments(text[match.end() - 1:]))
+    return reader.value()
+
+
+# Safeguard functions are written as if/action pseudo-code rather than data
+
+_SAFEGUARD_SECTION = re.compile(r'## CRITICAL SAFEGUARDS(.*?)(?=^## )', re.DOTALL | re.MULTILINE)
+_GROUP = re.compile(r'^### (.+?) Safeguards\s*$')
+_ITEM = re.compile(r'^(\d+)\.\s+(?:\*\*)?(.+?)(?:\*\*)?\s*$')
+_FUNCTION = re.compile(r'function\s+(\w+)\s*\(([^)]*)\)\s*\{')
+_ACTION = re.compile(r'\b([A-Z][A-Z_]+)\("([^"]*)"\)')
+_CALL = re.compile(r'\b([A-Z][A-Z_]{2,})\s*\(')
+_THRESHOLD = re.compile(r'^(\w+)\s*(<=|>=|<|>|===?)\s*(\d+(?:\.\d+)?)$')
+
+
+def _matching_brace(text: str, open_index: int) -> int:
+    depth = 0
+    for i in range(open_index, len(text)):
+        if text[i] == '{':
+            depth += 1
+        elif text[i] == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise RuleBundleError("Unbalanced braces in safeguard function")
+
+
+def _threshold(condition: str) -> Optional[Dict[str, Any]]:
+    match = _THRESHOLD.match(condition)
+    if not match:
+        return None
+    value = float(match.group(3))
+    return {'metric': match.group(1), 'op': match.group(2),
+            'value': int(value) if value.is_integer() else value}
+
+
+def _safeguard_function(code: str) -> Dict[str, Any]:
+    match = _FUNCTION.search(code)
+    if not match:
+        return {'function': None, 'params': [], 'rules': [], 'requires': []}
+    body = code[match.end():_matching_brace(code, match.end() - 1)]
+    rules = []
+    remainder = body
+    for condition_match in re.finditer(r'if\s*\((.*)\)\s*\{', body):
+        block_start = condition_match.end() - 1
+        block = body[block_start:_matching_brace(body, block_start) + 1]
+        remainder = remainder.replace(block, '')
+        condition = ' '.join(condition_match.group(1).split())
+        rules.append({
+            'condition': condition,
+            'threshold': _threshold(condition),
+            'actions': [{'action': action, 'message': message}
+                        for action, message in _ACTION.findall(block)],
+        })
+    return {
+        'function': match.group(1),
+        'params': [p.strip() for p in match.group(2).split(',') if p.strip()],
+        'rules': rules,
+        # Checks a safeguard delegates to outside any condition (DUAL_LOCK_PROTOCOL)
+        'requires': list(dict.fromkeys(_CALL.findall(_strip_comments(remainder)))),
+    }
+
+
+def parse_safeguards(text: str) -> List[Dict[str, Any]]:
+    """Numbered safeguards with their group, function and if/action rules"""
+    section = _SAFEGUARD_SECTION.search(text)
+    if not section:
+        raise RuleBundleError("CRITICAL SAFEGUARDS section not found")
+    safeguards: List[Dict[str, Any]] = []
+    group = ''
+    lines = section.group(1).splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        group_match = _GROUP.match(line)
+        item_match = _ITEM.match(line)
+        i += 1
+        if group_match:
+            group = group_match.group(1)
+            continue
+        if not item_match:
+            continue
+        code = ''
+        if i < len(lines) and lines[i].strip().startswith('```'):
+            end = next(j for j in range(i + 1, len(lines)) if lines[j].strip() == '```')
+            code = '\n'.join(lines[i + 1:end])
+            i = end + 1
+        safeguards.append({'number': int(item_match.group(1)),
+                           'name': item_match.group(2).strip(), 'group': group,
+                           **_safeguard_function(code)})
+    return safeguards
+
+
+def _tier_list(tiers: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{'tier': int(number), **fields}
+            for number, fields in sorted(tiers.items(), key=lambda item: int(item[0]))]
+
+
+def source_hashes(root: Path = FRAMEWORK_ROOT) -> Dict[str, str]:
+    return {module: hashlib.sha256((root / module).read_bytes()).hexdigest()
+            for module in SOURCE_MODULES}
+
+
+def compile_bundle(root: Path = FRAMEWORK_ROOT) -> Dict[str, Any]:
+    """Build and validate the bundle from the markdown modules under root"""
+    root = Path(root)
+    texts = {module: (root / module).read_text() for module in SOURCE_MODULES}
+    sources = source_hashes(root)
+    version = re.search(r'PD-SMIS v(\d+(?:\.\d+)*)', texts[SAFEGUARDS_MODULE])
+    digest = hashlib.sha256(json.dumps(sources, sort_keys=True).encode()).hexdigest()
+    bundle = {
+        'schema_version': SCHEMA_VERSION,
+        'framework_version': version.group(1) if version else 'unknown',
+        'bundle_version': digest[:12],
+        'sources': sources,
+        'safeguards': parse_safeguards(texts[SAFEGUARDS_MODULE]),
+        'rejection_templates': parse_block(texts[ADVERSARIAL_MODULE], 'REJECTION_TEMPLATES'),
+        'precision_tiers': _tier_list(parse_block(texts[TIERS_MODULE], 'PRECISION_TIERS')),
+        'error_handlers': parse_block(texts[ERRORS_MODULE], 'ERROR_HANDLERS'),
+        'error_severity': parse_block(texts[ERRORS_MODULE], 'ERROR_SEVERITY'),
+    }
+    validate_bundle(bundle)
+    return bundle
+
+
+def _schema_errors(value: Any, schema: Any, path: str) -> List[str]:
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return [f"{path}: expected list"]
+        return [e for i, item in enumerate(value)
+                for e in _schema_errors(item, schema[0], f'{path}[{i}]')]
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return [f"{path}: expected object"]
+        if list(schema) == [str]:
+            return [e for key, item in value.items()
+                    for e in _schema_errors(item, schema[str], f'{path}.{key}')]
+        errors = []
+        for key, sub in schema.items():
+            if key not in value:
+                errors.append(f"{path}.{key}: missing")
+            else:
+                errors.extend(_schema_errors(value[key], sub, f'{path}.{key}'))
+        return errors
+    if not isinstance(value, schema) or (schema is int and isinstance(value, bool)):
+        return [f"{path}: expected {getattr(schema, '__name__', schema)}"]
+    return []
+
+
+def validate_bundle(bundle: Dict[str, Any]) -> None:
+    """Raise RuleBundleError unless the bundle matches BUNDLE_SCHEMA and the spec's counts"""
+    errors = _schema_errors(bundle, BUNDLE_SCHEMA, 'bundle')
+    if not errors:
+        if bundle['schema_version'] != SCHEMA_VERSION:
+            errors.append(f"bundle.schema_version: {bundle['schema_version']} "
+                          f"!= {SCHEMA_VERSION}, rebuild with dev/build_rules.py")
+        numbers = [s['number'] for s in bundle['safeguards']]
+        if numbers != list(range(1, SAFEGUARD_COUNT + 1)):
+            errors.append(f"bundle.safeguards: expected 1..{SAFEGUARD_COUNT}, got {numbers}")
+        tiers = [t['tier'] for t in bundle['precision_tiers']]
+        if tiers != list(range(1, TIER_COUNT + 1)):
+            errors.append(f"bundle.precision_tiers: expected 1..{TIER_COUNT}, got {tiers}")
+        critical = (bundle['error_handlers'].get('missing_data', {})
+                    .get('critical_missing', {}))
+        if critical.get('action') != 'ABORT_WITH_ERROR' or not critical.get('fields'):
+            errors.append("bundle.error_handlers.missing_data.critical_missing: "
+                          "needs fields and ABORT_WITH_ERROR")
+    if errors:
+        raise RuleBundleError('Invalid rule bundle:\n  ' + '\n  '.join(errors))
+
+
+def write_bundle(bundle: Dict[str, Any], directory: Path = BUNDLE_DIR,
+                 use_msgpack: bool = False) -> Path:
+    """Write the bundle as JSON, or msgpack when requested and installed"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if use_msgpack:
+        if msgpack is None:
+            raise RuleBundleError("msgpack output requested but msgpack is not installed")
+        path = directory / MSGPACK_BUNDLE
+        path.write_bytes(msgpack.packb(bundle, use_bin_type=True))
+    else:
+        path = directory / JSON_BUNDLE
+        path.write_text(json.dumps(bundle, indent=1, ensure_ascii=False) + '\n')
+    return path
+
+
+class RuleBundle:
+    """Read-only view of a compiled bundle with precompiled matchers"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.version = data['bundle_version']
+        self.safeguards: List[Dict[str, Any]] = data['safeguards']
+        self.rejection_templates: Dict[str, Dict[str, str]] = data['rejection_templates']
+        self.precision_tiers: List[Dict[str, Any]] = data['precision_tiers']
+        self.error_handlers: Dict[str, Any] = data['error_handlers']
+        self.error_severity: Dict[str, Any] = data['error_severity']
+
+    def is_current(self, root: Path = FRAMEWORK_ROOT) -> bool:
+        """True when no source module changed since the bundle was built"""
+        return self.data['sources'] == source_hashes(Path(root))
+
+    def safeguard(self, key: Union[int, str]) -> Dict[str, Any]:
+        """Safeguard by number, function name or display name"""
+        for safeguard in self.safeguards:
+            if key in (safeguard['number'], safeguard['function'], safeguard['name']):
+                return safeguard
+        raise KeyError(key)
+
+    @cached_property
+    def thresholds(self) -> Dict[str, List[Dict[str, Any]]]:
+        """{safeguard function: numeric rules with their actions}"""
+        return {
+            s['function']: [{**rule['threshold'], 'actions': rule['actions']}
+                            for rule in s['rules'] if rule['threshold']]
+            for s in self.safeguards if any(rule['threshold'] for rule in s['rules'])
+        }
+
+    @cached_property
+    def verb_tiers(self) -> Dict[str, int]:
+        return {verb: tier['tier'] for tier in self.precision_tiers for verb in tier['verbs']}
+
+    @cached_property
+    def tier_pattern(self) -> 're.Pattern[str]':
+        """One alternation over every tier verb, longest phrases first"""
+        verbs = sorted(self.verb_tiers, key=len, reverse=True)
+        return re.compile(r'\b(' + '|'.join(re.escape(v) for v in verbs) + r')\b',
+                          re.IGNORECASE)
+
+    def claim_tier(self, text: str) -> Optional[int]:
+        """Strongest (lowest-numbered) tier whose verb phrase appears in the text"""
+        tiers = [self.verb_tiers[m.lower()] for m in self.tier_pattern.findall(text)]
+        return min(tiers) if tiers else None
+
+    def rejection(self, violation_type: str) -> str:
+        """REJECTION_TEMPLATES message for a violation type"""
+        return self.rejection_templates[violation_type]['rejection']
+
+    @cached_property
+    def severity_levels(self) -> Dict[str, str]:
+        """{error example: ERROR_SEVERITY level}"""
+        return {example: level for level, spec in self.error_severity.items()
+                for example in spec['examples']}
+
+    def severity(self, error: str) -> Optional[str]:
+        """Severity of an ERROR_SEVERITY example or an ERROR_HANDLERS entry"""
+        handler = self.error_handlers.get(error)
+        if isinstance(handler, dict) and handler.get('severity'):
+            return handler['severity']
+        return self.severity_levels.get(error)
+
+    @cached_property
+    def critical_fields(self) -> List[str]:
+        return list(self.error_handlers['missing_data']['critical_missing']['fields'])
+
+
+def _read_mapped(path: Path) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        if path.stat().st_size == 0:
+            raise RuleBundleError(f"Empty rule bundle: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if path.suffix == '.msgpack':
+                if msgpack is None:
+                    raise RuleBundleError(f"{path} needs msgpack installed")
+                return msgpack.unpackb(mapped, raw=False, strict_map_key=False)
+            return json.loads(mapped[:])
+
+
+@lru_cache(maxsize=None)
+def load_bundle(path: Optional[Path] = None, directory: Path = BUNDLE_DIR) -> RuleBundle:
+    """Memory-map and validate a built bundle; msgpack preferred when available
+
+    A msgpack copy is only used while its source hashes match the markdown
+    modules; a stale one (e.g. left by an older --msgpack build) falls back
+    to the JSON bundle.
+    """
+    if path is None:
+        packed = Path(directory) / MSGPACK_BUNDLE
+        if msgpack is not None and packed.exists():
+            data = _read_mapped(packed)
+            validate_bundle(data)
+            bundle = RuleBundle(data)
+            if bundle.is_current():
+                return bundle
+        path = Path(directory) / JSON_BUNDLE
+        if not path.exists():
+            raise RuleBundleError(f"No rule bundle in {directory}; run dev/build_rules.py")
+    data = _read_mapped(Path(path))
+    validate_bundle(data)
+    return RuleBundle(data)
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    compiled = compile_bundle()
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    bundle = load_bundle()
+    bundle.tier_pattern
+    load_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Bundle {bundle.version} ({'current' if bundle.is_current() else 'STALE'})")
+    print(f"Compile from markdown: {compile_ms:.1f} ms, load + matchers: {load_ms:.1f} ms")
+    print(f"Safeguards: {len(bundle.safeguards)}, tiers: {len(bundle.precision_tiers)}, "
+          f"rejection templates: {len(bundle.rejection_templates)}")
+    print(f"Thresholds: {json.dumps(bundle.thresholds)}")
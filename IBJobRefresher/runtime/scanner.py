@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Single-pass escalation scanner for PD-SMIS adversarial rounds
+One compiled pattern tags every sentence of the source and output texts; the
+organized_hostile_checks are then rules over aligned sentence tags
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .cache import FRAMEWORK_ROOT
+from .rules import DEFAULT_TIER, RuleBundle, load_bundle
+from .inputs import heading_section, normalize_text
+from .versions import split_elements
+
+VERB_ESCALATION = 'verb_escalation'
+PRECISION_INFLATION = 'precision_inflation'
+OWNERSHIP_ASSUMPTION = 'ownership_assumption'
+
+# validation_orchestrator.md organized_hostile_checks (and the adversarial
+# VIOLATION_PATTERNS they overlap with): category -> (REJECTION_TEMPLATES type, severity)
+CATEGORIES = {
+    'semantic_escalation': (VERB_ESCALATION, 'CRITICAL'),
+    'verb_stronger_than_source': (VERB_ESCALATION, 'CRITICAL'),
+    'ownership_without_attribution': (OWNERSHIP_ASSUMPTION, 'CRITICAL'),
+    'completion_verb_without_completion_evidence': (VERB_ESCALATION, 'CRITICAL'),
+    'creation_verb_without_creation_evidence': (VERB_ESCALATION, 'CRITICAL'),
+    'weasel_words_suggesting_higher_tier': (VERB_ESCALATION, 'HIGH'),
+    'passive_voice_hiding_actual_role': (OWNERSHIP_ASSUMPTION, 'HIGH'),
+    'timeline_manipulation_suggesting_completion': (PRECISION_INFLATION, 'HIGH'),
+    'optional_becoming_required': (PRECISION_INFLATION, 'HIGH'),
+    'potential_becoming_actual': (PRECISION_INFLATION, 'HIGH'),
+}
+
+# Word lists behind the lightweight tags; tier verbs come from PRECISION_TIERS
+LEXICON = {
+    'future': ['will', "we'll", "you'll", 'going to', 'plan to', 'plans to', 'planned',
+               'upcoming', 'roadmap', 'next quarter', 'next year', 'soon'],
+    'progressive': ['in progress', 'ongoing', 'underway', 'currently'],
+    'modal': ['may', 'might', 'could', 'potential', 'potentially', 'possible', 'possibly',
+              'opportunity to', 'opportunities to', 'chance to', 'expected to'],
+    'optional': ['nice to have', 'nice-to-have', 'preferred', 'a plus', 'bonus', 'ideally',
+                 'optional', 'desirable'],
+    'required': ['required', 'requirement', 'requirements', 'must', 'must have',
+                 'must-have', 'mandatory', 'essential'],
+    'weasel': ['instrumental', 'pivotal', 'key role', 'major role', 'leading role',
+               'central role', 'integral', 'at the forefront', 'heavily involved',
+               'effectively', 'essentially', 'virtually', 'significantly'],
+    'ownership': ['led', 'lead', 'leads', 'owned', 'owns', 'spearheaded', 'headed',
+                  'drove', 'oversaw', 'directed', 'managed', 'architected',
+                  'responsible for', 'in charge of'],
+    'expertise': ['experienced', 'expert', 'expertise', 'proficient', 'mastered',
+                  'mastery', 'deep knowledge'],
+}
+
+# Participles that describe the role or its terms rather than hide who did
+# the work ("3+ years is required", "travel is expected")
+_STATIVE = ('required', 'expected', 'preferred', 'needed', 'desired', 'encouraged',
+            'based', 'located', 'offered', 'provided', 'included', 'paid', 'valued')
+
+# be-auxiliary + past participle, optionally adverb-split ("was fully built")
+_PASSIVE = (r'(?P<passive>\b(?:was|were|been|being|is|are|be)\s+(?:\w+ly\s+)?'
+            r'(?!(?:' + '|'.join(_STATIVE) + r')\b)'
+            r'(?P<participle>\w+ed|(?:re)?(?:built|written|done|made|run|taken|given|driven|'
+            r'grown|chosen|overseen|led|won|set)\b))')
+# be-auxiliary + -ing form ("are building")
+_PROGRESSIVE = r'(?P<progressive>\b(?:is|are|am|was|were)\s+(?:currently\s+)?\w+ing\b)'
+
+_PAIR = re.compile(r'"([^"]+)"\s*->\s*"([^"]+)"')
+WORD = re.compile(r"[a-z][a-z0-9+#.'-]*[a-z0-9+#]|[a-z]")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have in into is it its of on or our that the
+their this to us was we were will with you your years year team role work
+""".split())
+
+# Minimum Dice overlap of word sets for an output sentence to align with a source one
+ALIGNMENT_THRESHOLD = 0.5
+
+
+@lru_cache(maxsize=None)
+def load_escalation_pairs(root: Path = FRAMEWORK_ROOT) -> List[Tuple[str, str]]:
+    """semantic_escalation.hunt_for pairs from validation_orchestrator.md"""
+    text = (root / 'validation' / 'validation_orchestrator.md').read_text()
+    block = text[text.index('semantic_escalation:'):text.index('precision_inflation:')]
+    return _PAIR.findall(block)
+
+
+class EscalationScanner:
+    """Compiled multi-pattern tagger plus the hostile-check rules over its tags"""
+
+    def __init__(self, bundle: Optional[RuleBundle] = None,
+                 pairs: Optional[List[Tuple[str, str]]] = None):
+        self.bundle = bundle or load_bundle()
+        self.pairs = pairs if pairs is not None else load_escalation_pairs()
+
+        tags: Dict[str, Set[str]] = {}
+        for name, phrases in LEXICON.items():
+            for phrase in phrases:
+                tags.setdefault(phrase, set()).add(name)
+        for tier in self.bundle.precision_tiers:
+            for verb in tier['verbs']:
+                tags.setdefault(verb, set()).add(f"tier{tier['tier']}")
+        for i, (before, after) in enumerate(self.pairs):
+            tags.setdefault(before.lower(), set()).add(f'pair_from{i}')
+            tags.setdefault(after.lower(), set()).add(f'pair_to{i}')
+        # A longer phrase carries the tags of any phrase it starts with
+        # ("assisted with" also means "assisted"), since only one can match
+        for phrase in tags:
+            for other in tags:
+                if phrase != other and phrase.startswith(other + ' '):
+                    tags[phrase] |= tags[other]
+        self.tags = tags
+
+        phrases = sorted(tags, key=len, reverse=True)
+        lexicon = r'(?P<lex>\b(?:' + '|'.join(re.escape(p) for p in phrases) + r')\b)'
+        self.pattern = re.compile('|'.join([_PASSIVE, _PROGRESSIVE, lexicon]), re.IGNORECASE)
+
+    def tag(self, text: str) -> List[Dict[str, Any]]:
+        """Sentences of text with their tags, in one pass of the compiled pattern"""
+        sentences = []
+        starts = []
+        position = 0
+        for content, sep, section in split_elements(text):
+            if content.strip():
+                starts.append(position)
+                sentences.append({'text': content.strip(), 'section': section,
+                                  'tags': set(), 'phrases': {}, 'passive': []})
+            position += len(content) + len(sep)
+
+        for match in self.pattern.finditer(text):
+            index = bisect_right(starts, match.start()) - 1
+            if index < 0:
+                continue
+            sentence = sentences[index]
+            if match.group('passive'):
+                after = sentence['text'].lower().split(match.group('passive').lower(), 1)[-1]
+                if not re.search(r'\bby\b', after):
+                    sentence['passive'].append(match.group('passive'))
+                found = self.tags.get(match.group('participle').lower(), set())
+            elif match.group('progressive'):
+                found = {'progressive'}
+            else:
+                found = self.tags[match.group('lex').lower()]
+            sentence['tags'] |= found
+            for tag in found:
+                sentence['phrases'].setdefault(tag, match.group().lower())
+
+        headings = {s['section']: s['tags'] for s in sentences
+                    if heading_section(s['text']) == s['section']}
+        for sentence in sentences:
+            tiers = [int(t[4:]) for t in sentence['tags'] if t.startswith('tier')]
+            sentence['tier'] = min(tiers) if tiers else None
+            section_tags = headings.get(sentence['section'], set())
+            if 'optional' in sentence['tags'] or 'optional' in section_tags:
+                sentence['requirement'] = 'optional'
+            elif 'required' in sentence['tags'] or 'required' in section_tags:
+                sentence['requirement'] = 'required'
+            else:
+                sentence['requirement'] = None
+            sentence['words'] = {w for w in WORD.findall(sentence['text'].lower())
+                                 if w not in STOPWORDS and w not in self.tags}
+        return sentences
+
+    @staticmethod
+    def _normalized(text: str) -> str:
+        """Sentence text with formatting, bullets, case and end punctuation removed"""
+        return re.sub(r'^[-*+] ', '', normalize_text(text)).lower().rstrip('.!?;: ')
+
+    def _align(self, source: List[Dict[str, Any]],
+               output: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Best source sentence for each output sentence
+
+        A sentence identical after normalization wins outright; otherwise the
+        Dice overlap of the two word sets decides, via an inverted word index.
+        """
+        exact: Dict[str, int] = {}
+        index: Dict[str, List[int]] = {}
+        for i, sentence in enumerate(source):
+            exact.setdefault(self._normalized(sentence['text']), i)
+            for word in sentence['words']:
+                index.setdefault(word, []).append(i)
+        aligned = []
+        for sentence in output:
+            match = exact.get(self._normalized(sentence['text']))
+            if match is not None:
+                aligned.append(source[match])
+                continue
+            counts: Dict[int, int] = {}
+            for word in sentence['words']:
+                for i in index.get(word, ()):
+                    counts[i] = counts.get(i, 0) + 1
+            dice = {i: 2 * count / (len(sentence['words']) + len(source[i]['words']))
+                    for i, count in counts.items()}
+            best = max(dice, key=lambda i: (dice[i], -i), default=None)
+            if best is not None and dice[best] >= ALIGNMENT_THRESHOLD:
+                aligned.append(source[best])
+            else:
+                aligned.append(None)
+        return aligned
+
+    def scan(self, source: str, output: str, context: str = '') -> List[Dict[str, Any]]:
+        """Typed suspect violations in output relative to source
+
+        Output sentences align with source sentences first; context (e.g. the
+        project description) only backs sentences that have no source match.
+        """
+        output_sentences = self.tag(output)
+        aligned = self._align(self.tag(source), output_sentences)
+        if context:
+            fallback = self._align(self.tag(context), output_sentences)
+            aligned = [src or other for src, other in zip(aligned, fallback)]
+        violations: List[Dict[str, Any]] = []
+        seen: Set[Tuple[str, str]] = set()
+
+        def flag(category: str, out: Dict[str, Any], src: Optional[Dict[str, Any]],
+                 evidence: str, violation_type: Optional[str] = None) -> None:
+            default_type, severity = CATEGORIES[category]
+            violation_type = violation_type or default_type
+            if (violation_type, out['text']) in seen:
+                return
+            seen.add((violation_type, out['text']))
+            violations.append({
+                'type': violation_type,
+                'category': category,
+                'severity': severity,
+                'text': out['text'],
+                'source': src['text'] if src else None,
+                'evidence': evidence,
+                'rejection': self.bundle.rejection(violation_type),
+            })
+
+        for out, src in zip(output_sentences, aligned):
+            tags = out['tags']
+            if src is None:
+                if out['tier'] == 1:
+                    flag('completion_verb_without_completion_evidence', out, None,
+                         out['phrases']['tier1'])
+                elif out['tier'] == 2:
+                    flag('creation_verb_without_creation_evidence', out, None,
+                         out['phrases']['tier2'])
+                continue
+            source_tags = src['tags']
+
+            for i, (before, after) in enumerate(self.pairs):
+                if f'pair_from{i}' in source_tags and f'pair_to{i}' in tags \
+                        and f'pair_to{i}' not in source_tags:
+                    target = self.tags[after.lower()]
+                    flag('semantic_escalation', out, src, f'"{before}" -> "{after}"',
+                         OWNERSHIP_ASSUMPTION if 'ownership' in target else None)
+
+            source_tier = src['tier'] or DEFAULT_TIER
+            if out['tier'] is not None and out['tier'] < source_tier:
+                flag('verb_stronger_than_source', out, src,
+                     f"tier {source_tier} -> tier {out['tier']}")
+            if 'ownership' in tags and 'ownership' not in source_tags:
+                flag('ownership_without_attribution', out, src, out['phrases']['ownership'])
+            if 'weasel' in tags and 'weasel' not in source_tags:
+                flag('weasel_words_suggesting_higher_tier', out, src, out['phrases']['weasel'])
+            if out['passive'] and not src['passive']:
+                flag('passive_voice_hiding_actual_role', out, src, out['passive'][0])
+
+            source_pending = source_tags & {'future', 'progressive'}
+            completed = out['tier'] in (1, 2) and not tags & {'future', 'progressive', 'modal'}
+            if source_pending and completed:
+                flag('timeline_manipulation_suggesting_completion', out, src,
+                     f"{src['phrases'][sorted(source_pending)[0]]} -> "
+                     f"{out['phrases']['tier%d' % out['tier']]}")
+            if src['requirement'] == 'optional' and out['requirement'] == 'required':
+                flag('optional_becoming_required', out, src,
+                     f"{src['phrases'].get('optional', src['section'])} -> "
+                     f"{out['phrases'].get('required', out['section'])}")
+            if 'modal' in source_tags and 'modal' not in tags:
+                flag('potential_becoming_actual', out, src, src['phrases']['modal'])
+        return violations
+
+
+@lru_cache(maxsize=None)
+def default_scanner() -> EscalationScanner:
+    return EscalationScanner()
+
+
+def scan(source: str, output: str, context: str = '') -> List[Dict[str, Any]]:
+    """Suspect list for the hostile rounds, from the shared compiled scanner"""
+    return default_scanner().scan(source, output, context)
+
+
+if __name__ == "__main__":
+    import time
+
+    source = """Our team is building a real-time inventory platform.
+You may mentor junior engineers.
+Requirements:
+- Worked on React applications
+- Exposed to GraphQL
+Nice to have:
+- Kubernetes experience"""
+    output = """Our team built a real-time inventory platform.
+You will mentor junior engineers.
+Requirements:
+- Built React applications
+- Experienced with GraphQL
+- Kubernetes experience
+The billing system was shipped last year."""
+
+    start = time.perf_counter()
+    scanner = default_scanner()
+    compile_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(100):
+        suspects = scanner.scan(source, output)
+    scan_ms = (time.perf_counter() - start) * 10
+
+    for violation in suspects:
+        print(f"[{violation['severity']}] {violation['type']}/{violation['category']}: "
+              f"{violation['text']!r} ({violation['evidence']})")
+    print(f"Compile: {compile_ms:.1f} ms, scan: {scan_ms:.2f} ms")
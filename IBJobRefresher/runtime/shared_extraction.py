@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Shared Phase 1 extraction for requisitions of one project
+PROJECT_ENVIRONMENT and COMPANY_ATTRIBUTES are extracted once per source
+content hash; ROLE_SCOPE, 1B and the ad copy analysis are extracted per posting
+"""
+
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .cache import FRAMEWORK_ROOT, CacheBackend, MemoryBackend, module_hash
+from .inputs import (
+    AD_AUDIENCE, AD_INTRO, JOB_POSTING, JOB_TITLE, PROJECT_DESCRIPTION, normalize_text
+)
+from .models import EXTRACTION
+
+ROLE_SCOPE = 'ROLE_SCOPE'
+PROJECT_ENVIRONMENT = 'PROJECT_ENVIRONMENT'
+COMPANY_ATTRIBUTES = 'COMPANY_ATTRIBUTES'
+
+# Source sections each SOURCE_SEGREGATED_FACTS domain is extracted from.
+# ROLE_SCOPE is "from job posting ONLY"; Phase 0 has no separate company
+# section, so company attributes come from the project description.
+DOMAIN_SOURCES = {
+    ROLE_SCOPE: [JOB_TITLE, JOB_POSTING],
+    PROJECT_ENVIRONMENT: [PROJECT_DESCRIPTION],
+    COMPANY_ATTRIBUTES: [PROJECT_DESCRIPTION],
+}
+
+# Posting-level sections the per-posting call also reads for 1D and 1D.2
+# (ad copy and audience alignment). KPIs are Phase 2 inputs only, so a
+# KPI-only iteration keeps the same Phase 1 key (cache.PHASE_INPUTS).
+POSTING_CONTEXT = [AD_INTRO, AD_AUDIENCE]
+
+# Domains that depend only on project-level sources and can be shared
+SHARED_DOMAINS = (PROJECT_ENVIRONMENT, COMPANY_ATTRIBUTES)
+
+
+def domain_inputs(domain: str, sections: Dict[str, str]) -> Dict[str, Any]:
+    """Inputs for a single-domain Phase 1 call"""
+    inputs: Dict[str, Any] = {name: sections[name]
+                              for name in DOMAIN_SOURCES[domain] if sections.get(name)}
+    inputs['__domain__'] = domain
+    return inputs
+
+
+def posting_inputs(sections: Dict[str, str]) -> Dict[str, Any]:
+    """Inputs for the per-posting Phase 1 call: ROLE_SCOPE facts plus 1B-1D.2"""
+    inputs = domain_inputs(ROLE_SCOPE, sections)
+    inputs['__context__'] = {name: sections[name]
+                             for name in POSTING_CONTEXT if sections.get(name)}
+    return inputs
+
+
+def content_hash(domain: str, sections: Dict[str, str],
+                 root: Path = FRAMEWORK_ROOT) -> Optional[str]:
+    """Hash of a shared domain's normalized source text and the extraction module
+
+    Returns None when the posting has no source for that domain.
+    """
+    texts = [normalize_text(sections[name])
+             for name in DOMAIN_SOURCES[domain] if sections.get(name)]
+    if not texts:
+        return None
+    digest = hashlib.sha256(domain.encode())
+    digest.update(module_hash(EXTRACTION, root).encode())
+    for text in texts:
+        digest.update(b'\0' + text.encode())
+    return digest.hexdigest()
+
+
+class SharedExtractionStore:
+    """Project-level fact store keyed by source content hash"""
+
+    def __init__(self, backend: Optional[CacheBackend] = None, root: Path = FRAMEWORK_ROOT):
+        self.backend = backend or MemoryBackend()
+        self.root = Path(root)
+        self.stats = {'hits': 0, 'misses': 0}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def get(self, domain: str, sections: Dict[str, str]) -> Optional[Any]:
+        key = content_hash(domain, sections, self.root)
+        return None if key is None else self.backend.get(key)
+
+    async def get_or_extract(self, domain: str, sections: Dict[str, str],
+                             extract: Callable[[], Awaitable[Any]]) -> Any:
+        """Stored facts for this domain's source, extracting them on first sight"""
+        key = content_hash(domain, sections, self.root)
+        if key is None:
+            return []
+        facts = self.backend.get(key)
+        if facts is not None:
+            self.stats['hits'] += 1
+            return facts
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Another posting of the same project is extracting it right now
+            self.stats['hits'] += 1
+            return await asyncio.shield(pending)
+
+        self.stats['misses'] += 1
+        task = asyncio.ensure_future(extract())
+        self._pending[key] = task
+        try:
+            facts = await asyncio.shield(task)
+        finally:
+            self._pending.pop(key, None)
+        self.backend.set(key, facts)
+        return facts
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Delta-encoded posting history for PD-SMIS iterations
+Keeps the immutable baseline plus sentence-level deltas with stable element IDs,
+so diffs between any two versions only touch what changed
+"""
+
+import difflib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .inputs import heading_section
+
+# Full element order is snapshotted every this many versions; versions in
+# between are stored as deltas only (continuity_management.compress)
+CHECKPOINT_EVERY = 10
+
+# Rewritten sentences at least this similar keep their element ID
+MODIFY_SIMILARITY = 0.5
+
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])(\s+)(?=\S)')
+
+# A revision is (version, text or None once removed, separator after it, section)
+Revision = Tuple[int, Optional[str], str, str]
+
+
+def split_elements(text: str) -> List[Tuple[str, str, str]]:
+    """(sentence, whitespace after it, section heading) segments that rejoin to text
+
+    Headings are their own elements and name the section of what follows;
+    bullets and lines are split further into sentences.
+    """
+    segments: List[Tuple[str, str, str]] = []
+    section = ''
+    for line in text.splitlines(keepends=True):
+        content = line.rstrip('\r\n')
+        ending = line[len(content):]
+        if not content.strip():
+            if segments:
+                text_, sep, sec = segments[-1]
+                segments[-1] = (text_, sep + line, sec)
+            else:
+                segments.append(('', line, section))
+            continue
+        heading = heading_section(content)
+        if heading is not None:
+            section = heading
+            segments.append((content, ending, section))
+            continue
+        parts = _SENTENCE_BREAK.split(content)
+        for i in range(0, len(parts), 2):
+            sep = parts[i + 1] if i + 1 < len(parts) else ending
+            segments.append((parts[i], sep, section))
+    return segments
+
+
+def _key(text: str) -> str:
+    return ' '.join(text.split()).lower()
+
+
+class VersionStore:
+    """Every version of one posting, stored as the baseline plus deltas
+
+    Version 1 is the baseline (ITERATION_TRACKER.initialize_baseline) and is
+    never modified. Each later version records which elements were inserted,
+    removed or modified; each such edit has a change ID ('v3.e12') that KPI
+    results can be attributed to.
+    """
+
+    def __init__(self, baseline: str, decisions: Optional[Dict[str, Any]] = None):
+        self.baseline = baseline
+        self._revisions: Dict[str, List[Revision]] = {}
+        # Per version: order ops and the elements they touched
+        self._ops: List[List[Tuple[str, str, Optional[str]]]] = []
+        self._touched: List[List[str]] = []
+        self._checkpoints: Dict[int, List[str]] = {}
+        self.decisions: Dict[int, Dict[str, Any]] = {}
+        self.kpis: Dict[int, Dict[str, float]] = {}
+        self._next_id = 0
+        self._order: List[str] = []
+
+        ops = []
+        for text, sep, section in split_elements(baseline):
+            element = self._new_element(1, text, sep, section)
+            ops.append(('insert', element, self._order[-1] if self._order else None))
+            self._order.append(element)
+        self._ops.append(ops)
+        self._touched.append(list(self._order))
+        self._checkpoints[1] = list(self._order)
+        self.decisions[1] = decisions or {}
+
+    @property
+    def latest(self) -> int:
+        return len(self._ops)
+
+    def _new_element(self, version: int, text: str, sep: str, section: str) -> str:
+        self._next_id += 1
+        element = f'e{self._next_id}'
+        self._revisions[element] = [(version, text, sep, section)]
+        return element
+
+    def _state(self, element: str, version: int) -> Optional[Revision]:
+        """Latest revision of an element at or before version (None if not yet born)"""
+        for revision in reversed(self._revisions[element]):
+            if revision[0] <= version:
+                return revision
+        return None
+
+    def commit(self, text: str, decisions: Optional[Dict[str, Any]] = None,
+               kpis: Optional[Dict[str, float]] = None) -> int:
+        """Store a new version of the posting; returns its version number
+
+        The one text alignment against the previous version happens here.
+        """
+        version = self.latest + 1
+        previous = [(element, self._state(element, version - 1)) for element in self._order]
+        segments = split_elements(text)
+        matcher = difflib.SequenceMatcher(
+            None, [_key(state[1]) for _, state in previous],
+            [_key(segment[0]) for segment in segments], autojunk=False)
+
+        order: List[str] = []
+        removed: List[str] = []
+        touched: List[str] = []
+
+        def modify(element: str, segment: Tuple[str, str, str]) -> None:
+            state = self._state(element, version - 1)
+            if state[1:] != segment:
+                self._revisions[element].append((version, *segment))
+                # Whitespace-only revisions are kept for reconstruction, not as changes
+                if state[1] != segment[0]:
+                    touched.append(element)
+            order.append(element)
+
+        def add(segment: Tuple[str, str, str]) -> None:
+            element = self._new_element(version, *segment)
+            touched.append(element)
+            order.append(element)
+
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for (element, _), segment in zip(previous[i1:i2], segments[j1:j2]):
+                    modify(element, segment)
+            elif tag == 'insert':
+                for segment in segments[j1:j2]:
+                    add(segment)
+            elif tag == 'delete':
+                removed.extend(element for element, _ in previous[i1:i2])
+            else:
+                # Pair rewritten sentences in order so edits keep their element ID
+                old = previous[i1:i2]
+                o = 0
+                for segment in segments[j1:j2]:
+                    match = None
+                    for k in range(o, len(old)):
+                        ratio = difflib.SequenceMatcher(
+                            None, _key(old[k][1][1]), _key(segment[0])).ratio()
+                        if ratio >= MODIFY_SIMILARITY:
+                            match = k
+                            break
+                    if match is None:
+                        add(segment)
+                        continue
+                    removed.extend(element for element, _ in old[o:match])
+                    modify(old[match][0], segment)
+                    o = match + 1
+                removed.extend(element for element, _ in old[o:])
+
+        ops: List[Tuple[str, str, Optional[str]]] = []
+        for element in removed:
+            state = self._state(element, version - 1)
+            self._revisions[element].append((version, None, '', state[3]))
+            ops.append(('remove', element, None))
+            touched.append(element)
+        kept = set(self._order) - set(removed)
+        for index, element in enumerate(order):
+            if element not in kept:
+                ops.append(('insert', element, order[index - 1] if index else None))
+
+        self._ops.append(ops)
+        self._touched.append(touched)
+        self._order = order
+        if version % CHECKPOINT_EVERY == 0:
+            self._checkpoints[version] = list(order)
+        self.decisions[version] = decisions or {}
+        if kpis is not None:
+            self.kpis[version] = dict(kpis)
+        return version
+
+    def record_kpis(self, version: int, kpis: Dict[str, float]) -> None:
+        """KPIs measured while a version was live"""
+        self._check(version)
+        self.kpis[version] = dict(kpis)
+
+    def _check(self, version: int) -> None:
+        if not 1 <= version <= self.latest:
+            raise KeyError(f"No version {version} (have 1-{self.latest})")
+
+    def order(self, version: int) -> List[str]:
+        """Element IDs of a version in document order, replayed from a checkpoint"""
+        self._check(version)
+        if version == self.latest:
+            return list(self._order)
+        start = max(v for v in self._checkpoints if v <= version)
+        order = list(self._checkpoints[start])
+        for ops in self._ops[start:version]:
+            for op, element, after in ops:
+                if op == 'remove':
+                    order.remove(element)
+            for op, element, after in ops:
+                if op == 'insert':
+                    order.insert(order.index(after) + 1 if after else 0, element)
+        return order
+
+    def text(self, version: int) -> str:
+        """Full posting text of a version"""
+        if version == 1:
+            return self.baseline
+        parts = []
+        for element in self.order(version):
+            _, text, sep, _ = self._state(element, version)
+            parts.append(text + sep)
+        return ''.join(parts)
+
+    def changes(self, version: int) -> List[str]:
+        """Change IDs introduced by one version (detailed_diff_from_previous)"""
+        self._check(version)
+        return [f'v{version}.{element}' for element in self._touched[version - 1]]
+
+    def diff(self, a: int, b: int) -> List[Dict[str, Any]]:
+        """Element-level changes from version a to version b (either direction)
+
+        Only elements touched by versions between a and b are examined.
+        """
+        self._check(a)
+        self._check(b)
+        low, high = sorted((a, b))
+        candidates: Dict[str, List[str]] = {}
+        for version in range(low + 1, high + 1):
+            for element in self._touched[version - 1]:
+                candidates.setdefault(element, []).append(f'v{version}.{element}')
+
+        changes = []
+        for element, change_ids in candidates.items():
+            before, after = self._state(element, a), self._state(element, b)
+            before_text = before[1] if before else None
+            after_text = after[1] if after else None
+            if before_text == after_text:
+                continue
+            if before_text is None:
+                kind = 'added'
+            elif after_text is None:
+                kind = 'removed'
+            else:
+                kind = 'modified'
+            changes.append({
+                'element_id': element,
+                'kind': kind,
+                'section': (after or before)[3],
+                'before': before_text,
+                'after': after_text,
+                'change_ids': change_ids,
+            })
+        return changes
+
+    def element_history(self, element: str) -> List[Dict[str, Any]]:
+        """Every revision of one element"""
+        return [{'change_id': f'v{version}.{element}', 'version': version,
+                 'text': text, 'section': section}
+                for version, text, _, section in self._revisions[element]]
+
+    def element_impact(self) -> Dict[str, Dict[str, Any]]:
+        """PERFORMANCE_EVOLUTION.element_level_impact
+
+        Each version's KPI change against the previous measured version is
+        attributed to the edits that version made, shared equally between
+        edits made together.
+        """
+        impact: Dict[str, Dict[str, Any]] = {}
+        measured = sorted(self.kpis)
+        for previous, version in zip(measured, measured[1:]):
+            edits: Set[str] = set()
+            for v in range(previous + 1, version + 1):
+                edits.update(self.changes(v))
+            if not edits:
+                continue
+            deltas = {kpi: value - self.kpis[previous][kpi]
+                      for kpi, value in self.kpis[version].items()
+                      if kpi in self.kpis[previous]}
+            for change_id in sorted(edits):
+                element = change_id.split('.', 1)[1]
+                edited = int(change_id[1:].split('.', 1)[0])
+                impact[change_id] = {
+                    'element_id': element,
+                    'section': self._state(element, edited)[3],
+                    'versions': (previous, version),
+                    'kpi_deltas': deltas,
+                    'shared_with': len(edits) - 1,
+                }
+        return impact
+
+    def stats(self) -> Dict[str, int]:
+        """Stored characters against keeping a full copy of every version"""
+        stored = len(self.baseline) + sum(
+            len(text or '') for revisions in self._revisions.values()
+            for version, text, _, _ in revisions if version > 1)
+        full = sum(len(self.text(v)) for v in range(1, self.latest + 1))
+        return {'versions': self.latest, 'elements': len(self._revisions),
+                'stored_chars': stored, 'full_copy_chars': full}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'baseline': self.baseline,
+            'revisions': self._revisions,
+            'ops': self._ops,
+            'touched': self._touched,
+            'checkpoints': self._checkpoints,
+            'decisions': self.decisions,
+            'kpis': self.kpis,
+            'next_id': self._next_id,
+            'order': self._order,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VersionStore':
+        store = cls.__new__(cls)
+        store.baseline = data['baseline']
+        store._revisions = {element: [tuple(r) for r in revisions]
+                            for element, revisions in data['revisions'].items()}
+        store._ops = [[tuple(op) for op in ops] for ops in data['ops']]
+        store._touched = [list(touched) for touched in data['touched']]
+        store._checkpoints = {int(v): list(order) for v, order in data['checkpoints'].items()}
+        store.decisions = {int(v): d for v, d in data['decisions'].items()}
+        store.kpis = {int(v): k for v, k in data['kpis'].items()}
+        store._next_id = data['next_id']
+        store._order = list(data['order'])
+        return store
+
+    def save(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path: Path) -> 'VersionStore':
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def impacts_by_section(stores: Iterable[VersionStore], kpi: str) -> Dict[str, List[float]]:
+    """KPI deltas per edited section across many postings' histories"""
+    sections: Dict[str, List[float]] = {}
+    for store in stores:
+        for change_id, impact in store.element_impact().items():
+            if kpi not in impact['kpi_deltas']:
+                continue
+            section = impact['section'] or '(intro)'
+            sections.setdefault(section, []).append(impact['kpi_deltas'][kpi])
+    return sections
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    random.seed(0)
+    baseline = "\n".join([
+        "We're looking for a Frontend Developer to join our platform team.",
+        "",
+        "Responsibilities:",
+        *[f"- Own feature area {i} end to end. Pair with design on area {i}."
+          for i in range(20)],
+        "",
+        "Requirements:",
+        *[f"- {i + 2}+ years with technology {i}" for i in range(15)],
+    ])
+
+    store = VersionStore(baseline)
+    text = baseline
+    for iteration in range(2, 13):
+        lines = text.splitlines()
+        for _ in range(3):
+            index = random.randrange(len(lines))
+            if lines[index].startswith('- '):
+                lines[index] = lines[index].rstrip('.') + f' (rev {iteration}).'
+        text = '\n'.join(lines)
+        store.commit(text, kpis={'apply_rate': 2 + random.random()})
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        changes = store.diff(1, store.latest)
+    delta_ms = (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(1000):
+        list(difflib.unified_diff(store.text(1).splitlines(), store.text(store.latest).splitlines()))
+    text_ms = (time.perf_counter() - start)
+
+    print(f"Stats: {store.stats()}")
+    print(f"diff(1, {store.latest}): {len(changes)} changed elements, "
+          f"{delta_ms:.3f} ms vs {text_ms:.3f} ms reconstruct + text diff")
+    print(f"Changes in v{store.latest}: {store.changes(store.latest)}")
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Parallel integration runner for PD-SMIS v5.1 framework roots
+Runs every IntegrationTests check across any number of roots on a process pool,
+skips roots whose content is unchanged and writes JSON/JUnit reports for CI
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR))
+sys.path.insert(0, str(TESTS_DIR.parent))
+
+from integration_tests import CHECKS, FRAMEWORK_DIR, REPORT_NAME, IntegrationTests  # noqa: E402
+from runtime.cache import DiskBackend  # noqa: E402
+
+DEFAULT_CACHE_DIR = TESTS_DIR / '.integration_cache'
+REPORT_VERSION = 2
+
+
+def root_hash(root: Path) -> str:
+    """Digest of everything a check can read under root, plus the checks themselves
+
+    The markdown modules and the compiled rules are hashed; the generated
+    integration report is not, so writing it does not invalidate the cache.
+    """
+    root = Path(root)
+    digest = hashlib.sha256()
+    digest.update((TESTS_DIR / 'integration_tests.py').read_bytes())
+    files = [p for p in [*root.glob('**/*.md'), *root.glob('rules/*')]
+             if p.is_file() and p.name != REPORT_NAME]
+    for path in sorted(files):
+        digest.update(path.relative_to(root).as_posix().encode() + b'\0')
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def root_id(root: Path, base: Optional[Path] = None) -> str:
+    """Stable report key: the root relative to base (default: the working directory)"""
+    root = Path(root).resolve()
+    base = Path(base or Path.cwd()).resolve()
+    return Path(os.path.relpath(root, base)).as_posix()
+
+
+def parse_root(arg: str) -> Dict[str, Path]:
+    """Command-line root: "name=path" names it, a bare path is keyed by root_id"""
+    name, sep, path = arg.partition('=')
+    if sep and name and not Path(arg).exists():
+        return {name: Path(path)}
+    return {root_id(Path(arg)): Path(arg)}
+
+
+def _run_check(root: str, name: str) -> Dict[str, Any]:
+    """Process-pool entry point: one check against one root"""
+    return IntegrationTests(Path(root)).run_check(name)
+
+
+def _collect(future: Future, name: str) -> Dict[str, Any]:
+    """A check's result, or a failed result carrying the error if its worker died"""
+    try:
+        return future.result()
+    except Exception as e:
+        return {'name': name, 'passed': False, 'time_ms': 0.0, 'output': '',
+                'error': f"{type(e).__name__}: {e}"}
+
+
+def run_roots(roots: Union[Sequence[Path], Mapping[str, Path]], workers: Optional[int] = None,
+              cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """Every check across every root; roots with a cached result are not re-run
+
+    roots is a list of paths, keyed by root_id(), or a mapping of id to path.
+    Only results where no check raised are cached.
+    """
+    start = time.perf_counter()
+    if not isinstance(roots, Mapping):
+        roots = {root_id(root): root for root in roots}
+    cache = DiskBackend(cache_dir) if cache_dir is not None else None
+    entries = []
+    pending = []
+    for key, root in roots.items():
+        root = Path(root).resolve()
+        digest = root_hash(root)
+        cached = cache.get(digest) if cache is not None else None
+        entries.append({'id': key, 'root': str(root), 'hash': digest,
+                        'cached': cached is not None, 'checks': cached})
+        if cached is None:
+            pending.append(entries[-1])
+
+    if pending:
+        tasks = [(entry['root'], name) for entry in pending for name, _ in CHECKS]
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_check, root, name) for root, name in tasks]
+            results = [_collect(future, name) for future, (_, name) in zip(futures, tasks)]
+        for i, entry in enumerate(pending):
+            entry['checks'] = results[i * len(CHECKS):(i + 1) * len(CHECKS)]
+            # A check that errored says nothing about the content; run it again next time
+            if cache is not None and not any(check['error'] for check in entry['checks']):
+                cache.set(entry['hash'], entry['checks'])
+
+    for entry in entries:
+        entry['passed'] = sum(check['passed'] for check in entry['checks'])
+        entry['failed'] = len(entry['checks']) - entry['passed']
+        entry['time_ms'] = sum(check['time_ms'] for check in entry['checks'])
+    return {
+        'version': REPORT_VERSION,
+        'roots': entries,
+        'passed': sum(entry['passed'] for entry in entries),
+        'failed': sum(entry['failed'] for entry in entries),
+        'cached_roots': sum(entry['cached'] for entry in entries),
+        'wall_time_ms': (time.perf_counter() - start) * 1000,
+    }
+
+
+def regressions(previous: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Checks that passed for a root in the previous report and fail or are gone now
+
+    Roots are matched by id, so reports from different checkouts compare.
+    A baseline root or passing check with no counterpart counts as missing.
+    """
+    now = {entry['id']: {check['name']: check['passed'] for check in entry['checks']}
+           for entry in current['roots']}
+    found = []
+    for entry in previous['roots']:
+        checks = now.get(entry['id'])
+        if checks is None:
+            found.append({'root': entry['id'], 'check': '*', 'reason': 'missing'})
+            continue
+        for check in entry['checks']:
+            if not check['passed']:
+                continue
+            if check['name'] not in checks:
+                found.append({'root': entry['id'], 'check': check['name'], 'reason': 'missing'})
+            elif not checks[check['name']]:
+                found.append({'root': entry['id'], 'check': check['name'],
+                              'reason': 'regressed'})
+    return found
+
+
+def failure_message(check: Dict[str, Any]) -> str:
+    """The exception, or the check's ❌ lines without the "Testing: ..." header"""
+    if check['error']:
+        return check['error']
+    lines = [line.strip() for line in check['output'].splitlines()[1:] if line.strip()]
+    return ' '.join(lines) or 'failed'
+
+
+def junit_xml(report: Dict[str, Any]) -> str:
+    """JUnit XML with one testsuite per root and one testcase per check"""
+    suites = ET.Element('testsuites', tests=str(report['passed'] + report['failed']),
+                        failures=str(report['failed']),
+                        time=f"{report['wall_time_ms'] / 1000:.3f}")
+    for entry in report['roots']:
+        suite = ET.SubElement(suites, 'testsuite', name=entry['id'],
+                              tests=str(len(entry['checks'])), failures=str(entry['failed']),
+                              time=f"{entry['time_ms'] / 1000:.3f}")
+        properties = ET.SubElement(suite, 'properties')
+        ET.SubElement(properties, 'property', name='path', value=entry['root'])
+        ET.SubElement(properties, 'property', name='content_hash', value=entry['hash'])
+        ET.SubElement(properties, 'property', name='cached', value=str(entry['cached']).lower())
+        for check in entry['checks']:
+            case = ET.SubElement(suite, 'testcase', classname='IntegrationTests',
+                                 name=check['name'], time=f"{check['time_ms'] / 1000:.3f}")
+            if not check['passed']:
+                failure = ET.SubElement(case, 'failure', message=failure_message(check))
+                failure.text = check['output']
+            elif check['output']:
+                ET.SubElement(case, 'system-out').text = check['output']
+    ET.indent(suites)
+    return ET.tostring(suites, encoding='unicode', xml_declaration=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('roots', nargs='*', default=[str(FRAMEWORK_DIR)],
+                        help='framework roots as path or name=path; unnamed roots are '
+                             'keyed by their path relative to the working directory '
+                             '(default: this IBJobRefresher/)')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--json', type=Path, help='write the JSON report here')
+    parser.add_argument('--junit', type=Path, help='write JUnit XML here')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--baseline', type=Path,
+                        help='previous JSON report; fail only on checks that regressed')
+    args = parser.parse_args(argv)
+
+    roots: Dict[str, Path] = {}
+    for arg in args.roots:
+        roots.update(parse_root(arg))
+    report = run_roots(roots, args.workers, None if args.no_cache else args.cache_dir)
+    for entry in report['roots']:
+        status = '✅' if not entry['failed'] else '❌'
+        note = ' (cached)' if entry['cached'] else ''
+        print(f"{status} {entry['id']}: {entry['passed']}/{len(entry['checks'])} "
+              f"in {entry['time_ms']:.0f} ms{note}")
+        for check in entry['checks']:
+            if not check['passed']:
+                print(f"   {check['name']}: {failure_message(check)}")
+    print(f"{report['passed']} passed, {report['failed']} failed across "
+          f"{len(report['roots'])} roots in {report['wall_time_ms']:.0f} ms")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"Created: {args.json}")
+    if args.junit:
+        args.junit.write_text(junit_xml(report))
+        print(f"Created: {args.junit}")
+
+    if args.baseline:
+        regressed = regressions(json.loads(args.baseline.read_text()), report)
+        for item in regressed:
+            if item['reason'] == 'missing':
+                print(f"❌ Missing from this run: {item['check']} in {item['root']}")
+            else:
+                print(f"❌ Regression: {item['check']} in {item['root']}")
+        return 1 if regressed else 0
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
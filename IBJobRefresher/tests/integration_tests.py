@@ -4,17 +4,40 @@ Integration Test Suite for PD-SMIS v5.1
 Verifies all components preserved and functionality maintained
 """
 
+import contextlib
+import hashlib
+import io
 import json
-import re
+import time
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Any, Dict, List, Optional
+
+# The IBJobRefresher/ directory this file ships in
+FRAMEWORK_DIR = Path(__file__).resolve().parent.parent
+REPORT_NAME = 'integration_test_report.md'
+
+# (report name, IntegrationTests method) in run order
+CHECKS = [
+    ('Phases Present', 'test_all_phases_present'),
+    ('Core Components', 'test_core_components_preserved'),
+    ('Rule Bundle Current', 'test_rule_bundle_current'),
+    ('14 Safeguards', 'test_all_14_safeguards_intact'),
+    ('Rejection Templates', 'test_rejection_templates'),
+    ('Adversarial Intensity', 'test_adversarial_intensity_maintained'),
+    ('Tier System', 'test_tier_system_enforcement'),
+    ('Validation Completeness', 'test_validation_orchestration_preserves_all_checks'),
+    ('Error Handling', 'test_error_handling_integration'),
+    ('Source Segregation', 'test_source_segregation_maintained'),
+    ('Performance Safety', 'test_performance_optimizations_safe'),
+]
+
 
 class IntegrationTests:
-    """Complete integration testing for refactored framework"""
+    """Complete integration testing for one framework root"""
 
-    def __init__(self):
-        self.original_path = Path('JobEvalV5.md')
-        self.refactored_path = Path('refactored')
+    def __init__(self, framework_path: Path = FRAMEWORK_DIR):
+        self.framework_path = Path(framework_path)
+        self.bundle_path = self.framework_path / 'rules' / 'bundle.json'
         self.critical_markers = self._define_critical_markers()
         self.test_results = []
 
@@ -38,14 +61,14 @@ class IntegrationTests:
                 'SEMANTIC_FINGERPRINTS',
                 'PRECISION_TIERS',
                 'SOURCE_SEGREGATED_FACTS',
-                'BOTTLENECK_ANALYZER',
-                'HYPOTHESIS_GENERATOR',
-                'ADVERSARIAL_VALIDATOR',
+                'BOTTLENECK ANALYSIS ENGINE',
+                'DIAGNOSE_PERFORMANCE_GAPS',  # Hypothesis generator
+                'ADVERSARIAL VALIDATOR AGENT',
                 'ITERATION_TRACKER',
                 'LEARNING_ACCUMULATOR'
             ],
             'validation_types': [
-                'tier_enforcement',
+                'tier_boundary_enforcement',
                 'adversarial_validation',
                 'semantic_diff_validation',
                 'domain_boundary_enforcement',
@@ -67,6 +90,11 @@ class IntegrationTests:
                 'Engagement Enhancement Boundaries',
                 'Learning Accumulator Protection'
             ],
+            'rejection_templates': [
+                'verb_escalation',
+                'precision_inflation',
+                'ownership_assumption'
+            ],
             'critical_logic': [
                 'HOSTILE AUDITOR',
                 'assume bad faith',
@@ -78,11 +106,11 @@ class IntegrationTests:
         }
 
     def test_all_phases_present(self) -> bool:
-        """Verify all phases exist in refactored version"""
+        """Verify all phases exist in the framework modules"""
         print("Testing: All phases present...")
 
         phases_found = set()
-        for module_path in self.refactored_path.glob('**/*.md'):
+        for module_path in self.framework_path.glob('**/*.md'):
             content = module_path.read_text()
             for phase in self.critical_markers['phases']:
                 if phase in content:
@@ -101,7 +129,7 @@ class IntegrationTests:
         print("Testing: Core components preserved...")
 
         components_found = set()
-        for module_path in self.refactored_path.glob('**/*.md'):
+        for module_path in self.framework_path.glob('**/*.md'):
             content = module_path.read_text()
             for component in self.critical_markers['core_components']:
                 if component in content:
@@ -115,39 +143,92 @@ class IntegrationTests:
         print(f"  ✅ All {len(self.critical_markers['core_components'])} core components found")
         return True
 
+    def _load_bundle(self) -> Optional[Dict[str, Any]]:
+        """Compiled rule bundle built by dev/build_rules.py, or None if absent"""
+        if not self.bundle_path.exists():
+            print(f"  ❌ Rule bundle not found at {self.bundle_path}")
+            return None
+        return json.loads(self.bundle_path.read_text())
+
+    def test_rule_bundle_current(self) -> bool:
+        """Verify the rule bundle was built from the current markdown modules"""
+        print("Testing: Rule bundle current...")
+
+        bundle = self._load_bundle()
+        if bundle is None:
+            return False
+
+        for module, digest in bundle['sources'].items():
+            source = self.framework_path / module
+            if not source.exists():
+                print(f"  ❌ Bundle source missing: {module}")
+                return False
+            if hashlib.sha256(source.read_bytes()).hexdigest() != digest:
+                print(f"  ❌ {module} changed since the bundle was built; run dev/build_rules.py")
+                return False
+
+        print(f"  ✅ Rule bundle {bundle['bundle_version']} matches {len(bundle['sources'])} sources")
+        return True
+
     def test_all_14_safeguards_intact(self) -> bool:
         """Verify all 14 safeguards are present and unchanged"""
         print("Testing: All 14 safeguards intact...")
 
-        safeguards_path = self.refactored_path / 'safeguards' / 'critical_safeguards.md'
-        if not safeguards_path.exists():
-            print(f"  ❌ Safeguards file not found at {safeguards_path}")
+        bundle = self._load_bundle()
+        if bundle is None:
             return False
 
-        content = safeguards_path.read_text()
-        safeguards_found = []
-
-        for safeguard in self.critical_markers['safeguards']:
-            if safeguard in content:
-                safeguards_found.append(safeguard)
+        safeguards = bundle['safeguards']
+        numbers = [s['number'] for s in safeguards]
+        if numbers != list(range(1, 15)):
+            print(f"  ❌ Expected safeguards 1-14, found {numbers}")
+            return False
 
-        if len(safeguards_found) != 14:
-            missing = set(self.critical_markers['safeguards']) - set(safeguards_found)
-            print(f"  ❌ Only {len(safeguards_found)}/14 safeguards found")
+        names = [s['name'] for s in safeguards]
+        missing = set(self.critical_markers['safeguards']) - set(names)
+        if missing:
+            print(f"  ❌ Only {14 - len(missing)}/14 safeguards found")
             print(f"     Missing: {missing}")
             return False
 
+        # Every safeguard defined as a function must enforce something
+        for safeguard in safeguards:
+            if safeguard['function'] and not (safeguard['rules'] or safeguard['requires']):
+                print(f"  ❌ {safeguard['function']} has no enforcement rules")
+                return False
+
         print(f"  ✅ All 14 safeguards present and accounted for")
         return True
 
+    def test_rejection_templates(self) -> bool:
+        """Verify every validator rejection template is defined and rejects"""
+        print("Testing: Rejection templates...")
+
+        bundle = self._load_bundle()
+        if bundle is None:
+            return False
+
+        templates = bundle['rejection_templates']
+        for violation in self.critical_markers['rejection_templates']:
+            template = templates.get(violation)
+            if not template or 'REJECT' not in template['rejection']:
+                print(f"  ❌ Missing rejection template: {violation}")
+                return False
+
+        print(f"  ✅ All {len(templates)} rejection templates defined")
+        return True
+
     def test_adversarial_intensity_maintained(self) -> bool:
         """Verify adversarial validation maintains hostile intensity"""
         print("Testing: Adversarial validation intensity...")
 
-        adversarial_path = self.refactored_path / 'validation' / 'adversarial_validation.md'
-        orchestrator_path = self.refactored_path / 'validation' / 'validation_orchestrator.md'
-
-        paths_to_check = [p for p in [adversarial_path, orchestrator_path] if p.exists()]
+        # Each module states its success metric in its own words
+        success_markers = {
+            'adversarial_validation.md': 'SUCCESS is measured by violations found',
+            'validation_orchestrator.md': 'success_metric: "violations_found"',
+        }
+        paths_to_check = [self.framework_path / 'validation' / name for name in success_markers]
+        paths_to_check = [p for p in paths_to_check if p.exists()]
 
         if not paths_to_check:
             print(f"  ❌ No adversarial validation files found")
@@ -156,15 +237,14 @@ class IntegrationTests:
         intensity_markers = [
             'HOSTILE AUDITOR',
             'assume bad faith',
-            'success_metric: "violations_found"',
             'hostile'
         ]
 
         for path in paths_to_check:
             content = path.read_text().upper()
-            for marker in intensity_markers:
+            for marker in intensity_markers + [success_markers[path.name]]:
                 if marker.upper() not in content:
-                    print(f"  ❌ Missing intensity marker: {marker}")
+                    print(f"  ❌ Missing intensity marker in {path.name}: {marker}")
                     return False
 
         print(f"  ✅ Adversarial validation intensity preserved")
@@ -174,24 +254,24 @@ class IntegrationTests:
         """Verify tier system and enforcement logic"""
         print("Testing: Tier system enforcement...")
 
-        tier_path = self.refactored_path / 'validation' / 'precision_tiers.md'
-        if not tier_path.exists():
-            print(f"  ❌ Precision tiers file not found")
+        bundle = self._load_bundle()
+        if bundle is None:
             return False
 
-        content = tier_path.read_text()
+        tiers = {t['name']: t for t in bundle['precision_tiers']}
 
         # Check all 5 tiers defined
         required_tiers = ['completion', 'creation', 'participation', 'association', 'proximity']
         for tier in required_tiers:
-            if tier not in content.lower():
+            if tier not in tiers or not tiers[tier]['verbs']:
                 print(f"  ❌ Missing tier: {tier}")
                 return False
 
         # Check escalation prevention
-        if 'cannot_escalate' not in content.lower():
-            print(f"  ❌ Tier escalation prevention not found")
-            return False
+        for tier in tiers.values():
+            if 'cannot_escalate_from' not in tier and 'cannot_escalate_to' not in tier:
+                print(f"  ❌ Tier escalation prevention not found for {tier['name']}")
+                return False
 
         print(f"  ✅ All 5 tiers defined with escalation prevention")
         return True
@@ -200,7 +280,7 @@ class IntegrationTests:
         """Verify optimized validation still runs all checks"""
         print("Testing: Validation orchestration completeness...")
 
-        orchestrator_path = self.refactored_path / 'validation' / 'validation_orchestrator.md'
+        orchestrator_path = self.framework_path / 'validation' / 'validation_orchestrator.md'
         if not orchestrator_path.exists():
             print(f"  ❌ Validation orchestrator not found")
             return False
@@ -225,20 +305,23 @@ class IntegrationTests:
         """Verify new error handling doesn't break existing flow"""
         print("Testing: Error handling integration...")
 
-        error_path = self.refactored_path / 'phases' / 'phase_0_6_error_handling.md'
-        if not error_path.exists():
-            print(f"  ❌ Error handling module not found")
+        bundle = self._load_bundle()
+        if bundle is None:
             return False
 
-        content = error_path.read_text()
+        handlers = bundle['error_handlers']
 
         # Verify critical errors cause abort
-        if 'ABORT' not in content:
+        critical_missing = handlers.get('missing_data', {}).get('critical_missing', {})
+        if critical_missing.get('action') != 'ABORT_WITH_ERROR':
             print(f"  ❌ Error handling doesn't include abort logic")
             return False
+        if bundle['error_severity'].get('CRITICAL', {}).get('action') != 'ABORT_PIPELINE':
+            print(f"  ❌ CRITICAL severity does not abort the pipeline")
+            return False
 
         # Verify tier violations are caught
-        if 'tier_violation' not in content.lower():
+        if handlers.get('tier_violation_attempt', {}).get('severity') != 'CRITICAL':
             print(f"  ❌ Tier violation handling not found")
             return False
 
@@ -249,7 +332,7 @@ class IntegrationTests:
         """Verify source segregation boundaries remain intact"""
         print("Testing: Source segregation boundaries...")
 
-        extraction_path = self.refactored_path / 'phases' / 'phase_1_extraction.md'
+        extraction_path = self.framework_path / 'phases' / 'phase_1_extraction.md'
         if not extraction_path.exists():
             print(f"  ❌ Extraction phase not found")
             return False
@@ -275,7 +358,7 @@ class IntegrationTests:
         """Verify performance optimizations don't compromise safety"""
         print("Testing: Performance optimization safety...")
 
-        orchestrator_path = self.refactored_path / 'validation' / 'validation_orchestrator.md'
+        orchestrator_path = self.framework_path / 'validation' / 'validation_orchestrator.md'
         if not orchestrator_path.exists():
             return False
 
@@ -298,31 +381,39 @@ class IntegrationTests:
         print(f"  ✅ Performance optimizations appear safe")
         return True
 
+    def run_check(self, name: str) -> Dict[str, Any]:
+        """One check with its captured output and wall time, for machine-readable reports"""
+        method = dict(CHECKS)[name]
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            try:
+                passed = bool(getattr(self, method)())
+                error = None
+            except Exception as e:
+                passed = False
+                error = f"{type(e).__name__}: {e}"
+        return {
+            'name': name,
+            'passed': passed,
+            'time_ms': (time.perf_counter() - start) * 1000,
+            'output': output.getvalue(),
+            'error': error,
+        }
+
     def run_all_tests(self) -> Dict[str, bool]:
         """Execute all integration tests"""
         print("\n" + "="*60)
         print("PD-SMIS v5.1 Integration Test Suite")
         print("="*60 + "\n")
 
-        tests = [
-            ('Phases Present', self.test_all_phases_present),
-            ('Core Components', self.test_core_components_preserved),
-            ('14 Safeguards', self.test_all_14_safeguards_intact),
-            ('Adversarial Intensity', self.test_adversarial_intensity_maintained),
-            ('Tier System', self.test_tier_system_enforcement),
-            ('Validation Completeness', self.test_validation_orchestration_preserves_all_checks),
-            ('Error Handling', self.test_error_handling_integration),
-            ('Source Segregation', self.test_source_segregation_maintained),
-            ('Performance Safety', self.test_performance_optimizations_safe)
-        ]
-
         results = {}
         passed = 0
         failed = 0
 
-        for test_name, test_func in tests:
+        for test_name, method in CHECKS:
             try:
-                result = test_func()
+                result = getattr(self, method)()
                 results[test_name] = result
                 if result:
                     passed += 1
@@ -384,6 +475,6 @@ if __name__ == "__main__":
     # Generate and save report
     report = tester.generate_test_report(results)
 
-    report_path = Path('refactored/tests/integration_test_report.md')
+    report_path = tester.framework_path / 'tests' / REPORT_NAME
     report_path.write_text(report)
     print(f"\n📄 Test report saved to: {report_path}")
\ No newline at end of file
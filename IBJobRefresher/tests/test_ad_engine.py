@@ -0,0 +1,108 @@
+"""
+Tests for batch ad-variant screening
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from runtime.ad_engine import AdEngine, ad_limits, claim_terms, parse_audience  # noqa: E402
+from runtime.rules import load_bundle  # noqa: E402
+
+POSTING = """We're looking for a Frontend Developer to join our team.
+Requirements:
+- 3+ years React experience
+- Familiarity with REST APIs and Node.js
+Salary: $150k"""
+
+ALIGNED = ("We're looking for a Frontend Developer to join our team! "
+           "3+ years React experience and familiarity with REST APIs and Node.js. "
+           "Salary: $150k. Apply Now")
+ESCALATED = "Lead our Kubernetes migration. 10+ years required. Apply Now"
+TOO_LONG = "React experience. " * 34
+
+AUDIENCES = [{'size': 120_000}, {'size': 250}, parse_audience('- Target Audience Size: 45,000')]
+
+
+def test_claim_terms_cover_numbers_verbs_and_lowercase_content_words():
+    terms = claim_terms("We shipped 3 apps with Node.js and C++ at Acme. Apply Now")
+
+    assert {'3', 'shipped', 'node.js', 'c++', 'acme'} <= set(terms)
+    assert 'apply' not in terms and 'now' not in terms
+    assert 'responsible for' in claim_terms("You'll be responsible for kubernetes")
+
+
+def test_claims_missing_from_the_posting_are_misaligned():
+    posting = "We are hiring a Frontend Developer. Requirements: 3+ years React experience."
+    intros = ["Join us to lead a team of engineers on kubernetes and golang",
+              "You will architect our platform from scratch",
+              "Experienced React developers wanted",
+              "Frontend Developer with 3+ years React experience"]
+
+    result = AdEngine(posting).evaluate(intros, [{'size': None}])
+
+    assert result['misaligned'].tolist() == [True, True, True, False]
+    assert {'lead', 'kubernetes', 'golang'} <= set(result['features']['unsupported_terms'][0])
+    assert 'architect' in result['features']['unsupported_terms'][1]
+    # "experienced" is an expertise claim the plain noun does not support
+    assert 'experienced' in result['features']['unsupported_terms'][2]
+
+
+def test_faithful_paraphrases_pass_and_fabricated_claims_block():
+    faithful = ["Hiring: Frontend Developer (React, 3+ years).",
+                "Frontend Developer: 3+ years React experience required.",
+                "React experience wanted! Frontend Developer role to grow your React skills"]
+    fabricated = ["Senior Frontend Developer: 3+ years React experience.",
+                  "Frontend Developer: 5+ years React experience.",
+                  "Frontend Developer with React and GraphQL experience.",
+                  "Frontend Developer at Google: 3+ years React experience.",
+                  "Expert Frontend Developer with 3+ years React experience."]
+
+    result = AdEngine(POSTING).evaluate(faithful + fabricated, [{'size': None}])
+    blocking = result['features']['blocking_terms']
+
+    assert result['misaligned'].tolist() == [False] * 3 + [True] * 5
+    assert [blocking[i] for i in range(3, 8)] == [
+        ['senior'], ['5+'], ['graphql'], ['google'], ['expert']]
+    # Unmatched everyday words still cost alignment score
+    assert result['score'][2, 0] < result['score'][0, 0]
+
+
+def test_limits_come_from_the_rule_bundle():
+    bundle = load_bundle()
+
+    assert ad_limits(bundle) == {'max_intro_chars': 600, 'mobile_preview_chars': 150,
+                                 'min_audience_size': 300}
+
+
+def test_parse_audience_size():
+    assert parse_audience('- Target Audience Size: 1.2M')['size'] == 1_200_000
+    assert parse_audience('- Location: Berlin')['size'] is None
+
+
+def test_safeguards_block_in_bulk():
+    result = AdEngine(POSTING).evaluate([ALIGNED, ESCALATED, TOO_LONG], AUDIENCES)
+
+    assert result['blocked'].shape == (3, 3)
+    assert result['over_limit'].tolist() == [False, False, True]
+    assert result['misaligned'].tolist() == [False, True, False]
+    assert result['audience_too_small'].tolist() == [False, True, False]
+    assert result['blocked'][0].tolist() == [False, True, False]
+    assert result['blocked'][1:].all()
+
+
+def test_shortlist_ranks_only_viable_pairs():
+    engine = AdEngine(POSTING)
+
+    shortlist = engine.shortlist([ALIGNED, ESCALATED, TOO_LONG], AUDIENCES, top_k=5)
+
+    assert [(s['intro_index'], s['audience_index']) for s in shortlist] == [(0, 0), (0, 2)]
+    assert shortlist[0]['score'] > shortlist[1]['score']
+
+
+def test_rejections_explain_blocks():
+    rejected = AdEngine(POSTING).rejections([ALIGNED, ESCALATED], AUDIENCES)
+
+    assert rejected[0] == {'intro_index': 1, 'reasons': [
+        'Ad promises exceed posting content (10+, kubernetes, lead)']}
+    assert {'audience_index': 1, 'reasons': ['Below minimum campaign requirement']} in rejected
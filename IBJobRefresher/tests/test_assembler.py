@@ -0,0 +1,95 @@
+"""
+Tests for conditional prompt assembly
+"""
+
+from runtime.assembler import PromptAssembler, split_sections
+from runtime.inputs import parse_input
+
+NO_AD_INPUT = """
+[ORIGINAL JOB TITLE]
+Frontend Developer
+[/ORIGINAL JOB TITLE]
+[ORIGINAL JOB POSTING]
+We're looking for a Frontend Developer to join our team.
+[/ORIGINAL JOB POSTING]
+"""
+
+AD_INPUT = NO_AD_INPUT + """
+[AD AUDIENCE DETAILS]
+- Location: San Francisco Bay Area
+[/AD AUDIENCE DETAILS]
+[AD KPIs]
+- Clicks: 500
+[/AD KPIs]
+"""
+
+
+def test_split_ignores_comments_inside_code_fences():
+    text = "# header\n---\n## A\n```python\n## not a heading\n```\n### B\nbody\n"
+
+    headings = [heading for heading, _ in split_sections(text)]
+
+    assert headings == ['## A', '### B']
+
+
+def test_ad_sections_skipped_without_ad_data():
+    assembler = PromptAssembler()
+
+    prompt = assembler.assemble(parse_input(NO_AD_INPUT))['text']
+
+    assert '3C: AD CAMPAIGN OPTIMIZATION' not in prompt
+    assert 'function ENFORCE_CHARACTER_LIMITS' not in prompt
+    assert 'Tier Boundary Enforcement' in prompt
+
+
+def test_ad_sections_loaded_with_ad_data():
+    assembler = PromptAssembler()
+
+    prompt = assembler.assemble(parse_input(AD_INPUT), iteration=2)['text']
+
+    assert '3C: AD CAMPAIGN OPTIMIZATION' in prompt
+    assert 'function ENFORCE_CHARACTER_LIMITS' in prompt
+    assert 'PERFORMANCE_EVOLUTION' in prompt
+    assert '### 1D.2: AD AUDIENCE ALIGNMENT' in prompt
+
+
+def test_ad_safeguards_loaded_for_any_ad_section():
+    assembler = PromptAssembler()
+    intro_only = NO_AD_INPUT + "[AD INTRO TEXT]\nBuild with us. Apply Now\n[/AD INTRO TEXT]\n"
+    kpis_only = NO_AD_INPUT + "[AD KPIs]\n- Clicks: 500\n[/AD KPIs]\n"
+
+    for text in (intro_only, kpis_only):
+        prompt = assembler.assemble(parse_input(text))['text']
+        assert 'function ENFORCE_CHARACTER_LIMITS' in prompt
+        assert 'function ENSURE_AD_POSTING_ALIGNMENT' in prompt
+        assert '3C: AD CAMPAIGN OPTIMIZATION' in prompt
+        # Ad copy and KPI analysis load; audience alignment needs the audience details
+        assert '### 1D: AD CAMPAIGN INTELLIGENCE' in prompt
+        assert '### 2A.3: AD PERFORMANCE TRACKING' in prompt
+        assert '### 1D.2: AD AUDIENCE ALIGNMENT' not in prompt
+    prompt = assembler.assemble(parse_input(NO_AD_INPUT))['text']
+    assert '### 1D' not in prompt
+    assert '### 2A.3' not in prompt
+
+
+def test_first_iteration_skips_history_analysis():
+    assembler = PromptAssembler()
+    sections = parse_input(NO_AD_INPUT)
+
+    first = assembler.assemble(sections, iteration=1)
+    later = assembler.assemble(sections, iteration=3)
+
+    assert 'PERFORMANCE_EVOLUTION' not in first['text']
+    assert 'ITERATION_TRACKER' in first['text']
+    assert first['chars'] < later['chars']
+
+
+def test_compiled_prompt_reused_per_module_set():
+    assembler = PromptAssembler()
+    sections = parse_input(NO_AD_INPUT)
+
+    first = assembler.assemble(sections)
+    second = assembler.assemble(dict(sections))
+
+    assert first is second
+    assert len(assembler.precompile()) == len(assembler._compiled)
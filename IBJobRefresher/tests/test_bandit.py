@@ -0,0 +1,107 @@
+"""
+Tests for Thompson-sampling variant allocation
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from runtime.bandit import (  # noqa: E402
+    RESET_BELOW_HALF, RESET_FAILURES, RESET_MARKET_SHIFT, STOP_DECLINING_RETURNS,
+    STOP_TARGETS, VariantAllocator, benchmark, default_scenario, simulate_sequential,
+    simulate_thompson
+)
+
+STAGES = ('ctr', 'apply')
+
+
+def batch(**arms):
+    """{arm: (clicks, impressions, applications)} -> allocator batch"""
+    return {arm: {'ctr': (clicks, shown), 'apply': (applied, clicks)}
+            for arm, (clicks, shown, applied) in arms.items()}
+
+
+def test_incremental_updates_match_one_combined_batch():
+    split = VariantAllocator(['original', 'v1'], STAGES, seed=0)
+    split.update(batch(original=(20, 1000, 4), v1=(30, 1000, 6)))
+    split.update(batch(original=(10, 500, 1)))
+    combined = VariantAllocator(['original', 'v1'], STAGES, seed=0)
+    combined.update(batch(original=(30, 1500, 5), v1=(30, 1000, 6)))
+
+    assert np.array_equal(split.alpha, combined.alpha)
+    assert np.array_equal(split.beta, combined.beta)
+    with pytest.raises(ValueError):
+        split.update(batch(v1=(10, 5, 0)))
+
+
+def test_allocation_shifts_traffic_to_the_winner_but_keeps_a_baseline_floor():
+    allocator = VariantAllocator(['original', 'v1', 'v2'], STAGES, seed=0)
+    allocator.update(batch(original=(200, 10_000, 20), v1=(400, 10_000, 60),
+                           v2=(190, 10_000, 18)))
+    shares = allocator.allocation()
+
+    assert sum(shares.values()) == pytest.approx(1)
+    assert shares['v1'] > 0.8
+    assert shares['original'] >= allocator.min_share
+    assert sum(allocator.split(1000).values()) == 1000
+
+    strategy = allocator.iteration_strategy()
+    assert strategy['leader'] == 'v1'
+    assert strategy['outcome'] == 'metrics_improve'
+
+
+def test_three_consecutive_failed_challengers_recommend_reset():
+    arms = ['original', 'v1', 'v2', 'v3']
+    allocator = VariantAllocator(arms, STAGES, seed=0)
+    allocator.update(batch(original=(500, 10_000, 100), v1=(200, 10_000, 20),
+                           v2=(210, 10_000, 21), v3=(190, 10_000, 19)))
+    decision = allocator.recommend()
+
+    assert allocator.outcomes == ['failure'] * 3
+    assert decision['action'] == 'reset'
+    assert RESET_FAILURES in decision['reasons']
+    assert decision['reference_original']
+    assert allocator.iteration_strategy()['outcome'] == 'metrics_get_worse'
+
+
+def test_baseline_drift_and_targets_map_to_phase_7_rules():
+    historical = {'ctr': 0.05, 'apply': 0.2}
+    shifted = VariantAllocator(['original', 'v1'], STAGES, baseline_rates=historical, seed=0)
+    shifted.update(batch(original=(100, 10_000, 8), v1=(110, 10_000, 9)))
+    reasons = shifted.recommend()['reasons']
+    assert RESET_MARKET_SHIFT in reasons and RESET_BELOW_HALF in reasons
+
+    on_target = VariantAllocator(['original', 'v1'], STAGES,
+                                 targets={'ctr': 0.03, 'apply': 0.1}, seed=0)
+    on_target.update(batch(original=(200, 10_000, 20), v1=(500, 10_000, 100)))
+    decision = on_target.recommend()
+    assert decision['action'] == 'stop'
+    assert STOP_TARGETS in decision['reasons']
+    assert decision['leader'] == 'v1'
+
+
+def test_simulation_finds_a_clear_winner_faster_than_sequential_iterations():
+    rates = np.array([[0.02, 0.10], [0.02, 0.09], [0.03, 0.12], [0.018, 0.10]])
+    concurrent = simulate_thompson(rates, daily_traffic=20_000, seed=1)
+    sequential = simulate_sequential(rates, daily_traffic=20_000, seed=1)
+
+    assert concurrent['correct'] and concurrent['action'] == 'stop'
+    assert concurrent['days'] < sequential['days']
+
+
+def test_default_benchmark_decides_faster_than_sequential_iterations():
+    results = benchmark(default_scenario(), runs=3)
+
+    assert results['thompson']['mean_days'] < results['sequential']['mean_days']
+    assert results['thompson']['accuracy'] >= results['sequential']['accuracy']
+
+
+def test_spent_budget_stops_on_the_leader():
+    allocator = VariantAllocator(['original', 'v1'], STAGES, max_batches=1, seed=0)
+    assert allocator.recommend()['action'] == 'continue'
+
+    allocator.update(batch(original=(20, 1000, 4), v1=(21, 1000, 4)))
+    decision = allocator.recommend()
+
+    assert decision['action'] == 'stop'
+    assert decision['reasons'] == [STOP_DECLINING_RETURNS]
@@ -0,0 +1,141 @@
+"""
+Tests for the content-addressed phase response cache
+"""
+
+import threading
+
+from runtime.cache import (
+    DiskBackend, MemoryBackend, ResponseCache, changed_phases, phase_inputs
+)
+from runtime.inputs import JOB_KPIS, parse_input
+
+SAMPLE_INPUT = """
+[PROJECT DESCRIPTION]
+We're building a next-generation e-commerce platform using React and Node.js.
+[/PROJECT DESCRIPTION]
+[ORIGINAL JOB TITLE]
+Frontend Developer
+[/ORIGINAL JOB TITLE]
+[ORIGINAL JOB POSTING]
+We're looking for a Frontend Developer to join our team.
+- 3+ years React experience
+[/ORIGINAL JOB POSTING]
+[ORIGINAL JOB KPIs]
+- Visit/Application Conversion: 2.1%
+[/ORIGINAL JOB KPIs]
+"""
+
+EXTRACTION = 'phases/phase_1_extraction.md'
+
+
+def counting_call():
+    calls = []
+
+    def call():
+        calls.append(1)
+        return {'response': len(calls)}
+    return call, calls
+
+
+def test_repeat_call_is_served_from_cache():
+    cache = ResponseCache(MemoryBackend())
+    inputs = phase_inputs(EXTRACTION, parse_input(SAMPLE_INPUT))
+    call, calls = counting_call()
+
+    first = cache.get_or_call(EXTRACTION, inputs, call)
+    second = cache.get_or_call(EXTRACTION, inputs, call)
+
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats['hits'] == 1
+
+
+def test_formatting_only_changes_share_a_key():
+    cache = ResponseCache(MemoryBackend())
+    sections = parse_input(SAMPLE_INPUT)
+    reformatted = parse_input(SAMPLE_INPUT.replace("We're", "We’re").replace('- 3+', '*   3+'))
+
+    assert cache.key_for(EXTRACTION, phase_inputs(EXTRACTION, sections)) == \
+        cache.key_for(EXTRACTION, phase_inputs(EXTRACTION, reformatted))
+
+    signed = parse_input(SAMPLE_INPUT.replace('- 3+ years', '-5 years'))
+    plus = parse_input(SAMPLE_INPUT.replace('- 3+ years', '+5 years'))
+    assert cache.key_for(EXTRACTION, phase_inputs(EXTRACTION, signed)) != \
+        cache.key_for(EXTRACTION, phase_inputs(EXTRACTION, plus))
+
+
+def test_model_settings_change_the_key():
+    cache = ResponseCache(MemoryBackend())
+    inputs = phase_inputs(EXTRACTION, parse_input(SAMPLE_INPUT))
+
+    assert cache.key_for(EXTRACTION, inputs, {'temperature': 0}) != \
+        cache.key_for(EXTRACTION, inputs, {'temperature': 0.7})
+
+
+def test_kpi_only_iteration_skips_phase_1():
+    sections = parse_input(SAMPLE_INPUT)
+    next_iteration = dict(sections, **{JOB_KPIS: '- Visit/Application Conversion: 3.4%'})
+
+    changed = changed_phases(sections, next_iteration)
+
+    assert EXTRACTION not in changed
+    assert 'phases/phase_2_hypothesis.md' in changed
+
+
+def test_validation_verdicts_are_never_cached():
+    cache = ResponseCache(MemoryBackend())
+    call, calls = counting_call()
+
+    cache.get_or_call('validation/verification_suite.md', {'x': 1}, call)
+    cache.get_or_call('validation/verification_suite.md', {'x': 1}, call)
+    cache.get_or_call(EXTRACTION, {'x': 1}, call, verdict=True)
+
+    assert len(calls) == 3
+    assert cache.stats['uncacheable'] == 3
+
+
+def test_backends_evict_least_recently_used(tmp_path):
+    for backend in (MemoryBackend(max_bytes=40), DiskBackend(tmp_path, max_bytes=40)):
+        backend.set('a', {'v': 'x' * 10})
+        backend.set('b', {'v': 'y' * 10})
+        backend.get('a')
+        backend.set('c', {'v': 'z' * 10})
+
+        assert backend.get('a') is not None
+        assert backend.get('b') is None
+        assert backend.get('c') is not None
+
+
+def test_disk_get_treats_a_concurrently_evicted_file_as_a_miss(tmp_path, monkeypatch):
+    backend = DiskBackend(tmp_path)
+    backend.set('a', {'v': 1})
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr('runtime.cache.os.utime', evicted)
+    assert backend.get('a') is None
+    assert 'a' not in backend._index
+
+
+def test_concurrent_disk_writers_never_share_a_temp_file(tmp_path):
+    writers = [DiskBackend(tmp_path) for _ in range(4)]
+    values = [{'writer': i, 'v': 'x' * 5000} for i in range(len(writers))]
+    errors = []
+
+    def write(i):
+        try:
+            for _ in range(25):
+                writers[i].set('k', values[i])
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(len(writers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert DiskBackend(tmp_path).get('k') in values
+    assert list(tmp_path.glob('*.tmp')) == []
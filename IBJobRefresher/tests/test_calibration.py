@@ -0,0 +1,81 @@
+"""
+Tests for confidence calibration
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from runtime.calibration import (  # noqa: E402
+    DEFAULT_WEIGHTS, PASS_CLEAN, PASS_WITH_WARNING, REGENERATE, WARNING_THRESHOLD,
+    CalibrationLog, brier_score, calculate_confidence, fit_threshold, reliability_curve,
+    simulate_history
+)
+
+
+def test_calculate_confidence_matches_the_orchestrator_spec():
+    results = {check: {'passed': True, 'confidence': 0.8} for check in DEFAULT_WEIGHTS}
+    results['semantic']['confidence'] = 0.3
+
+    aggregated = calculate_confidence(results)
+    assert aggregated['confidence'] == pytest.approx(0.8 - 0.20 * 0.5)
+    assert aggregated['action'] == PASS_CLEAN
+    assert calculate_confidence(results, threshold=0.75)['action'] == PASS_WITH_WARNING
+    results['domain'] = {'passed': False, 'confidence': 0.99}
+    assert calculate_confidence(results)['action'] == REGENERATE
+
+
+def test_brier_and_reliability_curve_are_vectorized_over_history():
+    confidence = np.array([0.05, 0.15, 0.15, 0.95, 0.95, 0.95, 0.95])
+    outcome = np.array([0, 0, 1, 1, 1, 1, 0], dtype=bool)
+
+    assert brier_score(confidence, outcome) == pytest.approx(
+        np.mean((confidence - outcome) ** 2))
+    curve = reliability_curve(confidence, outcome)
+    assert curve['count'].tolist() == [1, 2, 0, 0, 0, 0, 0, 0, 0, 4]
+    assert curve['accuracy'][1] == pytest.approx(0.5)
+    assert curve['accuracy'][9] == pytest.approx(0.75)
+    assert np.isnan(curve['accuracy'][5])
+
+
+def test_outcomes_resolve_later_and_the_log_replays(tmp_path):
+    path = tmp_path / 'calibration.jsonl'
+    log = CalibrationLog(path)
+    log.record('posting-1', {'tier_check': 0.9, 'adversarial': 0.8}, passed=True)
+    log.record('posting-2', {'tier_check': 0.4}, passed=True)
+    log.resolve('posting-1', {'tier_check': True, 'adversarial': False})
+    with pytest.raises(KeyError):
+        log.resolve('posting-3', True)
+
+    replayed = CalibrationLog(path)
+    data = replayed.arrays()
+    assert len(replayed) == 2 and data['outcome'].tolist() == [False]
+    assert data['check_outcomes'][0, :2].tolist() == [1.0, 0.0]
+    assert np.isnan(data['confidences'][0, 2:]).all()
+    report = replayed.report()
+    assert report['records'] == 1
+    assert report['per_check']['adversarial']['brier'] == pytest.approx(0.64)
+
+
+def test_threshold_is_the_best_cut_that_keeps_clean_passes_precise():
+    confidence = np.linspace(0, 1, 200)
+    outcome = confidence > 0.6
+    outcome[150] = False
+
+    threshold = fit_threshold(confidence, outcome, min_support=10)
+    assert threshold == pytest.approx(confidence[confidence > 0.6].min())
+    assert fit_threshold(confidence, np.zeros(200, dtype=bool), min_support=10) is None
+
+
+def test_refit_improves_calibration_and_keeps_defaults_on_thin_history():
+    fit = simulate_history(n=1000).refit()
+
+    assert fit['after']['brier'] < fit['before']['brier']
+    assert fit['after']['meets_target']
+    assert sum(fit['weights'].values()) == pytest.approx(1)
+    assert fit['weights']['tier_check'] > fit['weights']['performance']
+    assert fit['threshold_fitted']
+
+    thin = simulate_history(n=20).refit()
+    assert thin['weights'] == DEFAULT_WEIGHTS
+    assert thin['threshold'] == WARNING_THRESHOLD and not thin['threshold_fitted']
@@ -0,0 +1,130 @@
+"""
+Tests for the async model client
+"""
+
+import asyncio
+
+from runtime.client import AsyncModelClient
+from runtime.errors import ModelError, PipelineAbort, TransientModelError
+from runtime.models import EXTRACTION, MockBackend, ModelBackend
+
+
+class ScriptedBackend(ModelBackend):
+    """Raises the queued errors in order, then answers; tracks peak concurrency"""
+
+    def __init__(self, errors=(), delay=0.01):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def acomplete(self, request):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.errors:
+                raise self.errors.pop(0)
+            return {'phase': request['phase']}
+        finally:
+            self.active -= 1
+
+
+def run_all(client, requests):
+    async def main():
+        return await asyncio.gather(*(client.complete(r) for r in requests),
+                                    return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_identical_in_flight_requests_share_one_call():
+    backend = MockBackend(latency_ms=10)
+    client = AsyncModelClient(backend)
+    request = {'phase': EXTRACTION, 'inputs': {'x': 1}}
+
+    results = run_all(client, [request] * 8)
+
+    assert len(backend.calls) == 1
+    assert client.stats['coalesced'] == 7
+    assert all(r == results[0] for r in results)
+    results[1]['mutated'] = True
+    assert not any('mutated' in r for r in results[:1] + results[2:])
+
+
+def test_cancelling_the_leader_does_not_cancel_followers():
+    backend = ScriptedBackend(delay=0.05)
+    client = AsyncModelClient(backend)
+    request = {'phase': EXTRACTION}
+
+    async def main():
+        leader = asyncio.ensure_future(client.complete(request))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(client.complete(request)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(leader, *followers, return_exceptions=True)
+
+    cancelled, *results = asyncio.run(main())
+
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert results == [{'phase': EXTRACTION}] * 3
+    assert backend.calls == 2
+
+
+def test_concurrency_is_capped():
+    backend = ScriptedBackend()
+    client = AsyncModelClient(backend, max_concurrency=3)
+
+    run_all(client, [{'phase': EXTRACTION, 'inputs': {'i': i}} for i in range(12)])
+
+    assert backend.peak == 3
+
+
+def test_pooled_backends_are_checked_out_exclusively():
+    pool = [ScriptedBackend() for _ in range(2)]
+    client = AsyncModelClient(pool, max_concurrency=10)
+
+    run_all(client, [{'phase': EXTRACTION, 'inputs': {'i': i}} for i in range(6)])
+
+    assert all(backend.peak == 1 for backend in pool)
+    assert sum(backend.calls for backend in pool) == 6
+
+
+def test_transient_errors_are_retried():
+    backend = ScriptedBackend(errors=[TransientModelError('rate limited')] * 2)
+    client = AsyncModelClient(backend, base_delay=0.001, seed=1)
+
+    [result] = run_all(client, [{'phase': EXTRACTION}])
+
+    assert result == {'phase': EXTRACTION}
+    assert client.stats['retries'] == 2
+
+
+def test_abort_and_hard_failures_are_not_retried():
+    for error in (PipelineAbort('tier violation'), ModelError('bad request')):
+        backend = ScriptedBackend(errors=[error])
+        client = AsyncModelClient(backend, base_delay=0.001)
+
+        [result] = run_all(client, [{'phase': EXTRACTION}])
+
+        assert result is error
+        assert backend.calls == 1
+
+
+def test_retries_give_up_after_max_retries():
+    backend = ScriptedBackend(errors=[TransientModelError('timeout')] * 10)
+    client = AsyncModelClient(backend, max_retries=3, base_delay=0.001)
+
+    [result] = run_all(client, [{'phase': EXTRACTION}])
+
+    assert isinstance(result, TransientModelError)
+    assert backend.calls == 4
+
+
+def test_client_survives_across_event_loops():
+    client = AsyncModelClient(MockBackend())
+
+    for _ in range(2):
+        assert run_all(client, [{'phase': EXTRACTION, 'inputs': {}}])[0]
@@ -0,0 +1,117 @@
+"""
+Tests for batch engagement and readability scoring
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from runtime.engagement import (  # noqa: E402
+    SECTIONS, EngagementScorer, canonical_section, posting_features, syllables
+)
+
+ORIGINAL = """We're looking for a Frontend Developer to join our platform team.
+
+About us:
+We build inventory software for independent retailers.
+
+Requirements:
+- 3+ years React experience
+- Familiarity with REST APIs
+
+Preferred qualifications:
+- GraphQL
+
+Benefits:
+- Remote-first
+- Salary: $120k-$150k"""
+
+
+def test_sections_and_syllables():
+    assert canonical_section('Preferred qualifications') == 'nice_to_have'
+    assert canonical_section("What you'll do") == 'role'
+    assert canonical_section('Miscellaneous') is None
+    assert [syllables(w) for w in ('team', 'software', 'table', 'familiarity')] == [1, 2, 2, 5]
+
+
+def test_features_are_arrays_over_the_batch():
+    long_sentence = 'This sentence ' + 'keeps going and going ' * 8 + 'until it ends.'
+    f = posting_features([ORIGINAL, long_sentence, ''])
+
+    assert f['readability'].shape == (3,)
+    assert f['sections'].shape == (3, len(SECTIONS))
+    present = dict(zip(SECTIONS, f['sections'][0]))
+    assert {name for name, on in present.items() if on} == {
+        'about', 'requirements', 'nice_to_have', 'benefits', 'compensation'}
+    assert f['must_haves'][0] == 2 and f['nice_to_haves'][0] == 1
+    assert f['years_required'][0] == 3
+    assert f['bullet_share'][0] == pytest.approx(5 / 7)
+    assert f['long_sentence_share'].tolist() == [0.0, 1.0, 0.0]
+    assert f['p90_sentence_length'][1] == f['words'][1]
+    assert f['words'][2] == 0 and f['readability'][2] == 0
+
+
+def test_rejects_regressions_before_verification():
+    candidates = [
+        ORIGINAL.replace('- Remote-first', '- **Remote-first** 🚀'),
+        ORIGINAL.replace('- Remote-first\n', ''),
+        ORIGINAL.replace('We build', 'We are a fast-paced, world-class rockstar team that '
+                         'leverages synergies to build'),
+        ORIGINAL.replace('Preferred qualifications:\n- GraphQL\n\n', '').replace(
+            '- Familiarity with REST APIs', '- Familiarity with REST APIs\n- GraphQL'),
+        ORIGINAL.replace('3+ years', '5+ years'),
+    ]
+    scorer = EngagementScorer(ORIGINAL)
+    result = scorer.evaluate(candidates)
+
+    assert result['rejected'].tolist() == [False, False, True, True, True]
+    assert result['clarity_regressed'].tolist() == [False, False, True, False, False]
+    assert result['missing_sections'][3].tolist() == [name == 'nice_to_have' for name in SECTIONS]
+    assert result['more_must_haves'][3] and result['more_years'][4]
+    reasons = {r['candidate_index']: r['reasons'] for r in scorer.rejections(candidates)}
+    assert reasons[4] == ['no_new_barriers_introduced: years required 3 -> 5']
+    assert reasons[3][0] == 'working_elements_not_removed: nice_to_have'
+
+
+def test_protected_phrases_and_shortlist_order():
+    candidates = [
+        ORIGINAL.replace('- Remote-first\n', ''),
+        ORIGINAL,
+        ORIGINAL.replace('- Remote-first', '- **Remote-first** 🚀'),
+    ]
+    scorer = EngagementScorer(ORIGINAL, protected=['Remote-first'])
+    shortlist = scorer.shortlist(candidates)
+
+    assert [s['candidate_index'] for s in shortlist] == [2, 1]
+    assert shortlist[0]['engagement_delta'] > 0 and not shortlist[0]['warnings']
+    assert shortlist[1]['warnings'] == ["No engagement gain over the original"]
+    assert scorer.rejections(candidates)[0]['reasons'] == [
+        "working_elements_not_removed: 'Remote-first'"]
+
+
+def test_decorated_headings_are_still_headings():
+    restyled = (ORIGINAL.replace('About us:', '**About us** 💡:')
+                .replace('Requirements:', '**Requirements:**')
+                .replace('Benefits:', '**Benefits:**'))
+    scorer = EngagementScorer(ORIGINAL)
+    result = scorer.evaluate([restyled])
+    f = result['features']
+
+    assert not result['rejected'][0]
+    assert f['sections'][0].tolist() == scorer.baseline['sections'].tolist()
+    assert f['sentences'][0] == scorer.baseline['sentences']
+    assert f['readability'][0] == pytest.approx(scorer.baseline['readability'])
+
+
+def test_heading_synonyms_keep_their_section():
+    assert canonical_section("What we're looking for") == 'requirements'
+    assert canonical_section('About you') == 'requirements'
+    assert canonical_section("What's in it for you") == 'benefits'
+
+    renamed = (ORIGINAL.replace('Requirements:', "What you'll bring:")
+               .replace('Benefits:', 'What we offer:'))
+    scorer = EngagementScorer(ORIGINAL)
+    result = scorer.evaluate([renamed])
+
+    assert not result['rejected'][0]
+    assert result['features']['must_haves'][0] == scorer.baseline['must_haves']
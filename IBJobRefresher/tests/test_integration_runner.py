@@ -0,0 +1,115 @@
+"""
+Tests for the parallel integration runner
+"""
+
+import json
+import shutil
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import integration_runner
+from integration_runner import (
+    junit_xml, main, parse_root, regressions, root_hash, root_id, run_roots
+)
+from integration_tests import CHECKS, FRAMEWORK_DIR, IntegrationTests
+
+
+def _fork(tmp_path, name):
+    root = tmp_path / name
+    shutil.copytree(FRAMEWORK_DIR, root, ignore=shutil.ignore_patterns(
+        '__pycache__', '.integration_cache', '*.py'))
+    return root
+
+
+# critical_safeguards.md does not yet define the five safeguards the
+# integration markers require (Domain Boundary Enforcement and others)
+KNOWN_FAILURES = ['14 Safeguards']
+
+
+def test_shipped_framework_fails_only_known_checks():
+    tester = IntegrationTests()
+    results = [tester.run_check(name) for name, _ in CHECKS]
+
+    assert [r['name'] for r in results if not r['passed']] == KNOWN_FAILURES
+    assert all(r['time_ms'] >= 0 and r['output'].startswith('Testing:') for r in results)
+
+
+def test_runs_roots_in_parallel_and_caches_unchanged_ones(tmp_path):
+    clean = _fork(tmp_path, 'clean')
+    broken = _fork(tmp_path, 'broken')
+    orchestrator = broken / 'validation' / 'validation_orchestrator.md'
+    orchestrator.write_text(orchestrator.read_text().replace('HOSTILE AUDITOR', 'REVIEWER'))
+    cache_dir = tmp_path / 'cache'
+
+    first = run_roots([clean, broken], workers=2, cache_dir=cache_dir)
+    known = len(KNOWN_FAILURES)
+    assert [(e['passed'], e['failed'], e['cached']) for e in first['roots']] == [
+        (len(CHECKS) - known, known, False), (len(CHECKS) - known - 1, known + 1, False)]
+    failed = [c['name'] for c in first['roots'][1]['checks'] if not c['passed']]
+    assert failed == ['14 Safeguards', 'Adversarial Intensity']
+
+    (clean / 'tests' / 'integration_test_report.md').write_text('regenerated')
+    second = run_roots([clean, broken], cache_dir=cache_dir)
+    assert second['cached_roots'] == 2
+    assert second['roots'][1]['checks'] == first['roots'][1]['checks']
+
+    (clean / 'phases' / 'phase_6_learning.md').write_text('# emptied')
+    assert root_hash(clean) != first['roots'][0]['hash']
+    third = run_roots([clean], cache_dir=cache_dir)
+    assert not third['roots'][0]['cached'] and third['failed'] == len(KNOWN_FAILURES) + 1
+
+
+def test_errored_results_are_not_cached(tmp_path, monkeypatch):
+    root = _fork(tmp_path, 'root')
+    cache_dir = tmp_path / 'cache'
+
+    def crashed(root, name):
+        raise RuntimeError('worker died')
+
+    monkeypatch.setattr(integration_runner, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(integration_runner, '_run_check', crashed)
+    first = run_roots([root], cache_dir=cache_dir)
+    assert first['failed'] == len(CHECKS)
+    assert {c['error'] for c in first['roots'][0]['checks']} == {'RuntimeError: worker died'}
+
+    monkeypatch.undo()
+    second = run_roots([root], workers=1, cache_dir=cache_dir)
+    assert not second['roots'][0]['cached']
+    assert second['failed'] == len(KNOWN_FAILURES)
+    assert run_roots([root], cache_dir=cache_dir)['cached_roots'] == 1
+
+
+def test_reports_and_regression_gate(tmp_path):
+    root = _fork(tmp_path, 'fork')
+    json_path, junit_path = tmp_path / 'report.json', tmp_path / 'report.xml'
+    assert main([str(root), '--no-cache', '--json', str(json_path),
+                 '--junit', str(junit_path)]) == 1
+    baseline = json.loads(json_path.read_text())
+
+    suite = ET.parse(junit_path).getroot().find('testsuite')
+    assert suite.get('tests') == str(len(CHECKS))
+    assert suite.get('failures') == str(len(KNOWN_FAILURES))
+    assert all(float(case.get('time')) >= 0 for case in suite.iter('testcase'))
+
+    (root / 'rules' / 'bundle.json').unlink()
+    current = run_roots([root], cache_dir=None)
+    # 14 Safeguards failed in the baseline too, so it is not a regression
+    assert {r['check'] for r in regressions(baseline, current)} == {
+        'Rule Bundle Current', 'Rejection Templates', 'Tier System', 'Error Handling'}
+    failure = ET.fromstring(junit_xml(current)).find('.//failure')
+    assert 'Rule bundle not found' in failure.get('message')
+    assert main([str(root), '--no-cache', '--baseline', str(json_path)]) == 1
+
+
+def test_regressions_match_roots_by_stable_id(tmp_path):
+    fork = _fork(tmp_path, 'fork')
+    assert root_id(fork, tmp_path) == 'fork'
+    assert parse_root(f'main={fork}') == {'main': fork}
+
+    baseline = run_roots({'main': fork, 'ads': fork}, cache_dir=None)
+    moved = fork.rename(tmp_path / 'moved')
+    current = run_roots({'main': moved}, cache_dir=None)
+
+    # Same id at a new path is the same root; a baseline root left out is a failure
+    assert regressions(baseline, current) == [{'root': 'ads', 'check': '*', 'reason': 'missing'}]
+    assert ET.fromstring(junit_xml(current)).find('testsuite').get('name') == 'main'
@@ -0,0 +1,101 @@
+"""
+Tests for the mock model backend and the offline pipeline driver
+"""
+
+import asyncio
+
+import pytest
+
+from runtime.cache import MemoryBackend, ResponseCache
+from runtime.errors import CriticalDataMissing, ModelError, TransientModelError
+from runtime.inputs import JOB_KPIS, JOB_POSTING, JOB_TITLE, PROJECT_DESCRIPTION
+from runtime.models import (
+    EXTRACTION, GENERATION, HYPOTHESIS, MockBackend, RecordingBackend, load_recordings
+)
+from runtime.pipeline import Pipeline
+
+SECTIONS = {
+    PROJECT_DESCRIPTION: 'We built a real-time inventory platform.',
+    JOB_TITLE: 'Frontend Developer',
+    JOB_POSTING: "We're looking for a Frontend Developer.\n- 3+ years React experience",
+    JOB_KPIS: '- Visit/Application Conversion: 2.1%\n- Application/Interview: 15%',
+}
+
+
+def test_rule_based_extraction_segregates_sources():
+    response = MockBackend().complete({'phase': EXTRACTION, 'inputs': SECTIONS})
+
+    facts = response['SOURCE_SEGREGATED_FACTS']
+    assert [f['original_text'] for f in facts['ROLE_SCOPE']] == [
+        "We're looking for a Frontend Developer.", '3+ years React experience']
+    assert facts['PROJECT_ENVIRONMENT'][0]['tier_locked'] == 2
+
+
+def test_recorded_responses_are_replayed(tmp_path):
+    request = {'phase': GENERATION, 'inputs': SECTIONS}
+    RecordingBackend(MockBackend(), tmp_path).complete(request)
+
+    replay = MockBackend(recordings=load_recordings(tmp_path), replay_only=True)
+
+    assert replay.complete(request)['title'] == 'Frontend Developer'
+    with pytest.raises(ModelError):
+        replay.complete({'phase': GENERATION, 'inputs': {}})
+
+
+def test_failure_injection():
+    with pytest.raises(ModelError):
+        MockBackend(fail_phases=[EXTRACTION]).complete({'phase': EXTRACTION})
+    with pytest.raises(TransientModelError):
+        MockBackend(failure_rate=1.0).complete({'phase': EXTRACTION})
+
+
+def test_pipeline_runs_end_to_end_offline():
+    result = Pipeline(MockBackend()).run(SECTIONS)
+
+    assert result['verification']['passed']
+    assert result['adversarial_rounds'] == [{'round': 1, 'suspects': 0, 'violations_found': 0}]
+
+
+def test_pipeline_aborts_without_job_posting():
+    with pytest.raises(CriticalDataMissing):
+        Pipeline(MockBackend()).run({JOB_TITLE: 'Frontend Developer'})
+
+
+def test_batch_reuses_cached_phases():
+    backend = MockBackend()
+    pipeline = Pipeline(backend, ResponseCache(MemoryBackend()))
+
+    results = pipeline.run_batch([SECTIONS] * 4)
+
+    assert all('error' not in r for r in results)
+    # ROLE_SCOPE + PROJECT_ENVIRONMENT + COMPANY_ATTRIBUTES
+    assert backend.calls.count(EXTRACTION) == 3
+
+
+
+def test_kpi_only_iteration_reuses_phase_1():
+    backend = MockBackend()
+    pipeline = Pipeline(backend, ResponseCache(MemoryBackend()))
+    pipeline.run(SECTIONS)
+    extraction_calls = backend.calls.count(EXTRACTION)
+
+    pipeline.run(dict(SECTIONS, **{JOB_KPIS: '- Visit/Application Conversion: 3.4%'}))
+
+    assert backend.calls.count(EXTRACTION) == extraction_calls
+    assert backend.calls.count(HYPOTHESIS) == 2
+
+
+def test_kpi_diagnostics_come_from_phase_2():
+    response = MockBackend().complete({'phase': HYPOTHESIS, 'inputs': SECTIONS})
+
+    assert response['PERFORMANCE_INTELLIGENCE']['KPI_DIAGNOSTICS']
+    assert 'PERFORMANCE_INTELLIGENCE' not in MockBackend().complete(
+        {'phase': EXTRACTION, 'inputs': SECTIONS})
+
+def test_cancellation_is_not_reported_as_a_posting_error():
+    class CancelledBackend(MockBackend):
+        async def acomplete(self, request):
+            raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        Pipeline(CancelledBackend()).run_batch([SECTIONS] * 2)
@@ -0,0 +1,119 @@
+"""
+Tests for the compiled rule bundle
+"""
+
+import copy
+
+import pytest
+
+from runtime.errors import RuleBundleError
+from runtime.rules import (
+    JSON_BUNDLE, SAFEGUARDS_MODULE, compile_bundle, load_bundle, parse_block, validate_bundle,
+    write_bundle
+)
+
+
+def test_parse_block_reads_pseudo_js_objects():
+    text = '''
+    ```javascript
+    HANDLERS = {
+      limit: {
+        detection: () => score() > 0.7,   // kept as source text
+        thresholds: { warning: 30000, ratio: 0.5 },
+        fields: ['job_posting', "role_title"],
+        enabled: true,
+        message: "Can't stop, won't stop"
+      },
+      if (x) { ignored: 1 },
+      1: { name: "completion" }
+    }
+    ```'''
+    parsed = parse_block(text, 'HANDLERS')
+
+    assert parsed['limit'] == {
+        'detection': '() => score() > 0.7',
+        'thresholds': {'warning': 30000, 'ratio': 0.5},
+        'fields': ['job_posting', 'role_title'],
+        'enabled': True,
+        'message': "Can't stop, won't stop",
+    }
+    assert parsed['1'] == {'name': 'completion'}
+    with pytest.raises(RuleBundleError):
+        parse_block(text, 'MISSING')
+
+
+def test_compiled_bundle_covers_the_spec_blocks():
+    bundle = compile_bundle()
+
+    assert [s['number'] for s in bundle['safeguards']] == list(range(1, 15))
+    limits = next(s for s in bundle['safeguards'] if s['function'] == 'ENFORCE_CHARACTER_LIMITS')
+    assert limits['rules'][0]['threshold'] == {'metric': 'character_count', 'op': '>', 'value': 600}
+    dual_lock = next(s for s in bundle['safeguards'] if s['function'] == 'DUAL_LOCK_PROTOCOL')
+    assert dual_lock['requires'] == ['TIER_ENFORCEMENT_CHECK', 'ADVERSARIAL_VALIDATION']
+    assert set(bundle['rejection_templates']) == {
+        'verb_escalation', 'precision_inflation', 'ownership_assumption'}
+    assert bundle['error_handlers']['tier_violation_attempt']['severity'] == 'CRITICAL'
+
+
+def test_committed_bundle_is_current():
+    bundle = load_bundle()
+
+    assert bundle.is_current(), "run dev/build_rules.py"
+    assert bundle.data == compile_bundle()
+
+
+def test_validation_rejects_malformed_bundles():
+    bundle = compile_bundle()
+
+    missing = copy.deepcopy(bundle)
+    del missing['safeguards'][9]
+    with pytest.raises(RuleBundleError, match='safeguards'):
+        validate_bundle(missing)
+
+    mistyped = copy.deepcopy(bundle)
+    mistyped['precision_tiers'][0]['verbs'] = 'shipped'
+    with pytest.raises(RuleBundleError, match=r'precision_tiers\[0\]\.verbs'):
+        validate_bundle(mistyped)
+
+    old = dict(bundle, schema_version=0)
+    with pytest.raises(RuleBundleError, match='schema_version'):
+        validate_bundle(old)
+
+
+def test_loaded_bundle_matchers(tmp_path):
+    path = write_bundle(compile_bundle(), tmp_path)
+    assert path.name == JSON_BUNDLE
+    bundle = load_bundle(path)
+
+    expected = {'Shipped the app': 1, 'worked on the API': 3, 'exposed to Kafka': 5,
+                'Contributed to and then launched': 1, 'Wrote docs': None}
+    for text, tier in expected.items():
+        assert bundle.claim_tier(text) == tier
+    assert bundle.rejection('verb_escalation') == 'CAUGHT! Source precision exceeded. REJECT.'
+    assert bundle.severity('hallucination') == 'CRITICAL'
+    assert bundle.severity('conflicting_sources') == 'HIGH'
+    assert bundle.critical_fields == ['job_posting', 'role_title']
+    assert bundle.safeguard(12)['function'] == 'VALIDATE_AUDIENCE_SIZE'
+    assert bundle.thresholds['VALIDATE_AUDIENCE_SIZE'][0]['value'] == 300
+
+
+def test_msgpack_bundle_round_trips(tmp_path):
+    pytest.importorskip('msgpack')
+    compiled = compile_bundle()
+    path = write_bundle(compiled, tmp_path, use_msgpack=True)
+
+    assert load_bundle(path).data == compiled
+
+
+def test_stale_msgpack_bundle_falls_back_to_json(tmp_path):
+    with pytest.raises(RuleBundleError):
+        load_bundle(directory=tmp_path)
+
+    pytest.importorskip('msgpack')
+    compiled = compile_bundle()
+    write_bundle(compiled, tmp_path)
+    stale = copy.deepcopy(compiled)
+    stale['sources'][SAFEGUARDS_MODULE] = '0' * 64
+    write_bundle(stale, tmp_path, use_msgpack=True)
+
+    assert load_bundle(directory=tmp_path).data == compiled
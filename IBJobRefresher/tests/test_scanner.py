@@ -0,0 +1,104 @@
+"""
+Tests for the single-pass escalation scanner
+"""
+
+from runtime.inputs import JOB_POSTING, JOB_TITLE, PROJECT_DESCRIPTION
+from runtime.models import MockBackend
+from runtime.pipeline import Pipeline
+from runtime.rules import load_bundle
+from runtime.scanner import (
+    CATEGORIES, EscalationScanner, default_scanner, load_escalation_pairs, scan
+)
+
+SOURCE = """Our team is building a real-time inventory platform.
+You may mentor junior engineers.
+Requirements:
+- Worked on React applications
+- Assisted with the GraphQL migration
+Nice to have:
+- Kubernetes experience"""
+
+
+def _categories(output):
+    return {v['category'] for v in scan(SOURCE, output)}
+
+
+def test_identical_text_has_no_suspects():
+    assert scan(SOURCE, SOURCE) == []
+
+
+def test_escalation_pairs_come_from_the_orchestrator_spec():
+    assert load_escalation_pairs() == [
+        ('worked on', 'built'), ('exposed to', 'experienced'),
+        ('assisted', 'led'), ('contributed', 'architected')]
+
+
+def test_tagging_reads_tiers_sections_and_voice():
+    sentences = default_scanner().tag(SOURCE + '\nThe API was rewritten last year.')
+
+    building, mentor, _, react, graphql, _, kubernetes, api = sentences
+    assert 'progressive' in building['tags']
+    assert 'modal' in mentor['tags']
+    assert react['tier'] == 3 and react['requirement'] == 'required'
+    assert 'pair_from2' in graphql['tags']
+    assert kubernetes['requirement'] == 'optional'
+    assert api['passive'] == ['was rewritten']
+
+
+def test_each_hostile_check_is_typed_for_rejection_templates():
+    cases = {
+        'semantic_escalation': SOURCE.replace('Worked on React', 'Built React'),
+        'ownership_without_attribution': SOURCE.replace('Assisted with', 'Spearheaded'),
+        'timeline_manipulation_suggesting_completion': SOURCE.replace('is building', 'built'),
+        'potential_becoming_actual': SOURCE.replace('You may mentor', 'You mentor'),
+        'optional_becoming_required': SOURCE.replace('Nice to have:\n', ''),
+        'weasel_words_suggesting_higher_tier': SOURCE.replace(
+            'Assisted with', 'Was instrumental in'),
+        'passive_voice_hiding_actual_role': SOURCE.replace(
+            'Assisted with the GraphQL migration', 'The GraphQL migration was delivered'),
+        'completion_verb_without_completion_evidence': SOURCE + '\nShipped a billing system.',
+    }
+    bundle = load_bundle()
+    for category, output in cases.items():
+        assert category in _categories(output), category
+
+    for violation in scan(SOURCE, cases['ownership_without_attribution']):
+        assert violation['type'] in bundle.rejection_templates
+        assert violation['rejection'] == bundle.rejection(violation['type'])
+        assert violation['severity'] == CATEGORIES[violation['category']][1]
+    # assisted -> led is a spec pair; one suspect per type and sentence
+    [led] = scan(SOURCE, SOURCE.replace('Assisted with', 'Led'))
+    assert (led['category'], led['type']) == ('semantic_escalation', 'ownership_assumption')
+    assert led['source'] == '- Assisted with the GraphQL migration'
+
+
+def test_custom_pairs_and_attributed_passives():
+    scanner = EscalationScanner(pairs=[('maintained', 'owned')])
+    source = 'Maintained the payments service.'
+
+    assert [(v['category'], v['type']) for v in scanner.scan(
+        source, 'Owned the payments service.')] == [('semantic_escalation', 'ownership_assumption')]
+    assert scanner.scan('The payments service is maintained by the core team.',
+                        'The payments service was maintained by the core team.') == []
+
+
+def test_verbatim_sentences_align_with_their_exact_source():
+    project = 'You may mentor React engineers on the inventory platform.'
+    posting = 'Mentor React engineers.'
+
+    assert scan(project + '\n' + posting, posting) == []
+    assert scan(posting, posting, context=project) == []
+    result = Pipeline(MockBackend()).run({PROJECT_DESCRIPTION: project,
+                                          JOB_TITLE: 'Frontend Lead', JOB_POSTING: posting})
+    assert result['adversarial_rounds'][0]['suspects'] == 0
+
+
+def test_requirement_statives_are_not_passive_escalations():
+    scanner = default_scanner()
+
+    for text in ('3+ years of React is required.', 'Weekly demos are expected.'):
+        [sentence] = scanner.tag(text)
+        assert sentence['passive'] == []
+    [required] = scanner.tag('3+ years of React is required.')
+    assert required['requirement'] == 'required'
+    assert scan('Weekly React demos.', 'Weekly React demos are expected.') == []
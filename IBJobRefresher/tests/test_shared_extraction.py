@@ -0,0 +1,62 @@
+"""
+Tests for project-level shared Phase 1 extraction
+"""
+
+import asyncio
+
+from runtime.inputs import AD_INTRO, JOB_KPIS, JOB_POSTING, JOB_TITLE, PROJECT_DESCRIPTION
+from runtime.models import EXTRACTION, MockBackend
+from runtime.pipeline import Pipeline
+from runtime.shared_extraction import (
+    COMPANY_ATTRIBUTES, PROJECT_ENVIRONMENT, ROLE_SCOPE, content_hash
+)
+
+PROJECT = {
+    PROJECT_DESCRIPTION: 'Real-time inventory platform built with React and Node.js.\n'
+                         'Team of 40 engineers.\n- Remote-first',
+}
+
+
+def requisition(title):
+    return dict(PROJECT, **{JOB_TITLE: title, JOB_POSTING: f'We are hiring a {title}.'})
+
+
+def test_content_hash_ignores_formatting_and_role_sections():
+    first = requisition('Frontend Developer')
+    second = dict(requisition('Backend Developer'),
+                  **{PROJECT_DESCRIPTION: PROJECT[PROJECT_DESCRIPTION].replace(' ', '  ')})
+
+    assert content_hash(PROJECT_ENVIRONMENT, first) == content_hash(PROJECT_ENVIRONMENT, second)
+    assert content_hash(COMPANY_ATTRIBUTES, {}) is None
+
+
+def test_project_facts_extracted_once_across_requisitions():
+    backend = MockBackend()
+    pipeline = Pipeline(backend)
+    batch = [requisition(title) for title in
+             ('Frontend Developer', 'Backend Developer', 'QA Engineer', 'SRE')]
+
+    results = pipeline.run_batch(batch)
+
+    assert all('error' not in r for r in results)
+    # 4 ROLE_SCOPE calls + 1 PROJECT_ENVIRONMENT + 1 COMPANY_ATTRIBUTES
+    assert backend.calls.count(EXTRACTION) == 6
+    assert pipeline.shared.stats == {'hits': 6, 'misses': 2}
+
+
+def test_extraction_merges_segregated_domains():
+    pipeline = Pipeline(MockBackend())
+    sections = dict(requisition('SRE'), **{AD_INTRO: 'Lead our platform team!',
+                                           JOB_KPIS: '- Visit/Application Conversion: 2%'})
+
+    extracted = asyncio.run(pipeline.extract(sections))
+    facts = extracted['SOURCE_SEGREGATED_FACTS']
+
+    # ROLE_SCOPE comes from the job posting only, never the ad copy
+    assert [f['original_text'] for f in facts[ROLE_SCOPE]] == ['SRE', 'We are hiring a SRE.']
+    assert facts[COMPANY_ATTRIBUTES][2]['original_text'] == 'Remote-first'
+    assert facts[PROJECT_ENVIRONMENT][0]['tier_locked'] == 2
+    # 1B-1D.2 are kept alongside the segregated facts; KPI diagnostics are Phase 2's
+    assert extracted['AD_PERFORMANCE_ANALYSIS']['AD_COPY_ANALYSIS']['character_count'] == 23
+    assert 'ENGAGEMENT_INVENTORY' in extracted
+    assert 'PERFORMANCE_INTELLIGENCE' not in extracted
@@ -0,0 +1,93 @@
+"""
+Tests for the delta-encoded version store
+"""
+
+import pytest
+
+from runtime.versions import CHECKPOINT_EVERY, VersionStore, split_elements
+
+BASELINE = """We're looking for a Frontend Developer. You will join the platform team.
+
+Requirements:
+- 3+ years React experience
+- Familiarity with REST APIs
+
+Benefits:
+- Remote-first"""
+
+
+def test_split_elements_rejoins_exactly_and_tracks_sections():
+    segments = split_elements(BASELINE)
+
+    assert ''.join(text + sep for text, sep, _ in segments) == BASELINE
+    assert segments[1] == ('You will join the platform team.', '\n\n', '')
+    assert ('- Remote-first', '', 'Benefits') in segments
+    decorated = split_elements(BASELINE.replace('Benefits:', '**Benefits:** 🎁'))
+    assert ('- Remote-first', '', 'Benefits') in decorated
+
+
+def test_every_version_reconstructs_across_checkpoints():
+    store = VersionStore(BASELINE)
+    texts = [BASELINE]
+    for i in range(CHECKPOINT_EVERY + 3):
+        text = texts[-1].replace(f'{i + 3}+ years', f'{i + 4}+ years')
+        if i % 4 == 0:
+            text += f'\n- Perk {i}'
+        texts.append(text)
+        assert store.commit(text) == i + 2
+
+    assert [store.text(v) for v in range(1, store.latest + 1)] == texts
+    assert store.baseline == BASELINE
+
+
+def test_diff_keeps_element_ids_and_works_in_both_directions():
+    store = VersionStore(BASELINE)
+    v2 = store.commit(BASELINE.replace('3+ years React', '3+ years of React'))
+    v3 = store.commit(store.text(v2).replace('- Remote-first', '- Remote-first\n- Learning budget'))
+    v4 = store.commit(store.text(v3).replace('3+ years of React', '3+ years React'))
+
+    forward = store.diff(1, v3)
+    assert [(c['kind'], c['section'], c['before'], c['after']) for c in forward] == [
+        ('modified', 'Requirements', '- 3+ years React experience',
+         '- 3+ years of React experience'),
+        ('added', 'Benefits', None, '- Learning budget'),
+    ]
+    backward = store.diff(v3, 1)
+    assert [(c['kind'], c['after']) for c in backward] == [
+        ('modified', '- 3+ years React experience'), ('removed', None)]
+
+    # The React edit was reverted in v4, so only the added benefit remains
+    assert [c['kind'] for c in store.diff(1, v4)] == ['added']
+    element = forward[0]['element_id']
+    assert store.changes(v2) == [f'v2.{element}']
+    assert [h['change_id'] for h in store.element_history(element)] == [
+        f'v1.{element}', f'v2.{element}', f'v4.{element}']
+
+
+def test_element_impact_attributes_kpi_changes_to_edits():
+    store = VersionStore(BASELINE)
+    store.record_kpis(1, {'apply_rate': 2.0})
+    v2 = store.commit(BASELINE.replace('Remote-first', 'Remote-first, with a home office stipend'),
+                      decisions={'hypothesis': 'benefits drive applications'},
+                      kpis={'apply_rate': 2.6})
+    impact = store.element_impact()
+
+    [change_id] = store.changes(v2)
+    assert impact[change_id]['section'] == 'Benefits'
+    assert impact[change_id]['kpi_deltas']['apply_rate'] == pytest.approx(0.6)
+    assert impact[change_id]['shared_with'] == 0
+    assert store.decisions[v2]['hypothesis'] == 'benefits drive applications'
+
+
+def test_store_round_trips_and_stays_compact(tmp_path):
+    store = VersionStore(BASELINE)
+    for i in range(12):
+        store.commit(store.text(store.latest) + f'\n- Perk {i}', kpis={'apply_rate': i})
+    store.save(tmp_path / 'history.json')
+    loaded = VersionStore.load(tmp_path / 'history.json')
+
+    assert loaded.text(7) == store.text(7)
+    assert loaded.diff(3, 9) == store.diff(3, 9)
+    assert loaded.commit(store.text(store.latest) + '\n- More') == store.latest + 1
+    stats = store.stats()
+    assert stats['stored_chars'] < stats['full_copy_chars'] / 5
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Build the PD-SMIS v5.1 rule bundle from the markdown framework modules
+Run after editing the safeguards, REJECTION_TEMPLATES, PRECISION_TIERS or ERROR_HANDLERS
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+FRAMEWORK_DIR = Path(__file__).resolve().parent.parent / 'IBJobRefresher'
+sys.path.insert(0, str(FRAMEWORK_DIR))
+
+from runtime.errors import RuleBundleError  # noqa: E402
+from runtime.rules import (  # noqa: E402
+    JSON_BUNDLE, MSGPACK_BUNDLE, RuleBundle, compile_bundle, load_bundle, msgpack, write_bundle
+)
+
+
+def build_rules(root: Path = FRAMEWORK_DIR, use_msgpack: bool = False,
+                check: bool = False) -> int:
+    """Compile the bundle into root/rules/, or with check=True only verify it is current
+
+    A build without use_msgpack removes any bundle.msgpack, so a stale copy
+    is never left next to a fresh JSON bundle.
+    """
+    bundle_dir = root / 'rules'
+    try:
+        compiled = compile_bundle(root)
+    except RuleBundleError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if check:
+        names = [JSON_BUNDLE]
+        if (bundle_dir / MSGPACK_BUNDLE).exists():
+            if msgpack is None:
+                print(f"❌ {MSGPACK_BUNDLE} present but msgpack is not installed to check it")
+                return 1
+            names.append(MSGPACK_BUNDLE)
+        for name in names:
+            try:
+                current = load_bundle(bundle_dir / name).is_current(root)
+            except (OSError, RuleBundleError) as e:
+                print(f"❌ {e}")
+                return 1
+            if not current:
+                print(f"❌ {name} is stale; run dev/build_rules.py")
+                return 1
+        print(f"✅ Rule bundle {compiled['bundle_version']} is current ({', '.join(names)})")
+        return 0
+
+    try:
+        paths = [write_bundle(compiled, bundle_dir)]
+        if use_msgpack:
+            paths.append(write_bundle(compiled, bundle_dir, use_msgpack=True))
+        else:
+            (bundle_dir / MSGPACK_BUNDLE).unlink(missing_ok=True)
+    except (OSError, RuleBundleError) as e:
+        print(f"❌ {e}")
+        return 1
+    bundle = RuleBundle(compiled)
+    print(f"✅ Rule bundle {bundle.version}: {len(bundle.safeguards)} safeguards, "
+          f"{len(bundle.precision_tiers)} tiers, "
+          f"{len(bundle.rejection_templates)} rejection templates, "
+          f"{len(bundle.error_handlers)} error handlers")
+    for path in paths:
+        print(f"Created: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', type=Path, default=FRAMEWORK_DIR)
+    parser.add_argument('--msgpack', action='store_true', help='also write bundle.msgpack')
+    parser.add_argument('--check', action='store_true',
+                        help='fail if the committed bundle is stale')
+    args = parser.parse_args()
+    sys.exit(build_rules(args.root, args.msgpack, args.check))